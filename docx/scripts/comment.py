@@ -3,6 +3,7 @@
 Usage:
     python comment.py unpacked/ 0 "Comment text"
     python comment.py unpacked/ 1 "Reply text" --parent 0
+    python comment.py unpacked/ --batch comments.jsonl
 
 Text should be pre-escaped XML (e.g., &amp; for &, &#x2019; for smart quotes).
 
@@ -11,18 +12,38 @@ After running, add markers to document.xml:
   ... commented content ...
   <w:commentRangeEnd w:id="0"/>
   <w:r><w:rPr><w:rStyle w:val="CommentReference"/></w:rPr><w:commentReference w:id="0"/></w:r>
+
+With --batch, each JSONL line is one comment and markers are placed for you:
+  {"text": "Check this clause", "anchor": "within thirty (30) days"}
+  {"text": "Whole paragraph", "paragraph": "1A2B3C4D"}
+  {"text": "Agreed", "parent": 0}
+"anchor" is plain document text (first match within one paragraph; text in
+tracked insertions, hyperlinks and content controls counts),
+"paragraph" a w14:paraId; replies are nested in the parent's markers. "id",
+"author" and "initials" are optional. Every part is loaded and written once.
 """
 
 import argparse
+import json
 import random
-import shutil
 import sys
+from bisect import bisect_right
 from datetime import datetime, timezone
 from pathlib import Path
 
 import defusedxml.minidom
 
 TEMPLATE_DIR = Path(__file__).parent / "templates"
+INLINE_WRAPPERS = {
+    "w:ins",
+    "w:moveTo",
+    "w:hyperlink",
+    "w:smartTag",
+    "w:customXml",
+    "w:sdt",
+    "w:sdtContent",
+    "w:fldSimple",
+}
 NS = {
     "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
     "w14": "http://schemas.microsoft.com/office/word/2010/wordml",
@@ -83,26 +104,49 @@ def _encode_smart_quotes(text: str) -> str:
     return text
 
 
-def _append_xml(xml_path: Path, root_tag: str, content: str) -> None:
-    dom = defusedxml.minidom.parseString(xml_path.read_text(encoding="utf-8"))
-    root = dom.getElementsByTagName(root_tag)[0]
+def _append_xml(dom, root_tag: str, content: str) -> None:
+    root = dom.documentElement
+    if root.tagName != root_tag:
+        root = dom.getElementsByTagName(root_tag)[0]
     ns_attrs = " ".join(f'xmlns:{k}="{v}"' for k, v in NS.items())
     wrapper_dom = defusedxml.minidom.parseString(f"<root {ns_attrs}>{content}</root>")
     for child in wrapper_dom.documentElement.childNodes:  
         if child.nodeType == child.ELEMENT_NODE:
             root.appendChild(dom.importNode(child, True))
+
+
+def _load_part(xml_path: Path, template: str | None = None):
+    if not xml_path.exists() and template:
+        xml_path = TEMPLATE_DIR / template
+    return defusedxml.minidom.parseString(xml_path.read_text(encoding="utf-8"))
+
+
+def _write_part(xml_path: Path, dom) -> None:
     output = _encode_smart_quotes(dom.toxml(encoding="UTF-8").decode("utf-8"))
     xml_path.write_text(output, encoding="utf-8")
 
 
-def _find_para_id(comments_path: Path, comment_id: int) -> str | None:
-    dom = defusedxml.minidom.parseString(comments_path.read_text(encoding="utf-8"))
+def _comment_ids(dom) -> set[int]:
+    ids = set()
+    for c in dom.getElementsByTagName("w:comment"):
+        try:
+            ids.add(int(c.getAttribute("w:id")))
+        except ValueError:
+            pass
+    return ids
+
+
+def _comment_para_ids(dom) -> dict[int, str]:
+    para_ids = {}
     for c in dom.getElementsByTagName("w:comment"):
-        if c.getAttribute("w:id") == str(comment_id):
-            for p in c.getElementsByTagName("w:p"):
-                if pid := p.getAttribute("w14:paraId"):
-                    return pid
-    return None
+        for p in c.getElementsByTagName("w:p"):
+            if pid := p.getAttribute("w14:paraId"):
+                try:
+                    para_ids[int(c.getAttribute("w:id"))] = pid
+                except ValueError:
+                    pass
+                break
+    return para_ids
 
 
 def _get_next_rid(rels_path: Path) -> int:
@@ -223,83 +267,418 @@ def add_comment(
     initials: str = "C",
     parent_id: int | None = None,
 ) -> tuple[str, str]:
+    comment = {"id": comment_id, "text": text, "parent": parent_id}
+    para_ids, msg = add_comments(
+        unpacked_dir, [comment], author, initials, place_markers=False
+    )
+    if not para_ids:
+        return "", msg
+
+    action = "reply" if parent_id is not None else "comment"
+    return para_ids[0], f"Added {action} {comment_id} (para_id={para_ids[0]})"
+
+
+def add_comments(
+    unpacked_dir: str,
+    comments: list[dict],
+    author: str = "Claude",
+    initials: str = "C",
+    place_markers: bool = True,
+) -> tuple[list[str], str]:
     word = Path(unpacked_dir) / "word"
     if not word.exists():
-        return "", f"Error: {word} not found"
+        return [], f"Error: {word} not found"
 
-    para_id, durable_id = _generate_hex_id(), _generate_hex_id()
     ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    comments = word / "comments.xml"
-    first_comment = not comments.exists()
-    if first_comment:
-        shutil.copy(TEMPLATE_DIR / "comments.xml", comments)
-        _ensure_comment_relationships(Path(unpacked_dir))
-        _ensure_comment_content_types(Path(unpacked_dir))
-    _append_xml(
-        comments,
-        "w:comments",
-        COMMENT_XML.format(
-            id=comment_id,
-            author=author,
-            date=ts,
-            initials=initials,
-            para_id=para_id,
-            text=text,  
-        ),
-    )
+    paths = {
+        "comments": word / "comments.xml",
+        "ext": word / "commentsExtended.xml",
+        "ids": word / "commentsIds.xml",
+        "extensible": word / "commentsExtensible.xml",
+    }
+    doms = {key: _load_part(path, path.name) for key, path in paths.items()}
+    existing_ids = _comment_ids(doms["comments"])
+    para_index = _comment_para_ids(doms["comments"])
+
+    document = None
+    if place_markers and any(
+        c.get("anchor") or c.get("paragraph") or c.get("parent") is not None
+        for c in comments
+    ):
+        paths["document"] = word / "document.xml"
+        doms["document"] = document = _load_part(paths["document"])
+        markers = _comment_markers(document)
+        paragraphs = _ParagraphIndex(document)
+
+    next_id = max(existing_ids, default=-1) + 1
+    para_ids = []
+    anchored = 0
+    for comment in comments:
+        comment_id = comment.get("id")
+        if comment_id is None:
+            comment_id = next_id
+        comment_id = int(comment_id)
+        if comment_id in existing_ids:
+            return [], f"Error: Comment {comment_id} already exists"
+        existing_ids.add(comment_id)
+        next_id = max(next_id, comment_id + 1)
+
+        parent_id = comment.get("parent")
+        parent_para = None
+        if parent_id is not None:
+            parent_id = int(parent_id)
+            parent_para = para_index.get(parent_id)
+            if parent_id not in existing_ids:
+                return [], f"Error: Parent comment {parent_id} not found"
+            if not parent_para:
+                return [], f"Error: Parent comment {parent_id} has no w14:paraId"
+
+        if document is not None:
+            if parent_id is not None:
+                placed = _nest_reply_markers(document, markers, parent_id, comment_id)
+            elif comment.get("paragraph"):
+                placed = _mark_paragraph(
+                    document, markers, paragraphs, comment["paragraph"], comment_id
+                )
+                if not placed:
+                    return [], f"Error: Paragraph {comment['paragraph']} not found"
+            elif comment.get("anchor"):
+                placed = _mark_anchor(
+                    document, markers, paragraphs, comment["anchor"], comment_id
+                )
+                if not placed:
+                    return [], f"Error: Anchor text not found: {comment['anchor']!r}"
+            else:
+                placed = False
+            anchored += placed
+
+        para_id, durable_id = _generate_hex_id(), _generate_hex_id()
+        para_index[comment_id] = para_id
+        para_ids.append(para_id)
 
-    ext = word / "commentsExtended.xml"
-    if not ext.exists():
-        shutil.copy(TEMPLATE_DIR / "commentsExtended.xml", ext)
-    if parent_id is not None:
-        parent_para = _find_para_id(comments, parent_id)
-        if not parent_para:
-            return "", f"Error: Parent comment {parent_id} not found"
         _append_xml(
-            ext,
-            "w15:commentsEx",
-            f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para}" w15:done="0"/>',
+            doms["comments"],
+            "w:comments",
+            COMMENT_XML.format(
+                id=comment_id,
+                author=comment.get("author", author),
+                date=ts,
+                initials=comment.get("initials", initials),
+                para_id=para_id,
+                text=comment["text"],  
+            ),
         )
-    else:
+        parent_attr = f' w15:paraIdParent="{parent_para}"' if parent_para else ""
         _append_xml(
-            ext,
+            doms["ext"],
             "w15:commentsEx",
-            f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>',
+            f'<w15:commentEx w15:paraId="{para_id}"{parent_attr} w15:done="0"/>',
+        )
+        _append_xml(
+            doms["ids"],
+            "w16cid:commentsIds",
+            f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>',
+        )
+        _append_xml(
+            doms["extensible"],
+            "w16cex:commentsExtensible",
+            f'<w16cex:commentExtensible w16cex:durableId="{durable_id}" w16cex:dateUtc="{ts}"/>',
         )
 
-    ids = word / "commentsIds.xml"
-    if not ids.exists():
-        shutil.copy(TEMPLATE_DIR / "commentsIds.xml", ids)
-    _append_xml(
-        ids,
-        "w16cid:commentsIds",
-        f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>',
-    )
+    for key, dom in doms.items():
+        _write_part(paths[key], dom)
+    _ensure_comment_relationships(Path(unpacked_dir))
+    _ensure_comment_content_types(Path(unpacked_dir))
+
+    msg = f"Added {len(comments)} comments"
+    if document is not None:
+        msg += f" ({anchored} anchored in document.xml)"
+    return para_ids, msg
+
+
+def _comment_markers(document) -> dict[str, dict[str, object]]:
+    markers = {"start": {}, "end": {}, "ref": {}}
+    for tag, key in (
+        ("w:commentRangeStart", "start"),
+        ("w:commentRangeEnd", "end"),
+        ("w:commentReference", "ref"),
+    ):
+        for node in document.getElementsByTagName(tag):
+            target = node.parentNode if key == "ref" else node
+            markers[key][node.getAttribute("w:id")] = target
+    return markers
+
+
+def _marker(document, tag: str, comment_id: int):
+    node = document.createElement(tag)
+    node.setAttribute("w:id", str(comment_id))
+    return node
+
+
+def _reference_run(document, comment_id: int):
+    run = document.createElement("w:r")
+    rpr = document.createElement("w:rPr")
+    style = document.createElement("w:rStyle")
+    style.setAttribute("w:val", "CommentReference")
+    rpr.appendChild(style)
+    run.appendChild(rpr)
+    run.appendChild(_marker(document, "w:commentReference", comment_id))
+    return run
+
+
+def _insert_after(node, new) -> None:
+    node.parentNode.insertBefore(new, node.nextSibling)
+
+
+def _place_markers(
+    document, markers, comment_id: int, first=None, last=None, paragraph=None
+) -> None:
+    start = _marker(document, "w:commentRangeStart", comment_id)
+    end = _marker(document, "w:commentRangeEnd", comment_id)
+    ref = _reference_run(document, comment_id)
+    if first is None:
+        paragraph.appendChild(start)
+        paragraph.appendChild(end)
+    else:
+        first.parentNode.insertBefore(start, first)
+        _insert_after(last, end)
+    _insert_after(end, ref)
+    markers["start"][str(comment_id)] = start
+    markers["end"][str(comment_id)] = end
+    markers["ref"][str(comment_id)] = ref
+
+
+def _nest_reply_markers(document, markers, parent_id: int, comment_id: int) -> bool:
+    pid = str(parent_id)
+    if not all(pid in markers[key] for key in ("start", "end", "ref")):
+        return False
+
+    start = _marker(document, "w:commentRangeStart", comment_id)
+    end = _marker(document, "w:commentRangeEnd", comment_id)
+    ref = _reference_run(document, comment_id)
+    _insert_after(markers["start"][pid], start)
+    markers["end"][pid].parentNode.insertBefore(end, markers["end"][pid])
+    _insert_after(markers["ref"][pid], ref)
+    markers["start"][str(comment_id)] = start
+    markers["end"][str(comment_id)] = end
+    markers["ref"][str(comment_id)] = ref
+    return True
+
+
+class _ParagraphIndex:
+    """Paragraph lookup by w14:paraId and by text, built once per batch.
+
+    Placing markers splits runs but never changes paragraph text, so the
+    joined text stays valid; only the segments of the paragraph that was
+    split (and of any paragraph containing it) are recomputed.
+    """
+
+    def __init__(self, document):
+        self.paragraphs = document.getElementsByTagName("w:p")
+        self._positions = {p: i for i, p in enumerate(self.paragraphs)}
+        self._para_ids = None
+        self._text = None
+        self._starts = []
+        self._segments = {}
+
+    def by_para_id(self, para_id: str):
+        if self._para_ids is None:
+            self._para_ids = {}
+            for paragraph in self.paragraphs:
+                self._para_ids.setdefault(
+                    paragraph.getAttribute("w14:paraId"), paragraph
+                )
+        return self._para_ids.get(para_id)
+
+    def matches(self, anchor: str):
+        """Yield (paragraph, segments, offset) for each occurrence of anchor."""
+        if self._text is None:
+            texts = []
+            offset = 0
+            for i in range(len(self.paragraphs)):
+                text = "".join(text for _, _, text in self.segments(i))
+                self._starts.append(offset)
+                texts.append(text)
+                offset += len(text) + 1
+            self._text = "\x00".join(texts)
+
+        index = self._text.find(anchor)
+        while index != -1:
+            i = bisect_right(self._starts, index) - 1
+            end = self._starts[i + 1] - 1 if i + 1 < len(self._starts) else None
+            if end is None or index + len(anchor) <= end:
+                yield self.paragraphs[i], self.segments(i), index - self._starts[i]
+            index = self._text.find(anchor, index + 1)
+
+    def segments(self, i: int) -> list[tuple]:
+        if i not in self._segments:
+            self._segments[i] = _paragraph_segments(self.paragraphs[i])
+        return self._segments[i]
+
+    def changed(self, node) -> None:
+        while node is not None:
+            if node in self._positions:
+                self._segments.pop(self._positions[node], None)
+            node = node.parentNode
+
+
+def _mark_paragraph(
+    document, markers, paragraphs, para_id: str, comment_id: int
+) -> bool:
+    paragraph = paragraphs.by_para_id(para_id)
+    if paragraph is None:
+        return False
+    content = [
+        child
+        for child in paragraph.childNodes
+        if child.nodeType == child.ELEMENT_NODE and child.tagName != "w:pPr"
+    ]
+    if content:
+        _place_markers(document, markers, comment_id, content[0], content[-1])
+    else:
+        _place_markers(document, markers, comment_id, paragraph=paragraph)
+    return True
+
+
+def _text(node) -> str:
+    return "".join(c.data for c in node.childNodes if c.nodeType == c.TEXT_NODE)
+
+
+def _set_text(document, t, text: str) -> None:
+    while t.firstChild:
+        t.removeChild(t.firstChild)
+    t.appendChild(document.createTextNode(text))
+    t.setAttribute("xml:space", "preserve")
+
+
+def _paragraph_segments(node, segments=None) -> list[tuple]:
+    if segments is None:
+        segments = []
+    for child in node.childNodes:
+        if child.nodeType != child.ELEMENT_NODE:
+            continue
+        if child.tagName == "w:r":
+            for t in child.getElementsByTagName("w:t"):
+                segments.append((child, t, _text(t)))
+        elif child.tagName in INLINE_WRAPPERS:
+            _paragraph_segments(child, segments)
+        elif child.getElementsByTagName("w:t"):
+            segments.append((None, None, "\x00"))
+    return segments
+
+
+def _paragraph_child(node, paragraph):
+    while node.parentNode is not paragraph:
+        node = node.parentNode
+    return node
+
+
+def _mark_anchor(document, markers, paragraphs, anchor: str, comment_id: int) -> bool:
+    for paragraph, segments, index in paragraphs.matches(anchor):
+        span = _anchor_span(segments, index, index + len(anchor))
+        if span is not None:
+            first, last = _isolate_runs(document, segments, *span)
+            paragraphs.changed(paragraph)
+            first = _paragraph_child(first, paragraph)
+            last = _paragraph_child(last, paragraph)
+            _place_markers(document, markers, comment_id, first, last)
+            return True
+    return False
 
-    extensible = word / "commentsExtensible.xml"
-    if not extensible.exists():
-        shutil.copy(TEMPLATE_DIR / "commentsExtensible.xml", extensible)
-    _append_xml(
-        extensible,
-        "w16cex:commentsExtensible",
-        f'<w16cex:commentExtensible w16cex:durableId="{durable_id}" w16cex:dateUtc="{ts}"/>',
-    )
 
-    action = "reply" if parent_id is not None else "comment"
-    return para_id, f"Added {action} {comment_id} (para_id={para_id})"
+def _anchor_span(segments, start: int, end: int) -> tuple | None:
+    offset = 0
+    first = last = None
+    for i, (run, _, text) in enumerate(segments):
+        if offset < end and offset + len(text) > start:
+            if run is None:
+                return None
+            if first is None:
+                first = (i, start - offset)
+            last = (i, end - offset)
+        offset += len(text)
+    return first, last
+
+
+def _isolate_runs(document, segments, first, last):
+    (first_index, start_offset), (last_index, end_offset) = first, last
+    first_run, first_t, _ = segments[first_index]
+    last_run, last_t, _ = segments[last_index]
+
+    tail = _split_run(document, last_run, last_t, end_offset)
+    head_run = first_run
+    first_run = _split_run(document, first_run, first_t, start_offset)
+    if last_run is head_run:
+        last_run = first_run
+
+    for run in (tail, head_run):
+        if _is_empty_run(run):
+            run.parentNode.removeChild(run)
+    return first_run, last_run
+
+
+def _split_run(document, run, t, offset: int):
+    right = run.cloneNode(True)
+    left_children = [c for c in run.childNodes if c.nodeType == c.ELEMENT_NODE]
+    right_children = [c for c in right.childNodes if c.nodeType == c.ELEMENT_NODE]
+    index = left_children.index(t)
+
+    for child in left_children[index + 1 :]:
+        run.removeChild(child)
+    for child in right_children[:index]:
+        if child.tagName != "w:rPr":
+            right.removeChild(child)
+
+    text = _text(t)
+    _set_text(document, t, text[:offset])
+    _set_text(document, right_children[index], text[offset:])
+    _insert_after(run, right)
+    return right
+
+
+def _is_empty_run(run) -> bool:
+    for child in run.childNodes:
+        if child.nodeType != child.ELEMENT_NODE or child.tagName == "w:rPr":
+            continue
+        if child.tagName != "w:t" or _text(child):
+            return False
+    return True
 
 
 if __name__ == "__main__":
     p = argparse.ArgumentParser(description="Add comments to DOCX documents")
     p.add_argument("unpacked_dir", help="Unpacked DOCX directory")
-    p.add_argument("comment_id", type=int, help="Comment ID (must be unique)")
-    p.add_argument("text", help="Comment text")
+    p.add_argument(
+        "comment_id", type=int, nargs="?", help="Comment ID (must be unique)"
+    )
+    p.add_argument("text", nargs="?", help="Comment text")
     p.add_argument("--author", default="Claude", help="Author name")
     p.add_argument("--initials", default="C", help="Author initials")
     p.add_argument("--parent", type=int, help="Parent comment ID (for replies)")
+    p.add_argument(
+        "--batch",
+        metavar="JSONL",
+        help="Add every comment in a JSONL file and place its markers",
+    )
     args = p.parse_args()
 
+    if args.batch:
+        try:
+            with open(args.batch, encoding="utf-8") as f:
+                comments = [json.loads(line) for line in f if line.strip()]
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        _, msg = add_comments(args.unpacked_dir, comments, args.author, args.initials)
+        print(msg)
+        if "Error" in msg:
+            sys.exit(1)
+        sys.exit(0)
+
+    if args.comment_id is None or args.text is None:
+        p.error("comment_id and text are required unless --batch is given")
+
     para_id, msg = add_comment(
         args.unpacked_dir,
         args.comment_id,
@@ -10,7 +10,10 @@ Also:
 
 from pathlib import Path
 
-import defusedxml.minidom
+import lxml.etree
+
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+PARSER = lxml.etree.XMLParser(resolve_entities=False, no_network=True, load_dtd=False)
 
 
 def merge_runs(input_dir: str) -> tuple[int, str]:
@@ -20,180 +23,141 @@ def merge_runs(input_dir: str) -> tuple[int, str]:
         return 0, f"Error: {doc_xml} not found"
 
     try:
-        dom = defusedxml.minidom.parseString(doc_xml.read_text(encoding="utf-8"))
-        root = dom.documentElement
-
-        _remove_elements(root, "proofErr")
-        _strip_run_rsid_attrs(root)
-
-        containers = {run.parentNode for run in _find_elements(root, "r")}
-
-        merge_count = 0
-        for container in containers:
-            merge_count += _merge_runs_in(container)
+        tree = lxml.etree.parse(str(doc_xml), PARSER)
+        merge_count = merge_runs_in_tree(tree.getroot())
 
-        doc_xml.write_bytes(dom.toxml(encoding="UTF-8"))
+        doc_xml.write_bytes(
+            b'<?xml version="1.0" encoding="UTF-8"?>'
+            + lxml.etree.tostring(tree, encoding="UTF-8", xml_declaration=False)
+        )
         return merge_count, f"Merged {merge_count} runs"
 
     except Exception as e:
         return 0, f"Error: {e}"
 
 
+def merge_runs_in_tree(root) -> int:
+    containers = {}
+    proof_errors = []
+    for elem in root.iter(lxml.etree.Element):
+        name = _local_name(elem)
+        if name == "r":
+            _strip_rsid_attrs(elem)
+            parent = elem.getparent()
+            if parent is not None:
+                containers[parent] = None
+        elif name == "proofErr":
+            proof_errors.append(elem)
 
+    for elem in proof_errors:
+        if elem.getparent() is not None:
+            _remove_keeping_tail(elem)
 
-def _find_elements(root, tag: str) -> list:
-    results = []
-
-    def traverse(node):
-        if node.nodeType == node.ELEMENT_NODE:
-            name = node.localName or node.tagName
-            if name == tag or name.endswith(f":{tag}"):
-                results.append(node)
-            for child in node.childNodes:
-                traverse(child)
-
-    traverse(root)
-    return results
-
-
-def _get_child(parent, tag: str):
-    for child in parent.childNodes:
-        if child.nodeType == child.ELEMENT_NODE:
-            name = child.localName or child.tagName
-            if name == tag or name.endswith(f":{tag}"):
-                return child
-    return None
-
-
-def _get_children(parent, tag: str) -> list:
-    results = []
-    for child in parent.childNodes:
-        if child.nodeType == child.ELEMENT_NODE:
-            name = child.localName or child.tagName
-            if name == tag or name.endswith(f":{tag}"):
-                results.append(child)
-    return results
-
+    merge_count = 0
+    for container in containers:
+        merge_count += _merge_runs_in(container)
 
-def _is_adjacent(elem1, elem2) -> bool:
-    node = elem1.nextSibling
-    while node:
-        if node == elem2:
-            return True
-        if node.nodeType == node.ELEMENT_NODE:
-            return False
-        if node.nodeType == node.TEXT_NODE and node.data.strip():
-            return False
-        node = node.nextSibling
-    return False
+    return merge_count
 
 
+def _local_name(node) -> str | None:
+    if not isinstance(node.tag, str):
+        return None
+    return lxml.etree.QName(node).localname
 
 
-def _remove_elements(root, tag: str):
-    for elem in _find_elements(root, tag):
-        if elem.parentNode:
-            elem.parentNode.removeChild(elem)
+def _is_blank(text) -> bool:
+    return not text or not text.strip()
 
 
-def _strip_run_rsid_attrs(root):
-    for run in _find_elements(root, "r"):
-        for attr in list(run.attributes.values()):
-            if "rsid" in attr.name.lower():
-                run.removeAttribute(attr.name)
+def _remove_keeping_tail(node) -> None:
+    parent = node.getparent()
+    if node.tail:
+        previous = node.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + node.tail
+        else:
+            parent.text = (parent.text or "") + node.tail
+    parent.remove(node)
 
 
+def _strip_rsid_attrs(run):
+    for name in list(run.attrib):
+        if "rsid" in lxml.etree.QName(name).localname.lower():
+            del run.attrib[name]
 
 
 def _merge_runs_in(container) -> int:
     merge_count = 0
-    run = _first_child_run(container)
-
-    while run:
-        while True:
-            next_elem = _next_element_sibling(run)
-            if next_elem and _is_run(next_elem) and _can_merge(run, next_elem):
-                _merge_run_content(run, next_elem)
-                container.removeChild(next_elem)
-                merge_count += 1
-            else:
-                break
+    current = current_key = None
 
-        _consolidate_text(run)
-        run = _next_sibling_run(run)
+    for child in list(container):
+        if not isinstance(child.tag, str):
+            continue
 
-    return merge_count
+        if _local_name(child) != "r":
+            if current is not None:
+                _consolidate_text(current)
+            current = current_key = None
+            continue
 
+        key = _rpr_key(child)
+        if current is not None and key == current_key:
+            _merge_run_content(current, child)
+            _remove_keeping_tail(child)
+            merge_count += 1
+            continue
 
-def _first_child_run(container):
-    for child in container.childNodes:
-        if child.nodeType == child.ELEMENT_NODE and _is_run(child):
-            return child
-    return None
+        if current is not None:
+            _consolidate_text(current)
+        current, current_key = child, key
 
+    if current is not None:
+        _consolidate_text(current)
 
-def _next_element_sibling(node):
-    sibling = node.nextSibling
-    while sibling:
-        if sibling.nodeType == sibling.ELEMENT_NODE:
-            return sibling
-        sibling = sibling.nextSibling
-    return None
+    return merge_count
 
 
-def _next_sibling_run(node):
-    sibling = node.nextSibling
-    while sibling:
-        if sibling.nodeType == sibling.ELEMENT_NODE:
-            if _is_run(sibling):
-                return sibling
-        sibling = sibling.nextSibling
+def _rpr_key(run) -> bytes | None:
+    for child in run:
+        if _local_name(child) == "rPr":
+            return lxml.etree.tostring(
+                child, method="c14n", exclusive=True, with_comments=False
+            )
     return None
 
 
-def _is_run(node) -> bool:
-    name = node.localName or node.tagName
-    return name == "r" or name.endswith(":r")
-
-
-def _can_merge(run1, run2) -> bool:
-    rpr1 = _get_child(run1, "rPr")
-    rpr2 = _get_child(run2, "rPr")
-
-    if (rpr1 is None) != (rpr2 is None):
-        return False
-    if rpr1 is None:
-        return True
-    return rpr1.toxml() == rpr2.toxml()  
-
-
 def _merge_run_content(target, source):
-    for child in list(source.childNodes):
-        if child.nodeType == child.ELEMENT_NODE:
-            name = child.localName or child.tagName
-            if name != "rPr" and not name.endswith(":rPr"):
-                target.appendChild(child)
+    for child in list(source):
+        if isinstance(child.tag, str) and _local_name(child) != "rPr":
+            child.tail = None
+            target.append(child)
 
 
 def _consolidate_text(run):
-    t_elements = _get_children(run, "t")
+    prev = None
 
-    for i in range(len(t_elements) - 1, 0, -1):
-        curr, prev = t_elements[i], t_elements[i - 1]
+    for child in list(run):
+        if not isinstance(child.tag, str):
+            if not _is_blank(child.tail):
+                prev = None
+            continue
 
-        if _is_adjacent(prev, curr):
-            prev_text = prev.firstChild.data if prev.firstChild else ""
-            curr_text = curr.firstChild.data if curr.firstChild else ""
-            merged = prev_text + curr_text
+        if _local_name(child) != "t":
+            prev = None
+            continue
 
-            if prev.firstChild:
-                prev.firstChild.data = merged
-            else:
-                prev.appendChild(run.ownerDocument.createTextNode(merged))
+        if prev is not None and _is_blank(prev.tail):
+            merged = (prev.text or "") + (child.text or "")
+            prev.text = merged
 
             if merged.startswith(" ") or merged.endswith(" "):
-                prev.setAttribute("xml:space", "preserve")
-            elif prev.hasAttribute("xml:space"):
-                prev.removeAttribute("xml:space")
-
-            run.removeChild(curr)
+                prev.set(XML_SPACE, "preserve")
+            elif XML_SPACE in prev.attrib:
+                del prev.attrib[XML_SPACE]
+
+            if not _is_blank(child.tail):
+                prev = None
+            _remove_keeping_tail(child)
+        else:
+            prev = child
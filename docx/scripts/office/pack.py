@@ -1,25 +1,45 @@
 """Pack a directory into a DOCX, PPTX, or XLSX file.
 
 Validates with auto-repair, condenses XML formatting, and creates the Office file.
+Parts are condensed in memory and streamed straight into the archive.
 
 Usage:
-    python pack.py <input_directory> <output_file> [--original <file>] [--validate true|false]
+    python pack.py <input_directory> <output_file> [--original <file>] [--validate true|false] [--jobs N] [--incremental]
+                   [--compression-level 0-9]
 
 Examples:
     python pack.py unpacked/ output.docx --original input.docx
     python pack.py unpacked/ output.pptx --validate false
+    python pack.py unpacked/ output.pptx --original input.pptx --jobs 8
+    python pack.py unpacked/ output.docx --original input.docx --incremental
+    python pack.py unpacked/ output.pptx --validate false --compression-level 1
 """
 
 import argparse
+import io
 import sys
-import shutil
-import tempfile
 import zipfile
 from pathlib import Path
 
-import defusedxml.minidom
+import lxml.etree
+
+try:
+    from validators import (
+        DOCXSchemaValidator,
+        PPTXSchemaValidator,
+        RedliningValidator,
+        XMLTreeCache,
+    )
+except ImportError:
+    from .validators import (
+        DOCXSchemaValidator,
+        PPTXSchemaValidator,
+        RedliningValidator,
+        XMLTreeCache,
+    )
+
+CONTENT_TYPES = "[Content_Types].xml"
 
-from validators import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
 
 def pack(
     input_directory: str,
@@ -27,6 +47,9 @@ def pack(
     original_file: str | None = None,
     validate: bool = True,
     infer_author_func=None,
+    jobs: int = 1,
+    incremental: bool = False,
+    compression_level: int | None = None,
 ) -> tuple[None, str]:
     input_dir = Path(input_directory)
     output_path = Path(output_file)
@@ -42,26 +65,35 @@ def pack(
         original_path = Path(original_file)
         if original_path.exists():
             success, output = _run_validation(
-                input_dir, original_path, suffix, infer_author_func
+                input_dir,
+                original_path,
+                suffix,
+                infer_author_func,
+                jobs,
+                incremental,
             )
             if output:
                 print(output)
             if not success:
                 return None, f"Error: Validation failed for {input_dir}"
 
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                _condense_xml(xml_file)
-
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
+    parts = [
+        f
+        for f in sorted(input_dir.rglob("*"))
+        if f.is_file() and f.name != DOCXSchemaValidator.MANIFEST_FILENAME
+    ]
+    parts.sort(key=lambda f: f.relative_to(input_dir).as_posix() != CONTENT_TYPES)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(
+        output_path, "w", zipfile.ZIP_DEFLATED, compresslevel=compression_level
+    ) as zf:
+        for f in parts:
+            arcname = f.relative_to(input_dir).as_posix()
+            if f.name.endswith((".xml", ".rels")):
+                zf.writestr(arcname, _condense_xml(f))
+            else:
+                zf.write(f, arcname)
 
     return None, f"Successfully packed {input_dir} to {output_file}"
 
@@ -71,9 +103,12 @@ def _run_validation(
     original_file: Path,
     suffix: str,
     infer_author_func=None,
+    jobs: int = 1,
+    incremental: bool = False,
 ) -> tuple[bool, str | None]:
     output_lines = []
     validators = []
+    trees = XMLTreeCache()
 
     if suffix == ".docx":
         author = "Claude"
@@ -84,11 +119,25 @@ def _run_validation(
                 print(f"Warning: {e} Using default author 'Claude'.", file=sys.stderr)
 
         validators = [
-            DOCXSchemaValidator(unpacked_dir, original_file),
-            RedliningValidator(unpacked_dir, original_file, author=author),
+            DOCXSchemaValidator(
+                unpacked_dir,
+                original_file,
+                jobs=jobs,
+                trees=trees,
+                incremental=incremental,
+            ),
+            RedliningValidator(unpacked_dir, original_file, author=author, trees=trees),
         ]
     elif suffix == ".pptx":
-        validators = [PPTXSchemaValidator(unpacked_dir, original_file)]
+        validators = [
+            PPTXSchemaValidator(
+                unpacked_dir,
+                original_file,
+                jobs=jobs,
+                trees=trees,
+                incremental=incremental,
+            )
+        ]
 
     if not validators:
         return True, None
@@ -105,29 +154,49 @@ def _run_validation(
     return success, "\n".join(output_lines) if output_lines else None
 
 
-def _condense_xml(xml_file: Path) -> None:
+def _condense_xml(xml_file: Path) -> bytes:
     try:
-        with open(xml_file, encoding="utf-8") as f:
-            dom = defusedxml.minidom.parse(f)
-
-        for element in dom.getElementsByTagName("*"):
-            if element.tagName.endswith(":t"):
+        events = lxml.etree.iterparse(
+            io.BytesIO(xml_file.read_bytes()),
+            events=("end",),
+            resolve_entities=False,
+            no_network=True,
+            load_dtd=False,
+        )
+        for _, element in events:
+            if element.prefix and lxml.etree.QName(element).localname == "t":
                 continue
 
-            for child in list(element.childNodes):
-                if (
-                    child.nodeType == child.TEXT_NODE
-                    and child.nodeValue
-                    and child.nodeValue.strip() == ""
-                ) or child.nodeType == child.COMMENT_NODE:
-                    element.removeChild(child)
+            if element.text is not None and not element.text.strip():
+                element.text = None
 
-        xml_file.write_bytes(dom.toxml(encoding="UTF-8"))
+            for child in list(element):
+                if child.tail is not None and not child.tail.strip():
+                    child.tail = None
+                if child.tag is lxml.etree.Comment:
+                    _remove_keeping_tail(child)
+
+        # Serialize the whole tree so processing instructions and comments
+        # outside the root (e.g. <?mso-application?>) are kept.
+        return b'<?xml version="1.0" encoding="UTF-8"?>' + lxml.etree.tostring(
+            events.root.getroottree(), encoding="UTF-8", xml_declaration=False
+        )
     except Exception as e:
         print(f"ERROR: Failed to parse {xml_file.name}: {e}", file=sys.stderr)
         raise
 
 
+def _remove_keeping_tail(node) -> None:
+    parent = node.getparent()
+    if node.tail:
+        previous = node.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + node.tail
+        else:
+            parent.text = (parent.text or "") + node.tail
+    parent.remove(node)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Pack a directory into a DOCX, PPTX, or XLSX file"
@@ -145,6 +214,26 @@ if __name__ == "__main__":
         metavar="true|false",
         help="Run validation with auto-repair (default: true)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for per-part validation (default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only revalidate parts changed since the previous pack of this directory",
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        choices=range(10),
+        default=None,
+        metavar="0-9",
+        help="Deflate compression level (default: zlib default)",
+    )
     args = parser.parse_args()
 
     _, message = pack(
@@ -152,6 +241,9 @@ if __name__ == "__main__":
         args.output_file,
         original_file=args.original,
         validate=args.validate,
+        jobs=args.jobs,
+        incremental=args.incremental,
+        compression_level=args.compression_level,
     )
     print(message)
 
@@ -1,15 +1,33 @@
-"""Accept all tracked changes in a DOCX file using LibreOffice.
+"""Accept or reject tracked changes in a DOCX file.
 
-Requires LibreOffice (soffice) to be installed.
+Revisions are resolved directly in the XML of every story part (document,
+headers, footers, footnotes, endnotes, comments, styles and numbering):
+insertions are unwrapped, deletions dropped, moves resolved, formatting
+changes (w:rPrChange, w:pPrChange, ...) settled, and paragraphs whose mark
+was deleted are joined with the next one. The package is read once and
+written once; LibreOffice is not needed.
+
+Usage:
+    python accept_changes.py input.docx output.docx
+    python accept_changes.py input.docx output.docx --author "Jane Doe"
+    python accept_changes.py input.docx output.docx --reject
+    python accept_changes.py input.docx output.docx --libreoffice
+
+--author limits the operation to one author's revisions; the others stay
+tracked. --libreoffice uses the previous soffice macro route (accept all).
 """
 
 import argparse
 import logging
+import re
 import shutil
 import subprocess
+import zipfile
 from pathlib import Path
 
-from office.soffice import get_soffice_env
+import lxml.etree
+
+from office.soffice import accept_changes_job, get_pool, get_soffice_env
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +51,275 @@ ACCEPT_CHANGES_MACRO = """<?xml version="1.0" encoding="UTF-8"?>
 </script:module>"""
 
 
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+STORY_PARTS = re.compile(r"word/[^/]+\.xml$")
+# Any prefix (or none) may be bound to the WordprocessingML namespace; the
+# tree walk matches on the namespace, this only skips parts with no candidates.
+REVISION_MARKUP = re.compile(
+    rb"<(?:[\w.-]+:)?(?:ins|del|moveFrom|moveTo|cellIns|cellDel|cellMerge|\w+Change)\b"
+    rb"|<(?:[\w.-]+:)?move(?:From|To)Range(?:Start|End)\b"
+)
+
+PARSER = lxml.etree.XMLParser(resolve_entities=False, no_network=True, load_dtd=False)
+
+
+def _w(name: str) -> str:
+    return f"{{{W_NS}}}{name}"
+
+
+PROPERTY_CHANGES = {
+    _w(name)
+    for name in (
+        "rPrChange",
+        "pPrChange",
+        "sectPrChange",
+        "tblPrChange",
+        "tblPrExChange",
+        "trPrChange",
+        "tcPrChange",
+        "tblGridChange",
+    )
+}
+CONTENT_CHANGES = {_w(name) for name in ("ins", "del", "moveFrom", "moveTo")}
+CELL_CHANGES = {_w(name) for name in ("cellIns", "cellDel", "cellMerge")}
+MOVE_RANGE_ENDS = {
+    _w("moveFromRangeEnd"): _w("moveFromRangeStart"),
+    _w("moveToRangeEnd"): _w("moveToRangeStart"),
+}
+KEPT_PROPERTIES = {
+    _w(name)
+    for name in ("rPr", "sectPr", "headerReference", "footerReference")
+} | CONTENT_CHANGES | CELL_CHANGES
+SECTION_REFERENCES = {_w("headerReference"), _w("footerReference")}
+# Children that precede the restored properties: section header/footer
+# references, and the paragraph mark's w:ins/w:del/w:moveFrom/w:moveTo.
+LEADING_PROPERTIES = SECTION_REFERENCES | CONTENT_CHANGES
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+DELETED_TEXT = {_w("delText"): _w("t"), _w("delInstrText"): _w("instrText")}
+
+
 def accept_changes(
     input_file: str,
     output_file: str,
+    author: str | None = None,
+) -> tuple[None, str]:
+    return _resolve_changes(input_file, output_file, author, reject=False)
+
+
+def reject_changes(
+    input_file: str,
+    output_file: str,
+    author: str | None = None,
+) -> tuple[None, str]:
+    return _resolve_changes(input_file, output_file, author, reject=True)
+
+
+def _resolve_changes(
+    input_file: str, output_file: str, author: str | None, reject: bool
+) -> tuple[None, str]:
+    input_path = Path(input_file)
+    output_path = Path(output_file)
+
+    if not input_path.exists():
+        return None, f"Error: Input file not found: {input_file}"
+
+    if not input_path.suffix.lower() == ".docx":
+        return None, f"Error: Input file is not a DOCX file: {input_file}"
+
+    try:
+        with zipfile.ZipFile(input_path) as zf:
+            entries = [(info, zf.read(info)) for info in zf.infolist()]
+    except zipfile.BadZipFile as e:
+        return None, f"Error: Failed to read {input_file}: {e}"
+
+    resolved = 0
+    parts = []
+    for info, data in entries:
+        if STORY_PARTS.match(info.filename) and REVISION_MARKUP.search(data):
+            root = lxml.etree.fromstring(data, PARSER)
+            count = resolve_revisions(root, reject=reject, author=author)
+            if count:
+                resolved += count
+                data = lxml.etree.tostring(
+                    root, xml_declaration=True, encoding="UTF-8", standalone=True
+                )
+        parts.append((info, data))
+
+    try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for info, data in parts:
+                zf.writestr(info, data)
+    except OSError as e:
+        return None, f"Error: Failed to write {output_file}: {e}"
+
+    action = "rejected" if reject else "accepted"
+    by_author = f" by {author}" if author is not None else ""
+    return (
+        None,
+        f"Successfully {action} {resolved} tracked changes{by_author}: "
+        f"{input_file} -> {output_file}",
+    )
+
+
+def resolve_revisions(root, reject: bool = False, author: str | None = None) -> int:
+    """Accept (or reject) the tracked changes in one parsed story part.
+
+    Returns the number of revision elements resolved; revisions inside
+    content that was already removed are not counted. With author set, only
+    that author's revisions are touched.
+    """
+    if reject:
+        kept, dropped = {_w("del"), _w("moveFrom")}, {_w("ins"), _w("moveTo")}
+        dropped_cell = _w("cellIns")
+    else:
+        kept, dropped = {_w("ins"), _w("moveTo")}, {_w("del"), _w("moveFrom")}
+        dropped_cell = _w("cellDel")
+
+    revisions = [
+        elem
+        for elem in root.iter(
+            *CONTENT_CHANGES,
+            *PROPERTY_CHANGES,
+            *CELL_CHANGES,
+            *MOVE_RANGE_ENDS.values(),
+            _w("numberingChange"),
+        )
+        if author is None or elem.get(_w("author")) == author
+    ]
+    joined_paragraphs = []
+    move_ranges = set()
+    resolved = 0
+
+    for elem in revisions:
+        parent = elem.getparent()
+        if parent is None:
+            continue
+
+        if elem.tag in MOVE_RANGE_ENDS.values():
+            move_ranges.add((elem.tag, elem.get(_w("id"))))
+            parent.remove(elem)
+            continue
+
+        if not _is_attached(elem, root):
+            continue
+
+        resolved += 1
+        if elem.tag in PROPERTY_CHANGES:
+            if reject:
+                _restore_properties(elem)
+            else:
+                parent.remove(elem)
+        elif elem.tag == _w("numberingChange"):
+            parent.remove(elem)
+        elif elem.tag in CELL_CHANGES:
+            if elem.tag == dropped_cell:
+                _remove_table_part(parent.getparent())
+            else:
+                parent.remove(elem)
+        elif parent.tag == _w("rPr"):
+            # Paragraph mark revision: w:p/w:pPr/w:rPr/w:ins|w:del
+            if elem.tag in dropped:
+                joined_paragraphs.append(parent.getparent().getparent())
+            parent.remove(elem)
+            if len(parent) == 0:
+                _remove(parent)
+        elif parent.tag == _w("trPr"):
+            if elem.tag in dropped:
+                _remove_table_part(parent.getparent())
+            else:
+                parent.remove(elem)
+        elif elem.tag in kept:
+            _unwrap(elem)
+        else:
+            parent.remove(elem)
+
+    for paragraph in joined_paragraphs:
+        _join_with_next(paragraph)
+
+    for marker in list(root.iter(*MOVE_RANGE_ENDS)):
+        if (MOVE_RANGE_ENDS[marker.tag], marker.get(_w("id"))) in move_ranges:
+            _remove(marker)
+
+    return resolved
+
+
+def _is_attached(elem, root) -> bool:
+    for elem in elem.iterancestors():
+        pass
+    return elem is root
+
+
+def _remove(elem) -> None:
+    parent = elem.getparent()
+    if parent is not None:
+        parent.remove(elem)
+
+
+def _remove_table_part(elem) -> None:
+    # Removing a table's last cell or row removes the row or table as well;
+    # Word treats an empty w:tr or w:tbl as corrupt.
+    containers = {_w("tc"): _w("tr"), _w("tr"): _w("tbl")}
+    while elem.tag in containers:
+        parent = elem.getparent()
+        if parent is None:
+            return
+        parent.remove(elem)
+        if parent.tag != containers[elem.tag] or parent.find(elem.tag) is not None:
+            return
+        elem = parent
+    _remove(elem)
+
+
+def _unwrap(elem) -> None:
+    if elem.tag in (_w("del"), _w("moveFrom")):
+        for text in list(elem.iter(*DELETED_TEXT)):
+            if next(text.iterancestors(_w("del"), _w("moveFrom"))) is elem:
+                text.tag = DELETED_TEXT[text.tag]
+                if text.text and text.text != text.text.strip():
+                    text.set(XML_SPACE, "preserve")
+
+    parent = elem.getparent()
+    index = parent.index(elem)
+    for offset, child in enumerate(list(elem)):
+        parent.insert(index + offset, child)
+    parent.remove(elem)
+
+
+def _restore_properties(change) -> None:
+    properties = change.getparent()
+    for child in list(properties):
+        if child is not change and child.tag not in KEPT_PROPERTIES:
+            properties.remove(child)
+
+    index = 0
+    while index < len(properties) and properties[index].tag in LEADING_PROPERTIES:
+        index += 1
+    old = change[0] if len(change) else []
+    for offset, child in enumerate(list(old)):
+        properties.insert(index + offset, child)
+    properties.remove(change)
+
+
+def _join_with_next(paragraph) -> None:
+    following = paragraph.getnext()
+    if paragraph.tag != _w("p") or paragraph.getparent() is None:
+        return
+    if following is None or following.tag != _w("p"):
+        return
+
+    index = 1 if len(following) and following[0].tag == _w("pPr") else 0
+    for child in list(paragraph):
+        if child.tag != _w("pPr"):
+            following.insert(index, child)
+            index += 1
+    paragraph.getparent().remove(paragraph)
+
+
+def _accept_changes_with_libreoffice(
+    input_file: str,
+    output_file: str,
 ) -> tuple[None, str]:
     input_path = Path(input_file)
     output_path = Path(output_file)
@@ -52,6 +336,19 @@ def accept_changes(
     except Exception as e:
         return None, f"Error: Failed to copy input file to output location: {e}"
 
+    pool = get_pool()
+    if pool is not None:
+        try:
+            pool.run(accept_changes_job, output_path, timeout=30)
+        except TimeoutError:
+            return None, "Error: LibreOffice timed out after 30s accepting changes"
+        except Exception as e:
+            return None, f"Error: LibreOffice failed: {e}"
+        return (
+            None,
+            f"Successfully accepted all tracked changes: {input_file} -> {output_file}",
+        )
+
     if not _setup_libreoffice_macro():
         return None, "Error: Failed to setup LibreOffice macro"
 
@@ -120,15 +417,35 @@ def _setup_libreoffice_macro() -> bool:
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
-        description="Accept all tracked changes in a DOCX file"
+        description="Accept or reject tracked changes in a DOCX file"
     )
     parser.add_argument("input_file", help="Input DOCX file with tracked changes")
     parser.add_argument(
         "output_file", help="Output DOCX file (clean, no tracked changes)"
     )
+    parser.add_argument(
+        "--author", help="Only resolve revisions by this author (default: all)"
+    )
+    parser.add_argument(
+        "--reject", action="store_true", help="Reject the changes instead"
+    )
+    parser.add_argument(
+        "--libreoffice",
+        action="store_true",
+        help="Accept all changes through LibreOffice instead of editing the XML",
+    )
     args = parser.parse_args()
 
-    _, message = accept_changes(args.input_file, args.output_file)
+    if args.libreoffice:
+        if args.author or args.reject:
+            parser.error("--libreoffice accepts all changes; drop --author/--reject")
+        _, message = _accept_changes_with_libreoffice(
+            args.input_file, args.output_file
+        )
+    elif args.reject:
+        _, message = reject_changes(args.input_file, args.output_file, args.author)
+    else:
+        _, message = accept_changes(args.input_file, args.output_file, args.author)
     print(message)
 
     if "Error" in message:
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+SPEC = importlib.util.spec_from_file_location(
+    "accept_changes", SCRIPTS_DIR / "accept_changes.py"
+)
+assert SPEC and SPEC.loader
+accept_changes = importlib.util.module_from_spec(SPEC)
+SPEC.loader.exec_module(accept_changes)
+
+W = accept_changes.W_NS
+
+
+def _docx(path: Path, body: str, prefix: str = "w") -> Path:
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<{prefix}:document xmlns:{prefix}="{W}"><{prefix}:body>'
+        f"{body}</{prefix}:body></{prefix}:document>"
+    )
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("[Content_Types].xml", "<Types/>")
+        zf.writestr("word/document.xml", document)
+    return path
+
+
+def _resolve(tmp_path: Path, body: str, reject: bool = False, **kwargs):
+    source = _docx(tmp_path / "in.docx", body, kwargs.pop("prefix", "w"))
+    output = tmp_path / "out.docx"
+    resolve = accept_changes.reject_changes if reject else accept_changes.accept_changes
+    _, message = resolve(str(source), str(output), **kwargs)
+    with zipfile.ZipFile(output) as zf:
+        root = lxml.etree.fromstring(zf.read("word/document.xml"))
+    return message, root
+
+
+def _texts(root) -> list[str]:
+    return [
+        "".join(t.text or "" for t in p.iter(f"{{{W}}}t"))
+        for p in root.iter(f"{{{W}}}p")
+    ]
+
+
+def _tags(elem) -> list[str]:
+    return [lxml.etree.QName(child).localname for child in elem]
+
+
+REVISIONS = (
+    '<w:p><w:r><w:t xml:space="preserve">Pay </w:t></w:r>'
+    '<w:ins w:id="1" w:author="Jane"><w:r><w:t>within </w:t></w:r></w:ins>'
+    '<w:del w:id="2" w:author="Bob"><w:r><w:delText>after </w:delText></w:r></w:del>'
+    '<w:r><w:rPr><w:b/><w:rPrChange w:id="3" w:author="Jane"><w:rPr><w:i/></w:rPr>'
+    "</w:rPrChange></w:rPr><w:t>30 days</w:t></w:r></w:p>"
+)
+
+
+def test_accept_all(tmp_path: Path) -> None:
+    message, root = _resolve(tmp_path, REVISIONS)
+
+    assert message.startswith("Successfully accepted 3 tracked changes:")
+    assert _texts(root) == ["Pay within 30 days"]
+    run = root.findall(f".//{{{W}}}r")[-1]
+    assert _tags(run.find(f"{{{W}}}rPr")) == ["b"]
+    assert not list(root.iter(f"{{{W}}}ins", f"{{{W}}}del", f"{{{W}}}rPrChange"))
+
+
+def test_reject_all(tmp_path: Path) -> None:
+    message, root = _resolve(tmp_path, REVISIONS, reject=True)
+
+    assert message.startswith("Successfully rejected 3 tracked changes:")
+    assert _texts(root) == ["Pay after 30 days"]
+    restored = root.find(f".//{{{W}}}t[.='after ']")
+    assert restored.get(accept_changes.XML_SPACE) == "preserve"
+    run = root.findall(f".//{{{W}}}r")[-1]
+    assert _tags(run.find(f"{{{W}}}rPr")) == ["i"]
+
+
+def test_author_filter(tmp_path: Path) -> None:
+    message, root = _resolve(tmp_path, REVISIONS, author="Jane")
+
+    assert message.startswith("Successfully accepted 2 tracked changes by Jane:")
+    assert not list(root.iter(f"{{{W}}}ins", f"{{{W}}}rPrChange"))
+    deletion = root.find(f".//{{{W}}}del")
+    assert deletion.get(f"{{{W}}}author") == "Bob"
+    assert deletion.findtext(f".//{{{W}}}delText") == "after "
+
+
+def test_reject_keeps_paragraph_mark_revision_first(tmp_path: Path) -> None:
+    body = (
+        '<w:p><w:pPr><w:rPr><w:ins w:id="1" w:author="Bob"/><w:b/>'
+        '<w:rPrChange w:id="2" w:author="Jane"><w:rPr><w:i/><w:sz w:val="20"/>'
+        "</w:rPr></w:rPrChange></w:rPr></w:pPr><w:r><w:t>Text</w:t></w:r></w:p>"
+    )
+    message, root = _resolve(tmp_path, body, reject=True, author="Jane")
+
+    assert message.startswith("Successfully rejected 1 tracked changes by Jane:")
+    mark = root.find(f".//{{{W}}}pPr/{{{W}}}rPr")
+    assert _tags(mark) == ["ins", "i", "sz"]
+
+
+def test_deleted_paragraph_mark_joins_paragraphs(tmp_path: Path) -> None:
+    body = (
+        '<w:p><w:pPr><w:jc w:val="left"/><w:rPr><w:del w:id="1" w:author="Jane"/>'
+        "</w:rPr></w:pPr><w:r><w:t>First half, </w:t></w:r></w:p>"
+        '<w:p><w:pPr><w:jc w:val="center"/></w:pPr><w:r><w:t>second half.</w:t></w:r></w:p>'
+    )
+    message, root = _resolve(tmp_path, body)
+
+    assert message.startswith("Successfully accepted 1 tracked changes:")
+    assert _texts(root) == ["First half, second half."]
+    paragraph = root.find(f".//{{{W}}}p")
+    assert paragraph.find(f"{{{W}}}pPr/{{{W}}}jc").get(f"{{{W}}}val") == "center"
+
+
+def test_rejected_paragraph_mark_insertion_joins_paragraphs(tmp_path: Path) -> None:
+    body = (
+        '<w:p><w:pPr><w:rPr><w:ins w:id="1" w:author="Jane"/></w:rPr></w:pPr>'
+        "<w:r><w:t>One </w:t></w:r></w:p><w:p><w:r><w:t>line.</w:t></w:r></w:p>"
+    )
+    _, root = _resolve(tmp_path, body, reject=True)
+
+    assert _texts(root) == ["One line."]
+    assert root.find(f".//{{{W}}}pPr") is None
+
+
+TABLE = (
+    "<w:tbl><w:tblPr/><w:tblGrid><w:gridCol/></w:tblGrid>{rows}</w:tbl>"
+    "<w:p><w:r><w:t>After</w:t></w:r></w:p>"
+)
+DELETED_ROW = (
+    '<w:tr><w:trPr><w:del w:id="1" w:author="Jane"/></w:trPr>'
+    "<w:tc><w:p><w:r><w:t>Gone</w:t></w:r></w:p></w:tc></w:tr>"
+)
+KEPT_ROW = "<w:tr><w:tc><w:p><w:r><w:t>Kept</w:t></w:r></w:p></w:tc></w:tr>"
+
+
+def test_deleting_last_row_removes_table(tmp_path: Path) -> None:
+    message, root = _resolve(tmp_path, TABLE.format(rows=DELETED_ROW))
+
+    assert message.startswith("Successfully accepted 1 tracked changes:")
+    assert root.find(f".//{{{W}}}tbl") is None
+    assert _texts(root) == ["After"]
+
+
+def test_deleting_one_row_keeps_table(tmp_path: Path) -> None:
+    _, root = _resolve(tmp_path, TABLE.format(rows=DELETED_ROW + KEPT_ROW))
+
+    assert len(root.findall(f".//{{{W}}}tr")) == 1
+    assert _texts(root) == ["Kept", "After"]
+
+
+def test_revisions_inside_removed_content_are_not_counted(tmp_path: Path) -> None:
+    body = (
+        '<w:p><w:del w:id="1" w:author="Jane"><w:r><w:rPr><w:b/>'
+        '<w:rPrChange w:id="2" w:author="Jane"><w:rPr/></w:rPrChange></w:rPr>'
+        "<w:delText>old</w:delText></w:r></w:del><w:r><w:t>new</w:t></w:r></w:p>"
+    )
+    message, root = _resolve(tmp_path, body)
+
+    assert message.startswith("Successfully accepted 1 tracked changes:")
+    assert _texts(root) == ["new"]
+
+
+def test_other_namespace_prefix(tmp_path: Path) -> None:
+    body = REVISIONS.replace("w:", "ns0:")
+    message, root = _resolve(tmp_path, body, prefix="ns0")
+
+    assert message.startswith("Successfully accepted 3 tracked changes:")
+    assert _texts(root) == ["Pay within 30 days"]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import lxml.etree
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+SPEC = importlib.util.spec_from_file_location("comment", SCRIPTS_DIR / "comment.py")
+assert SPEC and SPEC.loader
+comment = importlib.util.module_from_spec(SPEC)
+SPEC.loader.exec_module(comment)
+
+W = comment.NS["w"]
+W14 = comment.NS["w14"]
+W15 = comment.NS["w15"]
+NSMAP = f'xmlns:w="{W}" xmlns:w14="{W14}" xmlns:w15="{W15}"'
+
+DOCUMENT_XML = f"""<?xml version="1.0" encoding="UTF-8"?>
+<w:document {NSMAP}><w:body>
+<w:p w14:paraId="00000001"><w:commentRangeStart w:id="3"/><w:r><w:t>Legacy note here.</w:t></w:r><w:commentRangeEnd w:id="3"/><w:r><w:commentReference w:id="3"/></w:r></w:p>
+<w:p w14:paraId="00000002"><w:commentRangeStart w:id="0"/><w:r><w:t>Payment is due within thirty (30) days.</w:t></w:r><w:commentRangeEnd w:id="0"/><w:r><w:commentReference w:id="0"/></w:r></w:p>
+<w:p w14:paraId="00000003"><w:r><w:t>Termination clause.</w:t></w:r></w:p>
+</w:body></w:document>"""
+
+COMMENTS_XML = f"""<?xml version="1.0" encoding="UTF-8"?>
+<w:comments {NSMAP}>
+<w:comment w:id="0" w:author="Word"><w:p w14:paraId="0A0A0A0A"><w:r><w:t>Has paraId</w:t></w:r></w:p></w:comment>
+<w:comment w:id="3" w:author="LibreOffice"><w:p><w:r><w:t>No paraId</w:t></w:r></w:p></w:comment>
+</w:comments>"""
+
+
+def _unpacked(tmp_path: Path) -> Path:
+    word = tmp_path / "word"
+    word.mkdir()
+    (word / "document.xml").write_text(DOCUMENT_XML, encoding="utf-8")
+    (word / "comments.xml").write_text(COMMENTS_XML, encoding="utf-8")
+    return tmp_path
+
+
+def _parse(path: Path):
+    return lxml.etree.parse(str(path)).getroot()
+
+
+def _ids(root, tag: str) -> list[str]:
+    return [e.get(f"{{{W}}}id") for e in root.iter(f"{{{W}}}{tag}")]
+
+
+def test_batch_against_existing_comments(tmp_path: Path) -> None:
+    unpacked = _unpacked(tmp_path)
+
+    para_ids, msg = comment.add_comments(
+        str(unpacked),
+        [
+            {"text": "Anchor", "anchor": "thirty (30) days"},
+            {"text": "Paragraph", "paragraph": "00000003"},
+            {"text": "Reply", "parent": 0},
+        ],
+    )
+
+    assert msg == "Added 3 comments (3 anchored in document.xml)"
+    comments = _parse(unpacked / "word" / "comments.xml")
+    assert _ids(comments, "comment") == ["0", "3", "4", "5", "6"]
+
+    document = _parse(unpacked / "word" / "document.xml")
+    second, third = document.findall(f".//{{{W}}}p")[1:]
+    assert _ids(second, "commentRangeStart") == ["0", "6", "4"]
+    assert _ids(second, "commentRangeEnd") == ["4", "6", "0"]
+    start = second.find(f"{{{W}}}commentRangeStart[@{{{W}}}id='4']")
+    assert start.getnext().findtext(f"{{{W}}}t") == "thirty (30) days"
+    assert _ids(third, "commentRangeStart") == ["5"]
+    assert _ids(third, "commentReference") == ["5"]
+
+    extended = _parse(unpacked / "word" / "commentsExtended.xml")
+    reply = extended.findall(f"{{{W15}}}commentEx")[-1]
+    assert reply.get(f"{{{W15}}}paraId") == para_ids[2]
+    assert reply.get(f"{{{W15}}}paraIdParent") == "0A0A0A0A"
+
+
+def test_ids_without_para_id_are_taken(tmp_path: Path) -> None:
+    unpacked = _unpacked(tmp_path)
+    before = (unpacked / "word" / "comments.xml").read_bytes()
+
+    _, msg = comment.add_comments(str(unpacked), [{"id": 3, "text": "Duplicate"}])
+    assert msg == "Error: Comment 3 already exists"
+
+    _, msg = comment.add_comments(str(unpacked), [{"text": "Reply", "parent": 3}])
+    assert msg == "Error: Parent comment 3 has no w14:paraId"
+
+    _, msg = comment.add_comments(str(unpacked), [{"text": "Reply", "parent": 1}])
+    assert msg == "Error: Parent comment 1 not found"
+
+    assert (unpacked / "word" / "comments.xml").read_bytes() == before
+    assert not (unpacked / "word" / "commentsExtended.xml").exists()
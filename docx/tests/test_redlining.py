@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+from office.validators.redlining import RedliningValidator  # noqa: E402
+
+
+# (original, modified, `git diff --word-diff=plain --word-diff-regex=. -U0`)
+# Outputs recorded with git 2.39. The character cases depend on change
+# compaction (sliding and aligning change groups); the indented paragraph
+# cases also depend on git's indent heuristic.
+CASES = [
+    (
+        "Pay within thirty days.",
+        "Pay within 30 days.",
+        "Pay within [-thirty-]{+30+} days.",
+    ),
+    (
+        "Recitals\nTerm\nNotices\nSignatures",
+        "Recitals\nNotices\nSignatures",
+        "[-Term-]",
+    ),
+    ("One\nTwo", "One\nTwo\nThree", "Two\n{+Three+}"),
+    (
+        "Same text.\nSame text.\nSame text.",
+        "Same text.\nSame test.\nSame text.",
+        "Same te[-x-]{+s+}t.",
+    ),
+    ("abbb", " abb", "{+ +}abb[-b-]"),
+    ("aaaaabbaaba", "aaaaabaabba", "aaaaab[-b-]aab{+b+}a"),
+    ("a  baaa abba", "a   baaa aabbaa", "a  {+ +}baaa a{+a+}bba{+a+}"),
+    (
+        "    z\nreturn y\n    y = 1\ndef f():",
+        "    z\nreturn y\n    z\n\nreturn y\n    y = 1\ndef f():",
+        "{+return y+}\n{+    z+}",
+    ),
+    (
+        "\n    z\nreturn y",
+        "\n    z\nif x:\n    z\nreturn y",
+        "{+    z+}\n{+if x:+}",
+    ),
+    (
+        "    z\n    y = 1\npass\n    z\n",
+        "    z\n    y = 1\npass\n    y = 1\nif x:\ndef f():\npass\n    z\n",
+        "{+pass+}\n{+    y = 1+}\n{+if x:+}\n{+def f():+}",
+    ),
+]
+
+
+def _word_diff(original: str, modified: str) -> str | None:
+    validator = RedliningValidator(Path("unpacked"), Path("original.docx"))
+    return validator._get_word_diff(original, modified)
+
+
+def _git_word_diff(tmp_path: Path, original: str, modified: str) -> str | None:
+    (tmp_path / "original.txt").write_text(original, encoding="utf-8")
+    (tmp_path / "modified.txt").write_text(modified, encoding="utf-8")
+    result = subprocess.run(
+        [
+            "git",
+            "diff",
+            "--word-diff=plain",
+            "--word-diff-regex=.",
+            "-U0",
+            "--no-index",
+            str(tmp_path / "original.txt"),
+            str(tmp_path / "modified.txt"),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    lines = result.stdout.split("\n")
+    hunk = next((i for i, line in enumerate(lines) if line.startswith("@@")), None)
+    if hunk is None:
+        return None
+    content = [
+        line for line in lines[hunk:] if not line.startswith("@@") and line.strip()
+    ]
+    return "\n".join(content) or None
+
+
+def _rewrite(seed: int) -> tuple[str, str]:
+    rng = random.Random(seed)
+    words = "the of and to in shall party agreement notice days within".split()
+    paragraphs = [
+        " ".join(rng.choice(words) for _ in range(rng.randint(5, 40)))
+        for _ in range(60)
+    ]
+    edited = []
+    for paragraph in paragraphs:
+        r = rng.random()
+        if r < 0.3:
+            paragraph = "".join(
+                c if rng.random() > 0.2 else rng.choice("xyz ") for c in paragraph
+            )
+        elif r < 0.4:
+            continue
+        elif r < 0.5:
+            edited.append(" ".join(rng.choice(words) for _ in range(10)))
+        edited.append(paragraph)
+    return "\n".join(paragraphs), "\n".join(edited)
+
+
+def _scramble(seed: int) -> tuple[str, str]:
+    # One long paragraph with ~30% of characters changed, past the cost cap.
+    rng = random.Random(seed)
+    original = "".join(rng.choice("abcde  ") for _ in range(6000))
+    modified = "".join(
+        c if rng.random() > 0.3 else rng.choice("abcxy ") for c in original
+    )
+    return original, modified
+
+
+@pytest.mark.parametrize("original, modified, expected", CASES)
+def test_word_diff_matches_recorded_git_output(
+    original: str, modified: str, expected: str
+) -> None:
+    assert _word_diff(original, modified) == expected
+
+
+def test_identical_text_has_no_diff() -> None:
+    assert _word_diff("Same.\nText.", "Same.\nText.") is None
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+@pytest.mark.parametrize(
+    "original, modified",
+    [case[:2] for case in CASES]
+    + [_rewrite(seed) for seed in range(3)]
+    + [_scramble(seed) for seed in range(2)],
+)
+def test_word_diff_matches_git(tmp_path: Path, original: str, modified: str) -> None:
+    assert _word_diff(original, modified) == _git_word_diff(
+        tmp_path, original, modified
+    )
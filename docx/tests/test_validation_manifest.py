@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+from office.validators import DOCXSchemaValidator  # noqa: E402
+
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+PARTS = {
+    "word/document.xml": (
+        f'<w:document xmlns:w="{W}" xmlns:r="{R}"><w:body><w:sectPr>'
+        '<w:headerReference w:type="default" r:id="rId1"/>'
+        "</w:sectPr></w:body></w:document>"
+    ),
+    "word/_rels/document.xml.rels": (
+        f'<Relationships xmlns="{PACKAGE_RELS}"><Relationship Id="rId1" '
+        f'Type="{R}/header" Target="header1.xml"/></Relationships>'
+    ),
+    "word/header1.xml": f'<w:hdr xmlns:w="{W}"/>',
+    "word/styles.xml": f'<w:styles xmlns:w="{W}"/>',
+}
+
+
+@pytest.fixture
+def unpacked(tmp_path: Path) -> Path:
+    for name, content in PARTS.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(content, encoding="utf-8")
+    validator = DOCXSchemaValidator(tmp_path, incremental=True)
+    assert validator.validate_all_relationship_ids()
+    return tmp_path
+
+
+def _results(unpacked: Path) -> dict[str, dict]:
+    validator = DOCXSchemaValidator(unpacked, incremental=True)
+    parts = validator._load_manifest()["parts"]
+    return {key: part["results"] for key, part in parts.items()}
+
+
+def test_unchanged_parts_keep_results(unpacked: Path) -> None:
+    results = _results(unpacked)
+
+    assert all(results[key] for key in PARTS)
+
+
+def test_deleted_rels_dirties_its_source(unpacked: Path) -> None:
+    (unpacked / "word/_rels/document.xml.rels").unlink()
+
+    results = _results(unpacked)
+
+    assert results["word/document.xml"] == {}
+    assert results["word/styles.xml"]
+
+
+def test_deleted_target_dirties_its_source(unpacked: Path) -> None:
+    (unpacked / "word/header1.xml").unlink()
+
+    results = _results(unpacked)
+
+    assert results["word/document.xml"] == {}
+    assert results["word/styles.xml"]
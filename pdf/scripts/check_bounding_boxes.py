@@ -27,19 +27,33 @@ def get_bounding_box_messages(fields_json_stream) -> list[str]:
         rects_and_fields.append(RectAndField(f["label_bounding_box"], "label", f))
         rects_and_fields.append(RectAndField(f["entry_bounding_box"], "entry", f))
 
+    # Only boxes on the same page can overlap: sweep each page's boxes along y
+    # (form fields mostly stack vertically), comparing each one with the boxes
+    # still open at its lower edge.
+    by_page = {}
+    for i, r in enumerate(rects_and_fields):
+        by_page.setdefault(r.field["page_number"], []).append(i)
+
+    intersections = {i: [] for i in range(len(rects_and_fields))}
+    for indices in by_page.values():
+        active = []
+        for j in sorted(indices, key=lambda k: rects_and_fields[k].rect[1]):
+            rj = rects_and_fields[j]
+            active = [i for i in active if rects_and_fields[i].rect[3] > rj.rect[1]]
+            for i in active:
+                if rects_intersect(rects_and_fields[i].rect, rj.rect):
+                    intersections[min(i, j)].append(max(i, j))
+            active.append(j)
+
     has_error = False
     for i, ri in enumerate(rects_and_fields):
-        for j in range(i + 1, len(rects_and_fields)):
+        for j in sorted(intersections[i]):
             rj = rects_and_fields[j]
-            if ri.field["page_number"] == rj.field["page_number"] and rects_intersect(ri.rect, rj.rect):
-                has_error = True
-                if ri.field is rj.field:
-                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
-                else:
-                    messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
-                if len(messages) >= 20:
-                    messages.append("Aborting further checks; fix bounding boxes and try again")
-                    return messages
+            has_error = True
+            if ri.field is rj.field:
+                messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
+            else:
+                messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
         if ri.rect_type == "entry":
             if "entry_text" in ri.field:
                 font_size = ri.field["entry_text"].get("font_size", 14)
@@ -47,9 +61,6 @@ def get_bounding_box_messages(fields_json_stream) -> list[str]:
                 if entry_height < font_size:
                     has_error = True
                     messages.append(f"FAILURE: entry bounding box height ({entry_height}) for `{ri.field['description']}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.")
-                    if len(messages) >= 20:
-                        messages.append("Aborting further checks; fix bounding boxes and try again")
-                        return messages
 
     if not has_error:
         messages.append("SUCCESS: All bounding boxes are valid")
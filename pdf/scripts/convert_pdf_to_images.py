@@ -1,33 +1,128 @@
+import hashlib
+import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 from pdf2image import convert_from_path
+from pypdf import PdfReader
 
 
+# Pages are rendered in windows of this many pages, so only one window per
+# worker is held in memory however long the PDF is.
+PAGES_PER_CHUNK = 8
+MAX_DPI = 200
+CACHE_FILE = ".convert_pdf_to_images.json"
 
 
-def convert(pdf_path, output_dir, max_dim=1000):
-    images = convert_from_path(pdf_path, dpi=200)
+def page_dpis(pdf_path, max_dim):
+    # Render each page at the resolution that makes its long side max_dim
+    # pixels (never above MAX_DPI), instead of rendering large and shrinking.
+    # pdf2image renders the media box, so size against that rather than the
+    # crop box.
+    dpis = []
+    for page in PdfReader(pdf_path).pages:
+        box = page.mediabox
+        long_side = max(float(box.width), float(box.height))
+        dpis.append(min(MAX_DPI, max_dim * 72 / long_side) if long_side else MAX_DPI)
+    return dpis
 
-    for i, image in enumerate(images):
+
+def page_chunks(dpis):
+    chunks = []
+    for page_number, dpi in enumerate(dpis, start=1):
+        previous = chunks[-1] if chunks else None
+        if previous and previous[2] == dpi and page_number - previous[0] < PAGES_PER_CHUNK:
+            previous[1] = page_number
+        else:
+            chunks.append([page_number, page_number, dpi])
+    return [tuple(chunk) for chunk in chunks]
+
+
+def render_chunk(pdf_path, output_dir, max_dim, chunk):
+    first_page, last_page, dpi = chunk
+    images = convert_from_path(
+        pdf_path, dpi=dpi, first_page=first_page, last_page=last_page
+    )
+
+    saved = []
+    for page_number, image in enumerate(images, start=first_page):
         width, height = image.size
         if width > max_dim or height > max_dim:
             scale_factor = min(max_dim / width, max_dim / height)
             new_width = int(width * scale_factor)
             new_height = int(height * scale_factor)
             image = image.resize((new_width, new_height))
-        
-        image_path = os.path.join(output_dir, f"page_{i+1}.png")
+
+        image_path = os.path.join(output_dir, f"page_{page_number}.png")
         image.save(image_path)
-        print(f"Saved page {i+1} as {image_path} (size: {image.size})")
+        saved.append((page_number, image_path, image.size))
+        image.close()
+    return saved
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cached_pages(output_dir, key):
+    try:
+        with open(os.path.join(output_dir, CACHE_FILE)) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if cache.get("key") != key:
+        return None
+    pages = cache.get("pages", [])
+    if not all(os.path.exists(image_path) for _, image_path, _ in pages):
+        return None
+    return pages
+
+
+def convert(pdf_path, output_dir, max_dim=1000, jobs=None):
+    os.makedirs(output_dir, exist_ok=True)
+    key = {"sha256": file_hash(pdf_path), "max_dim": max_dim}
+
+    pages = cached_pages(output_dir, key)
+    if pages is not None:
+        for page_number, image_path, size in pages:
+            print(f"Reused page {page_number} at {image_path} (size: {tuple(size)})")
+        print(f"PDF unchanged since the last conversion; reused {len(pages)} PNG images")
+        return
+
+    chunks = page_chunks(page_dpis(pdf_path, max_dim))
+    jobs = min(jobs or os.cpu_count() or 1, len(chunks))
+    render = partial(render_chunk, pdf_path, output_dir, max_dim)
+
+    pages = []
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    try:
+        results = executor.map(render, chunks) if executor else map(render, chunks)
+        for result in results:
+            for page_number, image_path, size in result:
+                print(f"Saved page {page_number} as {image_path} (size: {size})")
+                pages.append((page_number, image_path, size))
+    finally:
+        if executor:
+            executor.shutdown()
+
+    with open(os.path.join(output_dir, CACHE_FILE), "w") as f:
+        json.dump({"key": key, "pages": pages}, f)
 
-    print(f"Converted {len(images)} pages to PNG images")
+    print(f"Converted {len(pages)} pages to PNG images")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: convert_pdf_to_images.py [input pdf] [output directory]")
+    if len(sys.argv) not in (3, 4):
+        print("Usage: convert_pdf_to_images.py [input pdf] [output directory] [jobs]")
         sys.exit(1)
     pdf_path = sys.argv[1]
     output_directory = sys.argv[2]
-    convert(pdf_path, output_directory)
+    jobs = int(sys.argv[3]) if len(sys.argv) == 4 else None
+    convert(pdf_path, output_directory, jobs=jobs)
@@ -13,79 +13,71 @@ This script removes:
 - Unreferenced theme files
 - Unreferenced notes slides
 - Content-Type overrides for deleted files
+
+Every .rels file is parsed once into a part -> target graph; a single
+reachability sweep from the kept parts decides all deletions.
 """
 
+import posixpath
+import re
 import sys
 from pathlib import Path
 
 import defusedxml.minidom
 
+RESOURCE_DIRS = ["media", "embeddings", "charts", "diagrams", "tags", "drawings", "ink"]
+PRESENTATION = "ppt/presentation.xml"
+PRESENTATION_RELS = "ppt/_rels/presentation.xml.rels"
 
-import re
-
-
-def get_slides_in_sldidlst(unpacked_dir: Path) -> set[str]:
-    pres_path = unpacked_dir / "ppt" / "presentation.xml"
-    pres_rels_path = unpacked_dir / "ppt" / "_rels" / "presentation.xml.rels"
 
-    if not pres_path.exists() or not pres_rels_path.exists():
-        return set()
+def build_relationship_graph(unpacked_dir: Path) -> dict[str, dict[str, str]]:
+    """Map each part (package-relative posix path) to its {rId: target part}.
 
-    rels_dom = defusedxml.minidom.parse(str(pres_rels_path))
-    rid_to_slide = {}
-    for rel in rels_dom.getElementsByTagName("Relationship"):
-        rid = rel.getAttribute("Id")
-        target = rel.getAttribute("Target")
-        rel_type = rel.getAttribute("Type")
-        if "slide" in rel_type and target.startswith("slides/"):
-            rid_to_slide[rid] = target.replace("slides/", "")
+    Every .rels file is parsed exactly once; "" stands for the package root.
+    """
+    graph = {}
 
-    pres_content = pres_path.read_text(encoding="utf-8")
-    referenced_rids = set(re.findall(r'<p:sldId[^>]*r:id="([^"]+)"', pres_content))
-
-    return {rid_to_slide[rid] for rid in referenced_rids if rid in rid_to_slide}
-
-
-def remove_orphaned_slides(unpacked_dir: Path) -> list[str]:
-    slides_dir = unpacked_dir / "ppt" / "slides"
-    slides_rels_dir = slides_dir / "_rels"
-    pres_rels_path = unpacked_dir / "ppt" / "_rels" / "presentation.xml.rels"
+    for rels_file in unpacked_dir.rglob("*.rels"):
+        if rels_file.parent.name != "_rels":
+            continue
+        rels_dir = rels_file.parent.parent.relative_to(unpacked_dir).as_posix()
+        rels_dir = "" if rels_dir == "." else rels_dir
+        source = posixpath.join(rels_dir, rels_file.name[: -len(".rels")])
 
-    if not slides_dir.exists():
-        return []
+        targets = {}
+        dom = defusedxml.minidom.parse(str(rels_file))
+        for rel in dom.getElementsByTagName("Relationship"):
+            target = rel.getAttribute("Target")
+            if not target or rel.getAttribute("TargetMode") == "External":
+                continue
+            if target.startswith("/"):
+                part = posixpath.normpath(target.lstrip("/"))
+            else:
+                part = posixpath.normpath(posixpath.join(rels_dir, target))
+            if not part.startswith("../"):
+                targets[rel.getAttribute("Id")] = part
 
-    referenced_slides = get_slides_in_sldidlst(unpacked_dir)
-    removed = []
+        graph[source.lstrip("/")] = targets
 
-    for slide_file in slides_dir.glob("slide*.xml"):
-        if slide_file.name not in referenced_slides:
-            rel_path = slide_file.relative_to(unpacked_dir)
-            slide_file.unlink()
-            removed.append(str(rel_path))
+    return graph
 
-            rels_file = slides_rels_dir / f"{slide_file.name}.rels"
-            if rels_file.exists():
-                rels_file.unlink()
-                removed.append(str(rels_file.relative_to(unpacked_dir)))
 
-    if removed and pres_rels_path.exists():
-        rels_dom = defusedxml.minidom.parse(str(pres_rels_path))
-        changed = False
+def get_slides_in_sldidlst(unpacked_dir: Path, graph: dict | None = None) -> set[str]:
+    pres_path = unpacked_dir / PRESENTATION
 
-        for rel in list(rels_dom.getElementsByTagName("Relationship")):
-            target = rel.getAttribute("Target")
-            if target.startswith("slides/"):
-                slide_name = target.replace("slides/", "")
-                if slide_name not in referenced_slides:
-                    if rel.parentNode:
-                        rel.parentNode.removeChild(rel)
-                        changed = True
+    if graph is None:
+        graph = build_relationship_graph(unpacked_dir)
+    if not pres_path.exists() or PRESENTATION not in graph:
+        return set()
 
-        if changed:
-            with open(pres_rels_path, "wb") as f:
-                f.write(rels_dom.toxml(encoding="utf-8"))
+    pres_content = pres_path.read_text(encoding="utf-8")
+    referenced_rids = set(re.findall(r'<p:sldId[^>]*r:id="([^"]+)"', pres_content))
 
-    return removed
+    return {
+        graph[PRESENTATION][rid]
+        for rid in referenced_rids
+        if rid in graph[PRESENTATION]
+    }
 
 
 def remove_trash_directory(unpacked_dir: Path) -> list[str]:
@@ -96,126 +88,89 @@ def remove_trash_directory(unpacked_dir: Path) -> list[str]:
         for file_path in trash_dir.iterdir():
             if file_path.is_file():
                 rel_path = file_path.relative_to(unpacked_dir)
-                removed.append(str(rel_path))
+                removed.append(rel_path.as_posix())
                 file_path.unlink()
         trash_dir.rmdir()
 
     return removed
 
 
-def get_slide_referenced_files(unpacked_dir: Path) -> set:
-    referenced = set()
-    slides_rels_dir = unpacked_dir / "ppt" / "slides" / "_rels"
+def find_unused_parts(unpacked_dir: Path, graph: dict[str, dict[str, str]]) -> set[str]:
+    """Return the parts to delete, found with one reachability sweep.
 
-    if not slides_rels_dir.exists():
-        return referenced
+    Slides are kept only if listed in <p:sldIdLst>. Resources, themes and
+    notes slides are kept only if reachable from a part that is kept; every
+    other part is kept as is.
+    """
+    parts = {
+        path.relative_to(unpacked_dir).as_posix()
+        for path in unpacked_dir.rglob("*")
+        if path.is_file() and path.parent.name != "_rels"
+    }
+    kept_slides = get_slides_in_sldidlst(unpacked_dir, graph)
 
-    for rels_file in slides_rels_dir.glob("*.rels"):
-        dom = defusedxml.minidom.parse(str(rels_file))
-        for rel in dom.getElementsByTagName("Relationship"):
-            target = rel.getAttribute("Target")
-            if not target:
-                continue
-            target_path = (rels_file.parent.parent / target).resolve()
-            try:
-                referenced.add(target_path.relative_to(unpacked_dir.resolve()))
-            except ValueError:
-                pass
+    slides = {part for part in parts if re.fullmatch(r"ppt/slides/slide\d+\.xml", part)}
+    prunable = {part for part in parts if _is_prunable(part)}
 
-    return referenced
+    reached = (parts - slides - prunable) | (slides & kept_slides)
+    reached.add("")
+    pending = list(reached)
+    while pending:
+        for target in graph.get(pending.pop(), {}).values():
+            if target in prunable and target not in reached:
+                reached.add(target)
+                pending.append(target)
 
+    return (slides - kept_slides) | (prunable - reached)
 
-def remove_orphaned_rels_files(unpacked_dir: Path) -> list[str]:
-    resource_dirs = ["charts", "diagrams", "drawings"]
-    removed = []
-    slide_referenced = get_slide_referenced_files(unpacked_dir)
 
-    for dir_name in resource_dirs:
-        rels_dir = unpacked_dir / "ppt" / dir_name / "_rels"
-        if not rels_dir.exists():
-            continue
+def _is_prunable(part: str) -> bool:
+    directory = posixpath.dirname(part)
+    return bool(
+        directory in {f"ppt/{name}" for name in RESOURCE_DIRS}
+        or re.fullmatch(r"ppt/theme/theme[^/]*\.xml", part)
+        or (directory == "ppt/notesSlides" and part.endswith(".xml"))
+    )
 
-        for rels_file in rels_dir.glob("*.rels"):
-            resource_file = rels_dir.parent / rels_file.name.replace(".rels", "")
-            try:
-                resource_rel_path = resource_file.resolve().relative_to(unpacked_dir.resolve())
-            except ValueError:
-                continue
-
-            if not resource_file.exists() or resource_rel_path not in slide_referenced:
-                rels_file.unlink()
-                rel_path = rels_file.relative_to(unpacked_dir)
-                removed.append(str(rel_path))
-
-    return removed
 
+def remove_parts(unpacked_dir: Path, graph: dict, unused: set[str]) -> list[str]:
+    removed = []
 
-def get_referenced_files(unpacked_dir: Path) -> set:
-    referenced = set()
-
-    for rels_file in unpacked_dir.rglob("*.rels"):
-        dom = defusedxml.minidom.parse(str(rels_file))
-        for rel in dom.getElementsByTagName("Relationship"):
-            target = rel.getAttribute("Target")
-            if not target:
-                continue
-            target_path = (rels_file.parent.parent / target).resolve()
-            try:
-                referenced.add(target_path.relative_to(unpacked_dir.resolve()))
-            except ValueError:
-                pass
-
-    return referenced
+    for part in sorted(unused):
+        (unpacked_dir / part).unlink()
+        removed.append(part)
+
+    for source in sorted(graph):
+        directory, name = posixpath.split(source)
+        rels_part = posixpath.join(directory, "_rels", f"{name}.rels")
+        orphaned = (
+            posixpath.basename(directory) in RESOURCE_DIRS + ["notesSlides"]
+            and not (unpacked_dir / source).exists()
+        )
+        if source in unused or orphaned:
+            (unpacked_dir / rels_part).unlink()
+            removed.append(rels_part)
 
+    return removed
 
-def remove_orphaned_files(unpacked_dir: Path, referenced: set) -> list[str]:
-    resource_dirs = ["media", "embeddings", "charts", "diagrams", "tags", "drawings", "ink"]
-    removed = []
 
-    for dir_name in resource_dirs:
-        dir_path = unpacked_dir / "ppt" / dir_name
-        if not dir_path.exists():
-            continue
-
-        for file_path in dir_path.glob("*"):
-            if not file_path.is_file():
-                continue
-            rel_path = file_path.relative_to(unpacked_dir)
-            if rel_path not in referenced:
-                file_path.unlink()
-                removed.append(str(rel_path))
+def remove_presentation_relationships(unpacked_dir: Path, removed: set[str]) -> None:
+    pres_rels_path = unpacked_dir / PRESENTATION_RELS
+    if not pres_rels_path.exists():
+        return
 
-    theme_dir = unpacked_dir / "ppt" / "theme"
-    if theme_dir.exists():
-        for file_path in theme_dir.glob("theme*.xml"):
-            rel_path = file_path.relative_to(unpacked_dir)
-            if rel_path not in referenced:
-                file_path.unlink()
-                removed.append(str(rel_path))
-                theme_rels = theme_dir / "_rels" / f"{file_path.name}.rels"
-                if theme_rels.exists():
-                    theme_rels.unlink()
-                    removed.append(str(theme_rels.relative_to(unpacked_dir)))
-
-    notes_dir = unpacked_dir / "ppt" / "notesSlides"
-    if notes_dir.exists():
-        for file_path in notes_dir.glob("*.xml"):
-            if not file_path.is_file():
-                continue
-            rel_path = file_path.relative_to(unpacked_dir)
-            if rel_path not in referenced:
-                file_path.unlink()
-                removed.append(str(rel_path))
+    rels_dom = defusedxml.minidom.parse(str(pres_rels_path))
+    changed = False
 
-        notes_rels_dir = notes_dir / "_rels"
-        if notes_rels_dir.exists():
-            for file_path in notes_rels_dir.glob("*.rels"):
-                notes_file = notes_dir / file_path.name.replace(".rels", "")
-                if not notes_file.exists():
-                    file_path.unlink()
-                    removed.append(str(file_path.relative_to(unpacked_dir)))
+    for rel in list(rels_dom.getElementsByTagName("Relationship")):
+        target = posixpath.normpath(posixpath.join("ppt", rel.getAttribute("Target")))
+        if target in removed and rel.parentNode:
+            rel.parentNode.removeChild(rel)
+            changed = True
 
-    return removed
+    if changed:
+        with open(pres_rels_path, "wb") as f:
+            f.write(rels_dom.toxml(encoding="utf-8"))
 
 
 def update_content_types(unpacked_dir: Path, removed_files: list[str]) -> None:
@@ -223,12 +178,13 @@ def update_content_types(unpacked_dir: Path, removed_files: list[str]) -> None:
     if not ct_path.exists():
         return
 
+    removed = set(removed_files)
     dom = defusedxml.minidom.parse(str(ct_path))
     changed = False
 
     for override in list(dom.getElementsByTagName("Override")):
         part_name = override.getAttribute("PartName").lstrip("/")
-        if part_name in removed_files:
+        if part_name in removed:
             if override.parentNode:
                 override.parentNode.removeChild(override)
                 changed = True
@@ -239,24 +195,14 @@ def update_content_types(unpacked_dir: Path, removed_files: list[str]) -> None:
 
 
 def clean_unused_files(unpacked_dir: Path) -> list[str]:
-    all_removed = []
-
-    slides_removed = remove_orphaned_slides(unpacked_dir)
-    all_removed.extend(slides_removed)
-
-    trash_removed = remove_trash_directory(unpacked_dir)
-    all_removed.extend(trash_removed)
-
-    while True:
-        removed_rels = remove_orphaned_rels_files(unpacked_dir)
-        referenced = get_referenced_files(unpacked_dir)
-        removed_files = remove_orphaned_files(unpacked_dir, referenced)
+    all_removed = remove_trash_directory(unpacked_dir)
 
-        total_removed = removed_rels + removed_files
-        if not total_removed:
-            break
+    graph = build_relationship_graph(unpacked_dir)
+    unused = find_unused_parts(unpacked_dir, graph)
+    all_removed.extend(remove_parts(unpacked_dir, graph, unused))
 
-        all_removed.extend(total_removed)
+    if unused:
+        remove_presentation_relationships(unpacked_dir, unused)
 
     if all_removed:
         update_content_types(unpacked_dir, all_removed)
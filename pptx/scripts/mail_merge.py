@@ -0,0 +1,277 @@
+"""Generate one PPTX per record from a template with {{field}} placeholders.
+
+The template is parsed once: every {{field}} in slide and notes text is
+collapsed into a single text run (placeholders split across runs by
+PowerPoint's spell-check or formatting are handled) and each part is
+precompiled into static chunks and slots. Producing a deck is then a string
+join per templated part plus a zip write, spread across worker processes.
+
+Usage:
+    python mail_merge.py <template.pptx> <records> <output_dir> [--name PATTERN] [-j N]
+
+Examples:
+    python mail_merge.py campaign.pptx contacts.csv decks/
+    python mail_merge.py campaign.pptx contacts.jsonl decks/ --name "{company}-proposal.pptx"
+    python mail_merge.py campaign.pptx contacts.csv decks/ -j 8
+
+Records are read from CSV (header row gives the field names), JSONL (one
+object per line) or a JSON list. --name is formatted with the record's
+fields plus {index} (1-based); the default is "deck-{index:04d}.pptx".
+
+Prepare the template's slide structure first (deck.py or add_slide.py); this
+script only fills in text.
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import lxml.etree
+
+DRAWING_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+TEMPLATED_PARTS = re.compile(r"ppt/(slides|notesSlides)/[^/]+\.xml$")
+PLACEHOLDER = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
+SLOT_START, SLOT_END = "\ue000", "\ue001"
+SLOT = re.compile(f"{SLOT_START}(\\d+){SLOT_END}")
+INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+COMPRESSED_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".mp4", ".m4a", ".mp3"}
+
+PARSER = lxml.etree.XMLParser(resolve_entities=False, no_network=True, load_dtd=False)
+
+
+class MergeTemplate:
+    def __init__(self, pptx_path: str | Path):
+        self.path = Path(pptx_path)
+        self.parts = []
+        self.fields = []
+
+        with zipfile.ZipFile(self.path) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                content = zf.read(info)
+                if TEMPLATED_PARTS.match(info.filename):
+                    content = self._compile_part(content)
+                self.parts.append((info.filename, content))
+
+    def render(self, record: dict) -> list[tuple[str, bytes]]:
+        missing = [field for field in self.fields if field not in record]
+        if missing:
+            raise KeyError(f"missing field(s): {', '.join(missing)}")
+
+        values = [_escape(record[field]) for field in self.fields]
+        rendered = []
+        for name, content in self.parts:
+            if isinstance(content, tuple):
+                chunks, slots = content
+                pieces = [chunks[0]]
+                for slot, chunk in zip(slots, chunks[1:]):
+                    pieces.append(values[slot])
+                    pieces.append(chunk)
+                content = b"".join(pieces)
+            rendered.append((name, content))
+        return rendered
+
+    def write(self, record: dict, output_file: str | Path) -> None:
+        parts = self.render(record)
+        output_path = Path(output_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, content in parts:
+                if Path(name).suffix.lower() in COMPRESSED_SUFFIXES:
+                    zf.writestr(name, content, zipfile.ZIP_STORED)
+                else:
+                    zf.writestr(name, content)
+
+    def _compile_part(self, content: bytes) -> tuple[list[bytes], list[int]] | bytes:
+        root = lxml.etree.fromstring(content, PARSER)
+        found = False
+        for paragraph in root.iter(f"{{{DRAWING_NS}}}p"):
+            texts = list(paragraph.iter(f"{{{DRAWING_NS}}}t"))
+            if texts and "{{" in "".join(t.text or "" for t in texts):
+                found |= self._collapse_placeholders(texts)
+
+        if not found:
+            return content
+
+        xml = lxml.etree.tostring(
+            root, xml_declaration=True, encoding="UTF-8", standalone=True
+        )
+        pieces = SLOT.split(xml.decode("utf-8"))
+        chunks = [piece.encode("utf-8") for piece in pieces[::2]]
+        slots = [int(slot) for slot in pieces[1::2]]
+        return chunks, slots
+
+    def _collapse_placeholders(self, texts) -> bool:
+        values = [t.text or "" for t in texts]
+        starts = []
+        offset = 0
+        for value in values:
+            starts.append(offset)
+            offset += len(value)
+        joined = "".join(values)
+
+        matches = list(PLACEHOLDER.finditer(joined))
+        for match in reversed(matches):
+            first = _run_at(starts, match.start())
+            last = _run_at(starts, match.end() - 1)
+            head = values[first][: match.start() - starts[first]]
+            tail = values[last][match.end() - starts[last] :]
+
+            values[first] = head + _slot_marker(self._slot(match.group(1)))
+            for index in range(first + 1, last):
+                values[index] = ""
+            if last == first:
+                values[first] += tail
+            else:
+                values[last] = tail
+
+        for t, value in zip(texts, values):
+            t.text = value
+        return bool(matches)
+
+    def _slot(self, field: str) -> int:
+        if field not in self.fields:
+            self.fields.append(field)
+        return self.fields.index(field)
+
+
+def _run_at(starts: list[int], position: int) -> int:
+    index = 0
+    for i, start in enumerate(starts):
+        if start <= position:
+            index = i
+    return index
+
+
+def _slot_marker(slot: int) -> str:
+    return f"{SLOT_START}{slot}{SLOT_END}"
+
+
+def _escape(value) -> bytes:
+    text = "" if value is None else str(value)
+    text = INVALID_XML_CHARS.sub("", text)
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text.encode("utf-8")
+
+
+def load_records(records_file: str | Path) -> list[dict]:
+    path = Path(records_file)
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return list(csv.DictReader(f))
+
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".json":
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def output_name(pattern: str, record: dict, index: int) -> str:
+    name = pattern.format_map({**record, "index": index})
+    name = re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", name).strip()
+    return name if name.lower().endswith(".pptx") else f"{name}.pptx"
+
+
+_TEMPLATE = None
+
+
+def _init_worker(template: MergeTemplate) -> None:
+    global _TEMPLATE
+    _TEMPLATE = template
+
+
+def _write_deck(record: dict, output_file: str) -> tuple[str, str | None]:
+    try:
+        _TEMPLATE.write(record, output_file)
+    except Exception as e:
+        return output_file, str(e)
+    return output_file, None
+
+
+def mail_merge(
+    template_file: str,
+    records_file: str,
+    output_dir: str,
+    name_pattern: str = "deck-{index:04d}.pptx",
+    jobs: int = 1,
+) -> tuple[list[str], list[tuple[str, str]]]:
+    template = MergeTemplate(template_file)
+    if template.fields:
+        print(f"Template fields: {', '.join(template.fields)}")
+    else:
+        print(f"Warning: no {{{{field}}}} placeholders found in {template_file}")
+    records = load_records(records_file)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    tasks = []
+    failed = []
+    for index, record in enumerate(records, start=1):
+        try:
+            name = output_name(name_pattern, record, index)
+        except (KeyError, ValueError) as e:
+            failed.append((f"record {index}", f"bad --name for record: {e}"))
+            continue
+        tasks.append((record, str(output_path / name)))
+
+    if len({output for _, output in tasks}) != len(tasks):
+        raise ValueError(f"--name '{name_pattern}' gives duplicate file names")
+
+    if jobs > 1 and len(tasks) > 1:
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(template,)
+        ) as executor:
+            results = list(executor.map(_write_deck, *zip(*tasks), chunksize=chunksize))
+    else:
+        _init_worker(template)
+        results = [_write_deck(*task) for task in tasks]
+
+    written = [output for output, error in results if error is None]
+    failed.extend((output, error) for output, error in results if error is not None)
+    return written, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate one PPTX per record from a {{field}} template"
+    )
+    parser.add_argument("template", help="Template .pptx with {{field}} placeholders")
+    parser.add_argument("records", help="CSV, JSONL or JSON file with one record per deck")
+    parser.add_argument("output_dir", help="Directory for the generated decks")
+    parser.add_argument(
+        "--name",
+        default="deck-{index:04d}.pptx",
+        help="Output file name pattern (default: deck-{index:04d}.pptx)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: CPU count)",
+    )
+    args = parser.parse_args()
+
+    try:
+        written, failed = mail_merge(
+            args.template, args.records, args.output_dir, args.name, args.jobs
+        )
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for output, error in failed:
+        print(f"Error: {output}: {error}", file=sys.stderr)
+    print(f"Generated {len(written)} decks in {args.output_dir}", end="")
+    print(f" ({len(failed)} failed)" if failed else "")
+
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,522 @@
+"""Benchmark the OOXML toolkit on synthetic DOCX, PPTX and XLSX files.
+
+Generates fixtures of configurable size, then times each stage (unpack,
+simplify_redlines, merge_runs, validate, clean, pack) in a fresh process so
+peak RSS can be reported per stage. Results can be written as JSON and
+compared against a previous run to catch regressions.
+
+Usage:
+    python benchmark.py [--formats docx pptx xlsx] [--paragraphs N] [--slides N]
+                        [--rows N] [--repeat N] [--json FILE] [--compare FILE]
+
+Examples:
+    python benchmark.py
+    python benchmark.py --formats docx --paragraphs 10000 --json baseline.json
+    python benchmark.py --json current.json --compare baseline.json --threshold 1.25
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import lxml.etree
+
+WORD_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+PRESENTATION_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+DRAWING_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+OFFICE_RELS_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CONTENT_TYPES_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+OFFICE_CT = "application/vnd.openxmlformats-officedocument"
+DEFAULT_CT = {
+    "rels": "application/vnd.openxmlformats-package.relationships+xml",
+    "xml": "application/xml",
+}
+
+CLEAN_SCRIPT = Path(__file__).resolve().parent.parent / "clean.py"
+
+RUN_PROPERTIES = [
+    "",
+    "<w:rPr><w:b/></w:rPr>",
+    '<w:rPr><w:i/><w:sz w:val="24"/></w:rPr>',
+]
+
+STAGES = {
+    "docx": ["unpack", "simplify_redlines", "merge_runs", "validate", "pack"],
+    "pptx": ["unpack", "validate", "clean", "pack"],
+    "xlsx": ["unpack", "pack"],
+}
+
+
+def synthetic_document(
+    paragraphs: int, runs_per_paragraph: int = 12, seed: int = 0
+) -> bytes:
+    rng = random.Random(seed)
+    parts = [f'<w:document xmlns:w="{WORD_NS}"><w:body>']
+
+    for _ in range(paragraphs):
+        parts.append("<w:p>")
+        for i in range(runs_per_paragraph):
+            style = rng.randrange(len(RUN_PROPERTIES)) if i % 4 == 0 else 0
+            rpr = RUN_PROPERTIES[style]
+            run = (
+                f'<w:r w:rsidR="{rng.randrange(1 << 32):08X}">{rpr}'
+                f'<w:t xml:space="preserve">word{i} </w:t></w:r>'
+            )
+            if i % 7 == 0:
+                parts.append('<w:proofErr w:type="spellStart"/>')
+            if i % 11 in (1, 2, 3):
+                author = "Author" if i % 11 == 3 else "Reviewer"
+                parts.append(f'<w:ins w:id="{i}" w:author="{author}">{run}</w:ins>')
+            else:
+                parts.append(run)
+        parts.append("</w:p>")
+
+    parts.append("</w:body></w:document>")
+    return "".join(parts).encode("utf-8")
+
+
+def build_docx(path: Path, paragraphs: int) -> None:
+    _write_package(
+        path,
+        {
+            "[Content_Types].xml": _content_types(
+                {"word/document.xml": f"{OFFICE_CT}.wordprocessingml.document.main+xml"}
+            ),
+            "_rels/.rels": _relationships([("officeDocument", "word/document.xml")]),
+            "word/document.xml": synthetic_document(paragraphs),
+        },
+    )
+
+
+def build_pptx(path: Path, slides: int, shapes_per_slide: int = 6) -> None:
+    pml = f"{OFFICE_CT}.presentationml"
+    ns = (
+        f'xmlns:a="{DRAWING_NS}" xmlns:r="{OFFICE_RELS_NS}" '
+        f'xmlns:p="{PRESENTATION_NS}"'
+    )
+    slide_numbers = range(1, slides + 1)
+
+    parts = {
+        "[Content_Types].xml": _content_types(
+            {
+                "ppt/presentation.xml": f"{pml}.presentation.main+xml",
+                "ppt/slideMasters/slideMaster1.xml": f"{pml}.slideMaster+xml",
+                "ppt/slideLayouts/slideLayout1.xml": f"{pml}.slideLayout+xml",
+                "ppt/theme/theme1.xml": f"{OFFICE_CT}.theme+xml",
+                **{
+                    f"ppt/slides/slide{n}.xml": f"{pml}.slide+xml"
+                    for n in slide_numbers
+                },
+            }
+        ),
+        "_rels/.rels": _relationships([("officeDocument", "ppt/presentation.xml")]),
+        "ppt/presentation.xml": (
+            f"<p:presentation {ns}><p:sldMasterIdLst>"
+            '<p:sldMasterId id="2147483648" r:id="rId1"/></p:sldMasterIdLst>'
+            "<p:sldIdLst>"
+            + "".join(
+                f'<p:sldId id="{255 + n}" r:id="rId{n + 2}"/>' for n in slide_numbers
+            )
+            + "</p:sldIdLst>"
+            '<p:sldSz cx="9144000" cy="6858000"/><p:notesSz cx="6858000" cy="9144000"/>'
+            "</p:presentation>"
+        ),
+        "ppt/_rels/presentation.xml.rels": _relationships(
+            [
+                ("slideMaster", "slideMasters/slideMaster1.xml"),
+                ("theme", "theme/theme1.xml"),
+            ]
+            + [("slide", f"slides/slide{n}.xml") for n in slide_numbers]
+        ),
+        "ppt/slideMasters/slideMaster1.xml": (
+            f"<p:sldMaster {ns}><p:cSld><p:spTree>{_empty_sp_tree()}</p:spTree>"
+            "</p:cSld>"
+            '<p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" accent1="accent1" '
+            'accent2="accent2" accent3="accent3" accent4="accent4" accent5="accent5" '
+            'accent6="accent6" hlink="hlink" folHlink="folHlink"/><p:sldLayoutIdLst>'
+            '<p:sldLayoutId id="2147483649" r:id="rId1"/></p:sldLayoutIdLst>'
+            "</p:sldMaster>"
+        ),
+        "ppt/slideMasters/_rels/slideMaster1.xml.rels": _relationships(
+            [
+                ("slideLayout", "../slideLayouts/slideLayout1.xml"),
+                ("theme", "../theme/theme1.xml"),
+            ]
+        ),
+        "ppt/slideLayouts/slideLayout1.xml": (
+            f"<p:sldLayout {ns}><p:cSld><p:spTree>{_empty_sp_tree()}</p:spTree>"
+            "</p:cSld></p:sldLayout>"
+        ),
+        "ppt/slideLayouts/_rels/slideLayout1.xml.rels": _relationships(
+            [("slideMaster", "../slideMasters/slideMaster1.xml")]
+        ),
+        "ppt/theme/theme1.xml": _theme(),
+    }
+
+    for n in slide_numbers:
+        shapes = "".join(
+            _text_shape(i + 2, f"Slide {n} line {i} with “quoted” text")
+            for i in range(shapes_per_slide)
+        )
+        parts[f"ppt/slides/slide{n}.xml"] = (
+            f"<p:sld {ns}><p:cSld><p:spTree>{_empty_sp_tree()}{shapes}</p:spTree>"
+            "</p:cSld></p:sld>"
+        )
+        parts[f"ppt/slides/_rels/slide{n}.xml.rels"] = _relationships(
+            [("slideLayout", "../slideLayouts/slideLayout1.xml")]
+        )
+
+    _write_package(path, parts)
+
+
+def build_xlsx(path: Path, rows: int, columns: int = 8) -> None:
+    sml = f"{OFFICE_CT}.spreadsheetml"
+    letters = [chr(ord("A") + c) for c in range(columns)]
+
+    sheet_rows = []
+    for r in range(1, rows + 1):
+        cells = [f'<c r="A{r}"><v>{r}</v></c>'] + [
+            f'<c r="{letters[c]}{r}"><f>{letters[c - 1]}{r}*2</f></c>'
+            for c in range(1, columns)
+        ]
+        sheet_rows.append(f'<row r="{r}">{"".join(cells)}</row>')
+
+    _write_package(
+        path,
+        {
+            "[Content_Types].xml": _content_types(
+                {
+                    "xl/workbook.xml": f"{sml}.sheet.main+xml",
+                    "xl/worksheets/sheet1.xml": f"{sml}.worksheet+xml",
+                }
+            ),
+            "_rels/.rels": _relationships([("officeDocument", "xl/workbook.xml")]),
+            "xl/workbook.xml": (
+                f'<workbook xmlns="{SPREADSHEET_NS}" xmlns:r="{OFFICE_RELS_NS}">'
+                '<sheets><sheet name="Data" sheetId="1" r:id="rId1"/></sheets>'
+                "</workbook>"
+            ),
+            "xl/_rels/workbook.xml.rels": _relationships(
+                [("worksheet", "worksheets/sheet1.xml")]
+            ),
+            "xl/worksheets/sheet1.xml": (
+                f'<worksheet xmlns="{SPREADSHEET_NS}"><sheetData>'
+                + "".join(sheet_rows)
+                + "</sheetData></worksheet>"
+            ),
+        },
+    )
+
+
+def _content_types(overrides: dict) -> str:
+    return (
+        f'<Types xmlns="{CONTENT_TYPES_NS}">'
+        + "".join(
+            f'<Default Extension="{ext}" ContentType="{ct}"/>'
+            for ext, ct in DEFAULT_CT.items()
+        )
+        + "".join(
+            f'<Override PartName="/{part}" ContentType="{ct}"/>'
+            for part, ct in overrides.items()
+        )
+        + "</Types>"
+    )
+
+
+def _relationships(targets: list) -> str:
+    return (
+        f'<Relationships xmlns="{PACKAGE_RELS_NS}">'
+        + "".join(
+            f'<Relationship Id="rId{i}" Type="{REL_TYPE}{rel_type}" Target="{target}"/>'
+            for i, (rel_type, target) in enumerate(targets, 1)
+        )
+        + "</Relationships>"
+    )
+
+
+def _write_package(path: Path, parts: dict) -> None:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in parts.items():
+            zf.writestr(name, content)
+
+
+def _empty_sp_tree() -> str:
+    return (
+        '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+        "<p:grpSpPr/>"
+    )
+
+
+def _text_shape(shape_id: int, text: str) -> str:
+    return (
+        f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="TextBox {shape_id}"/>'
+        '<p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr><p:spPr><a:xfrm>'
+        f'<a:off x="457200" y="{shape_id * 457200}"/><a:ext cx="8229600" cy="400000"/>'
+        '</a:xfrm><a:prstGeom prst="rect"><a:avLst/></a:prstGeom></p:spPr>'
+        "<p:txBody><a:bodyPr/><a:lstStyle/>"
+        f'<a:p><a:r><a:rPr lang="en-US"/><a:t>{text}</a:t></a:r></a:p>'
+        "</p:txBody></p:sp>"
+    )
+
+
+def _theme() -> str:
+    colors = "".join(
+        f'<a:{name}><a:srgbClr val="{value}"/></a:{name}>'
+        for name, value in [
+            ("dk1", "000000"),
+            ("lt1", "FFFFFF"),
+            ("dk2", "44546A"),
+            ("lt2", "E7E6E6"),
+            ("accent1", "4472C4"),
+            ("accent2", "ED7D31"),
+            ("accent3", "A5A5A5"),
+            ("accent4", "FFC000"),
+            ("accent5", "5B9BD5"),
+            ("accent6", "70AD47"),
+            ("hlink", "0563C1"),
+            ("folHlink", "954F72"),
+        ]
+    )
+    fill = '<a:solidFill><a:schemeClr val="phClr"/></a:solidFill>'
+    line = f'<a:ln w="6350">{fill}</a:ln>'
+    effect = "<a:effectStyle><a:effectLst/></a:effectStyle>"
+    font = '<a:latin typeface="Calibri"/><a:ea typeface=""/><a:cs typeface=""/>'
+    return (
+        f'<a:theme xmlns:a="{DRAWING_NS}" name="Benchmark"><a:themeElements>'
+        f'<a:clrScheme name="Benchmark">{colors}</a:clrScheme>'
+        f'<a:fontScheme name="Benchmark"><a:majorFont>{font}</a:majorFont>'
+        f"<a:minorFont>{font}</a:minorFont></a:fontScheme>"
+        f'<a:fmtScheme name="Benchmark"><a:fillStyleLst>{fill * 3}</a:fillStyleLst>'
+        f"<a:lnStyleLst>{line * 3}</a:lnStyleLst>"
+        f"<a:effectStyleLst>{effect * 3}</a:effectStyleLst>"
+        f"<a:bgFillStyleLst>{fill * 3}</a:bgFillStyleLst></a:fmtScheme>"
+        "</a:themeElements></a:theme>"
+    )
+
+
+def _run_stage(
+    stage: str, fmt: str, source: str, unpacked: str, output: str, cache_dir: str
+) -> dict:
+    # Per-user caches (e.g. the validators' XSD baselines) go to a fresh
+    # directory, so every run is timed cold and nothing outlives the benchmark.
+    os.environ["XDG_CACHE_HOME"] = cache_dir
+
+    if stage in ("simplify_redlines", "merge_runs"):
+        from helpers.merge_runs import merge_runs_in_tree
+        from helpers.simplify_redlines import simplify_redlines_in_tree
+
+        with zipfile.ZipFile(source) as zf:
+            root = lxml.etree.fromstring(zf.read("word/document.xml"))
+        if stage == "merge_runs":
+            simplify_redlines_in_tree(root)
+
+    start = time.perf_counter()
+
+    # Keep what the stages print (e.g. validator summaries) out of the report.
+    with contextlib.redirect_stdout(io.StringIO()):
+        if stage == "unpack":
+            from unpack import unpack
+
+            _, message = unpack(source, unpacked)
+        elif stage == "simplify_redlines":
+            message = f"Simplified {simplify_redlines_in_tree(root)} tracked changes"
+        elif stage == "merge_runs":
+            message = f"Merged {merge_runs_in_tree(root)} runs"
+        elif stage == "validate":
+            from validators import DOCXSchemaValidator, PPTXSchemaValidator
+
+            validator_class = (
+                DOCXSchemaValidator if fmt == "docx" else PPTXSchemaValidator
+            )
+            success = validator_class(unpacked, source).validate()
+            message = "Validation PASSED" if success else "Validation FAILED"
+        elif stage == "clean":
+            import importlib.util
+
+            spec = importlib.util.spec_from_file_location("clean", CLEAN_SCRIPT)
+            clean = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(clean)
+            message = f"Removed {len(clean.clean_unused_files(Path(unpacked)))} files"
+        elif stage == "pack":
+            from pack import pack
+
+            _, message = pack(unpacked, output, validate=False)
+        else:
+            raise ValueError(f"Unknown stage: {stage}")
+
+    seconds = time.perf_counter() - start
+    for path in (source, unpacked, output):
+        message = message.replace(path, Path(path).name)
+
+    return {"seconds": seconds, "peak_rss_mb": _peak_rss_mb(), "message": message}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def benchmark_format(fmt: str, size: int, repeat: int, work_dir: Path) -> dict:
+    source = work_dir / f"fixture.{fmt}"
+    unpacked = work_dir / f"unpacked_{fmt}"
+    output = work_dir / f"packed.{fmt}"
+
+    builders = {"docx": build_docx, "pptx": build_pptx, "xlsx": build_xlsx}
+    builders[fmt](source, size)
+    result = {"size": size, "fixture_bytes": source.stat().st_size, "stages": {}}
+
+    context = multiprocessing.get_context("spawn")
+    for stage in STAGES[fmt]:
+        if stage == "clean" and not CLEAN_SCRIPT.exists():
+            continue
+
+        runs = []
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory(dir=work_dir) as cache_dir:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    future = executor.submit(
+                        _run_stage,
+                        stage,
+                        fmt,
+                        str(source),
+                        str(unpacked),
+                        str(output),
+                        cache_dir,
+                    )
+                    runs.append(future.result())
+
+        result["stages"][stage] = {
+            "seconds": min(run["seconds"] for run in runs),
+            "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+            "message": runs[-1]["message"],
+        }
+
+    return result
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for fmt, result in current["formats"].items():
+        previous = baseline.get("formats", {}).get(fmt)
+        if not previous or previous.get("size") != result["size"]:
+            continue
+
+        for stage, timing in result["stages"].items():
+            before = previous["stages"].get(stage)
+            if not before or before["seconds"] <= 0:
+                continue
+            ratio = timing["seconds"] / before["seconds"]
+            if ratio > threshold:
+                regressions.append(
+                    f"  {fmt} {stage}: {before['seconds']:.3f}s -> "
+                    f"{timing['seconds']:.3f}s ({ratio:.2f}x)"
+                )
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the OOXML toolkit on synthetic documents"
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=list(STAGES),
+        default=list(STAGES),
+        help="Formats to benchmark (default: docx pptx xlsx)",
+    )
+    parser.add_argument(
+        "--paragraphs",
+        type=int,
+        default=2000,
+        help="Paragraphs in the DOCX fixture (default: 2000)",
+    )
+    parser.add_argument(
+        "--slides",
+        type=int,
+        default=100,
+        help="Slides in the PPTX fixture (default: 100)",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=5000,
+        help="Rows in the XLSX fixture (default: 5000)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per stage; the fastest time is reported (default: 3)",
+    )
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument(
+        "--compare",
+        help="Baseline JSON from an earlier run; exit 1 on regressions",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Slowdown ratio against --compare that counts as a regression "
+        "(default: 1.25)",
+    )
+    args = parser.parse_args()
+
+    sizes = {"docx": args.paragraphs, "pptx": args.slides, "xlsx": args.rows}
+    results = {
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "lxml": ".".join(map(str, lxml.etree.LXML_VERSION)),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "formats": {},
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for fmt in args.formats:
+            result = benchmark_format(fmt, sizes[fmt], args.repeat, Path(temp_dir))
+            results["formats"][fmt] = result
+
+            print(
+                f"{fmt}: size {result['size']}, "
+                f"{result['fixture_bytes'] / 1e6:.2f} MB packed"
+            )
+            for stage, timing in result["stages"].items():
+                print(
+                    f"  {stage:<18} {timing['seconds']:>8.3f}s "
+                    f"{timing['peak_rss_mb']:>8.1f} MB  {timing['message']}"
+                )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Wrote {args.json}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(
+                f"FAILED - {len(regressions)} stage(s) slower than {args.threshold}x:"
+            )
+            for regression in regressions:
+                print(regression)
+            sys.exit(1)
+        print(f"PASSED - No stage slower than {args.threshold}x the baseline")
@@ -1,6 +1,6 @@
 """Add a new slide to an unpacked PPTX directory.
 
-Usage: python add_slide.py <unpacked_dir> <source>
+Usage: python add_slide.py <unpacked_dir> <source>[:count] [<source>[:count] ...]
 
 The source can be:
   - A slide file (e.g., slide2.xml) - duplicates the slide
@@ -13,39 +13,24 @@ Examples:
     python add_slide.py unpacked/ slideLayout2.xml
     # Creates slide5.xml from slideLayout2.xml
 
+    python add_slide.py unpacked/ slide2.xml:3 slideLayout2.xml slide4.xml:2
+    # Creates slide5.xml-slide10.xml in one pass; each shared part is
+    # read and rewritten once however many slides are added
+
 To see available layouts: ls unpacked/ppt/slideLayouts/
 
-Prints the <p:sldId> element to add to presentation.xml.
+Prints the <p:sldId> element to add to presentation.xml for each new slide.
 """
 
 import re
-import shutil
 import sys
 from pathlib import Path
 
 
-def get_next_slide_number(slides_dir: Path) -> int:
-    existing = [int(m.group(1)) for f in slides_dir.glob("slide*.xml")
-                if (m := re.match(r"slide(\d+)\.xml", f.name))]
-    return max(existing) + 1 if existing else 1
-
-
-def create_slide_from_layout(unpacked_dir: Path, layout_file: str) -> None:
-    slides_dir = unpacked_dir / "ppt" / "slides"
-    rels_dir = slides_dir / "_rels"
-    layouts_dir = unpacked_dir / "ppt" / "slideLayouts"
-
-    layout_path = layouts_dir / layout_file
-    if not layout_path.exists():
-        print(f"Error: {layout_path} not found", file=sys.stderr)
-        sys.exit(1)
-
-    next_num = get_next_slide_number(slides_dir)
-    dest = f"slide{next_num}.xml"
-    dest_slide = slides_dir / dest
-    dest_rels = rels_dir / f"{dest}.rels"
+SLIDE_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+SLIDE_RELATIONSHIP_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
 
-    slide_xml = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+BLANK_SLIDE_XML = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">
   <p:cSld>
     <p:spTree>
@@ -68,98 +53,144 @@ def create_slide_from_layout(unpacked_dir: Path, layout_file: str) -> None:
     <a:masterClrMapping/>
   </p:clrMapOvr>
 </p:sld>'''
-    dest_slide.write_text(slide_xml, encoding="utf-8")
 
-    rels_dir.mkdir(exist_ok=True)
-    rels_xml = f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
-  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout" Target="../slideLayouts/{layout_file}"/>
-</Relationships>'''
-    dest_rels.write_text(rels_xml, encoding="utf-8")
 
-    _add_to_content_types(unpacked_dir, dest)
+def get_next_slide_number(slides_dir: Path) -> int:
+    return next_slide_number(f.name for f in slides_dir.glob("slide*.xml"))
 
-    rid = _add_to_presentation_rels(unpacked_dir, dest)
 
-    next_slide_id = _get_next_slide_id(unpacked_dir)
+def next_slide_number(names) -> int:
+    existing = [int(m.group(1)) for name in names
+                if (m := re.match(r"slide(\d+)\.xml", name))]
+    return max(existing) + 1 if existing else 1
 
-    print(f"Created {dest} from {layout_file}")
-    print(f'Add to presentation.xml <p:sldIdLst>: <p:sldId id="{next_slide_id}" r:id="{rid}"/>')
 
+def layout_slide_rels(layout_file: str) -> str:
+    return f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout" Target="../slideLayouts/{layout_file}"/>
+</Relationships>'''
 
-def duplicate_slide(unpacked_dir: Path, source: str) -> None:
-    slides_dir = unpacked_dir / "ppt" / "slides"
-    rels_dir = slides_dir / "_rels"
 
-    source_slide = slides_dir / source
+def strip_notes_relationship(rels_content: str) -> str:
+    return re.sub(
+        r'\s*<Relationship[^>]*Type="[^"]*notesSlide"[^>]*/>\s*',
+        "\n",
+        rels_content,
+    )
 
-    if not source_slide.exists():
-        print(f"Error: {source_slide} not found", file=sys.stderr)
-        sys.exit(1)
 
-    next_num = get_next_slide_number(slides_dir)
-    dest = f"slide{next_num}.xml"
-    dest_slide = slides_dir / dest
+def add_content_type_override(content_types: str, dest: str) -> str:
+    new_override = f'<Override PartName="/ppt/slides/{dest}" ContentType="{SLIDE_CONTENT_TYPE}"/>'
+
+    if f"/ppt/slides/{dest}" not in content_types:
+        content_types = content_types.replace("</Types>", f"  {new_override}\n</Types>")
+    return content_types
 
-    source_rels = rels_dir / f"{source}.rels"
-    dest_rels = rels_dir / f"{dest}.rels"
 
-    shutil.copy2(source_slide, dest_slide)
+def add_presentation_relationship(pres_rels: str, dest: str) -> tuple[str, str]:
+    # A stale relationship to the same target (e.g. left by a deleted slide)
+    # is reused, so the returned rId always resolves to slides/{dest}.
+    for rel in re.findall(r"<Relationship\b[^>]*>", pres_rels):
+        if f'Target="slides/{dest}"' in rel:
+            return pres_rels, re.search(r'\bId="([^"]*)"', rel).group(1)
 
-    if source_rels.exists():
-        shutil.copy2(source_rels, dest_rels)
+    rids = [int(m) for m in re.findall(r'Id="rId(\d+)"', pres_rels)]
+    rid = f"rId{max(rids) + 1 if rids else 1}"
+    new_rel = f'<Relationship Id="{rid}" Type="{SLIDE_RELATIONSHIP_TYPE}" Target="slides/{dest}"/>'
+    pres_rels = pres_rels.replace("</Relationships>", f"  {new_rel}\n</Relationships>")
+    return pres_rels, rid
 
-        rels_content = dest_rels.read_text(encoding="utf-8")
-        rels_content = re.sub(
-            r'\s*<Relationship[^>]*Type="[^"]*notesSlide"[^>]*/>\s*',
-            "\n",
-            rels_content,
-        )
-        dest_rels.write_text(rels_content, encoding="utf-8")
 
-    _add_to_content_types(unpacked_dir, dest)
+def next_slide_id(pres_content: str) -> int:
+    slide_ids = [int(m) for m in re.findall(r'<p:sldId[^>]*id="(\d+)"', pres_content)]
+    return max(slide_ids) + 1 if slide_ids else 256
 
-    rid = _add_to_presentation_rels(unpacked_dir, dest)
 
-    next_slide_id = _get_next_slide_id(unpacked_dir)
+def add_slides(
+    unpacked_dir: Path, operations: list[tuple[str, int]]
+) -> list[tuple[str, str, int, str]]:
+    """Create slides for a batch of (source, count) operations.
 
-    print(f"Created {dest} from {source}")
-    print(f'Add to presentation.xml <p:sldIdLst>: <p:sldId id="{next_slide_id}" r:id="{rid}"/>')
+    Sources are slide files (duplicated) or layout files (blank slide from
+    the layout). Slide numbers, relationship ids and slide ids are allocated
+    in one pass and [Content_Types].xml and presentation.xml.rels are each
+    rewritten once. Returns (dest, source, slide_id, rid) per created slide.
+    """
+    slides_dir = unpacked_dir / "ppt" / "slides"
+    rels_dir = slides_dir / "_rels"
+    layouts_dir = unpacked_dir / "ppt" / "slideLayouts"
 
+    for source, _ in operations:
+        source_type, _ = parse_source(source)
+        source_path = (layouts_dir if source_type == "layout" else slides_dir) / source
+        if not source_path.exists():
+            raise FileNotFoundError(f"{source_path} not found")
 
-def _add_to_content_types(unpacked_dir: Path, dest: str) -> None:
     content_types_path = unpacked_dir / "[Content_Types].xml"
+    pres_rels_path = unpacked_dir / "ppt" / "_rels" / "presentation.xml.rels"
     content_types = content_types_path.read_text(encoding="utf-8")
+    pres_rels = pres_rels_path.read_text(encoding="utf-8")
 
-    new_override = f'<Override PartName="/ppt/slides/{dest}" ContentType="application/vnd.openxmlformats-officedocument.presentationml.slide+xml"/>'
+    slide_num = get_next_slide_number(slides_dir)
+    slide_id = _get_next_slide_id(unpacked_dir)
 
-    if f"/ppt/slides/{dest}" not in content_types:
-        content_types = content_types.replace("</Types>", f"  {new_override}\n</Types>")
+    rels_dir.mkdir(exist_ok=True)
+    created = []
+    for source, count in operations:
+        source_type, layout_file = parse_source(source)
+        if source_type == "layout" and layout_file is not None:
+            slide_xml = BLANK_SLIDE_XML.encode("utf-8")
+            slide_rels = layout_slide_rels(layout_file).encode("utf-8")
+        else:
+            slide_xml = (slides_dir / source).read_bytes()
+            source_rels = rels_dir / f"{source}.rels"
+            slide_rels = None
+            if source_rels.exists():
+                rels_content = source_rels.read_text(encoding="utf-8")
+                slide_rels = strip_notes_relationship(rels_content).encode("utf-8")
+
+        for _ in range(count):
+            dest = f"slide{slide_num}.xml"
+            (slides_dir / dest).write_bytes(slide_xml)
+            if slide_rels is not None:
+                (rels_dir / f"{dest}.rels").write_bytes(slide_rels)
+
+            content_types = add_content_type_override(content_types, dest)
+            pres_rels, rid = add_presentation_relationship(pres_rels, dest)
+            created.append((dest, source, slide_id, rid))
+            slide_num, slide_id = slide_num + 1, slide_id + 1
+
+    if created:
         content_types_path.write_text(content_types, encoding="utf-8")
+        pres_rels_path.write_text(pres_rels, encoding="utf-8")
 
+    return created
 
-def _add_to_presentation_rels(unpacked_dir: Path, dest: str) -> str:
-    pres_rels_path = unpacked_dir / "ppt" / "_rels" / "presentation.xml.rels"
-    pres_rels = pres_rels_path.read_text(encoding="utf-8")
 
-    rids = [int(m) for m in re.findall(r'Id="rId(\d+)"', pres_rels)]
-    next_rid = max(rids) + 1 if rids else 1
-    rid = f"rId{next_rid}"
+def create_slide_from_layout(unpacked_dir: Path, layout_file: str) -> None:
+    _add_slides_and_report(unpacked_dir, [(layout_file, 1)])
 
-    new_rel = f'<Relationship Id="{rid}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide" Target="slides/{dest}"/>'
 
-    if f"slides/{dest}" not in pres_rels:
-        pres_rels = pres_rels.replace("</Relationships>", f"  {new_rel}\n</Relationships>")
-        pres_rels_path.write_text(pres_rels, encoding="utf-8")
+def duplicate_slide(unpacked_dir: Path, source: str) -> None:
+    _add_slides_and_report(unpacked_dir, [(source, 1)])
+
 
-    return rid
+def _add_slides_and_report(unpacked_dir: Path, operations: list[tuple[str, int]]) -> None:
+    try:
+        created = add_slides(unpacked_dir, operations)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for dest, source, slide_id, rid in created:
+        print(f"Created {dest} from {source}")
+        print(f'Add to presentation.xml <p:sldIdLst>: <p:sldId id="{slide_id}" r:id="{rid}"/>')
 
 
 def _get_next_slide_id(unpacked_dir: Path) -> int:
     pres_path = unpacked_dir / "ppt" / "presentation.xml"
-    pres_content = pres_path.read_text(encoding="utf-8")
-    slide_ids = [int(m) for m in re.findall(r'<p:sldId[^>]*id="(\d+)"', pres_content)]
-    return max(slide_ids) + 1 if slide_ids else 256
+    return next_slide_id(pres_path.read_text(encoding="utf-8"))
 
 
 def parse_source(source: str) -> tuple[str, str | None]:
@@ -169,27 +200,37 @@ def parse_source(source: str) -> tuple[str, str | None]:
     return ("slide", None)
 
 
+def parse_operation(arg: str) -> tuple[str, int]:
+    source, sep, count = arg.rpartition(":")
+    if not sep:
+        return arg, 1
+    if not count.isdigit() or int(count) < 1:
+        raise ValueError(f"Invalid count in '{arg}' (expected <source>:<count>)")
+    return source, int(count)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python add_slide.py <unpacked_dir> <source>", file=sys.stderr)
+    if len(sys.argv) < 3:
+        print("Usage: python add_slide.py <unpacked_dir> <source>[:count] ...", file=sys.stderr)
         print("", file=sys.stderr)
         print("Source can be:", file=sys.stderr)
         print("  slide2.xml        - duplicate an existing slide", file=sys.stderr)
         print("  slideLayout2.xml  - create from a layout template", file=sys.stderr)
+        print("  slide2.xml:5      - five copies in one batch", file=sys.stderr)
         print("", file=sys.stderr)
         print("To see available layouts: ls <unpacked_dir>/ppt/slideLayouts/", file=sys.stderr)
         sys.exit(1)
 
     unpacked_dir = Path(sys.argv[1])
-    source = sys.argv[2]
 
     if not unpacked_dir.exists():
         print(f"Error: {unpacked_dir} not found", file=sys.stderr)
         sys.exit(1)
 
-    source_type, layout_file = parse_source(source)
+    try:
+        operations = [parse_operation(arg) for arg in sys.argv[2:]]
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
-    if source_type == "layout" and layout_file is not None:
-        create_slide_from_layout(unpacked_dir, layout_file)
-    else:
-        duplicate_slide(unpacked_dir, source)
+    _add_slides_and_report(unpacked_dir, operations)
@@ -0,0 +1,285 @@
+"""Build a PPTX from a template entirely in memory.
+
+Opens the package once, applies any number of duplicate / add-from-layout /
+reorder / replace-text operations to the parts in memory, then cleans and
+packs the result with a single write. This is the importable counterpart of
+the unpack -> add_slide.py -> clean.py -> pack.py workflow: the same helpers
+run in-process instead of one interpreter launch per step.
+
+Usage:
+    python deck.py <template.pptx> <output.pptx> <operations.json> [--validate true|false]
+
+Examples:
+    python deck.py template.pptx output.pptx operations.json
+
+    from deck import Deck
+
+    deck = Deck("template.pptx")
+    risk = deck.duplicate_slide("slide4.xml")
+    deck.set_order(["slide1.xml", "slide4.xml", risk, "slide9.xml"])
+    deck.replace_text(risk, {"Content Slide Title": "Risk Assessment"})
+    deck.save("output.pptx")
+
+The operations file is a JSON list applied in order. Slides created by
+"duplicate" or "layout" can be named with "as" and referenced afterwards:
+    [
+      {"duplicate": "slide4.xml", "as": "risk"},
+      {"layout": "slideLayout2.xml", "as": "blank"},
+      {"order": ["slide1.xml", "risk", "blank", "slide9.xml"]},
+      {"replace": {"risk": {"Content Slide Title": "Risk Assessment"}}}
+    ]
+
+Slides left out of the order are dropped by clean.py when saving.
+"""
+
+import argparse
+import json
+import posixpath
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+from add_slide import (
+    BLANK_SLIDE_XML,
+    SLIDE_RELATIONSHIP_TYPE,
+    add_content_type_override,
+    add_presentation_relationship,
+    layout_slide_rels,
+    next_slide_number,
+    strip_notes_relationship,
+)
+from clean import clean_unused_files
+from office.pack import pack
+
+CONTENT_TYPES = "[Content_Types].xml"
+PRESENTATION = "ppt/presentation.xml"
+PRESENTATION_RELS = "ppt/_rels/presentation.xml.rels"
+SLIDES_DIR = "ppt/slides"
+
+PRESENTATION_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+RELATIONSHIPS_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+PARSER = lxml.etree.XMLParser(resolve_entities=False, no_network=True, load_dtd=False)
+
+
+class Deck:
+    def __init__(self, pptx_path: str | Path):
+        self.path = Path(pptx_path)
+        with zipfile.ZipFile(self.path) as zf:
+            self.parts = {
+                info.filename: zf.read(info)
+                for info in zf.infolist()
+                if not info.is_dir()
+            }
+
+        self._presentation = lxml.etree.fromstring(self.parts[PRESENTATION], PARSER)
+        self._slide_rids = {}
+        rels = lxml.etree.fromstring(self.parts[PRESENTATION_RELS], PARSER)
+        for rel in rels.iter(f"{{{PACKAGE_RELS_NS}}}Relationship"):
+            if rel.get("Type") == SLIDE_RELATIONSHIP_TYPE:
+                name = posixpath.basename(rel.get("Target", ""))
+                self._slide_rids[name] = rel.get("Id")
+
+    @property
+    def slides(self) -> list[str]:
+        names = {rid: name for name, rid in self._slide_rids.items()}
+        return [
+            names[sld_id.get(f"{{{RELATIONSHIPS_NS}}}id")]
+            for sld_id in self._slide_id_list()
+            if sld_id.get(f"{{{RELATIONSHIPS_NS}}}id") in names
+        ]
+
+    def duplicate_slide(self, source: str) -> str:
+        source_part = self._slide_part(source)
+        dest = self._next_slide_name()
+
+        self.parts[f"{SLIDES_DIR}/{dest}"] = self.parts[source_part]
+        source_rels = self.parts.get(_rels_part(source_part))
+        if source_rels is not None:
+            rels = strip_notes_relationship(source_rels.decode("utf-8"))
+            self.parts[_rels_part(f"{SLIDES_DIR}/{dest}")] = rels.encode("utf-8")
+
+        self._register_slide(dest)
+        return dest
+
+    def add_slide_from_layout(self, layout_file: str) -> str:
+        if f"ppt/slideLayouts/{layout_file}" not in self.parts:
+            raise KeyError(f"{layout_file} not found in {self.path}")
+
+        dest = self._next_slide_name()
+        self.parts[f"{SLIDES_DIR}/{dest}"] = BLANK_SLIDE_XML.encode("utf-8")
+        self.parts[_rels_part(f"{SLIDES_DIR}/{dest}")] = layout_slide_rels(
+            layout_file
+        ).encode("utf-8")
+
+        self._register_slide(dest)
+        return dest
+
+    def set_order(self, slides: list[str]) -> None:
+        if len(set(slides)) != len(slides):
+            raise ValueError("Each slide can appear only once in the order")
+
+        by_rid = {
+            sld_id.get(f"{{{RELATIONSHIPS_NS}}}id"): sld_id
+            for sld_id in self._slide_id_list()
+        }
+        entries = []
+        for name in slides:
+            self._slide_part(name)
+            entries.append(by_rid[self._slide_rids[name]])
+
+        sld_id_lst = self._slide_id_list()
+        for sld_id in list(sld_id_lst):
+            sld_id_lst.remove(sld_id)
+        sld_id_lst.extend(entries)
+
+    def replace_text(self, slide: str, replacements: dict[str, str]) -> int:
+        part = self._slide_part(slide)
+        xml = self.parts[part].decode("utf-8")
+        replaced = 0
+        for old_text, new_text in replacements.items():
+            old = f">{_escape(old_text)}</a:t>"
+            count = xml.count(old)
+            if count:
+                xml = xml.replace(old, f">{_escape(new_text)}</a:t>")
+                replaced += count
+        self.parts[part] = xml.encode("utf-8")
+        return replaced
+
+    def apply(self, operations: list[dict]) -> dict[str, str]:
+        aliases = {}
+
+        def resolve(name):
+            return aliases.get(name, name)
+
+        for operation in operations:
+            if "duplicate" in operation:
+                created = self.duplicate_slide(resolve(operation["duplicate"]))
+            elif "layout" in operation:
+                created = self.add_slide_from_layout(operation["layout"])
+            elif "order" in operation:
+                self.set_order([resolve(name) for name in operation["order"]])
+                continue
+            elif "replace" in operation:
+                for name, replacements in operation["replace"].items():
+                    self.replace_text(resolve(name), replacements)
+                continue
+            else:
+                raise ValueError(f"Unknown operation: {operation}")
+
+            if "as" in operation:
+                aliases[operation["as"]] = created
+
+        return aliases
+
+    def save(
+        self,
+        output_file: str | Path,
+        original_file: str | Path | None = None,
+        validate: bool = True,
+    ) -> tuple[None, str]:
+        self.parts[PRESENTATION] = lxml.etree.tostring(
+            self._presentation, xml_declaration=True, encoding="UTF-8", standalone=True
+        )
+        original = original_file if original_file is not None else self.path
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            for name, data in self.parts.items():
+                target = root.joinpath(*name.split("/"))
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(data)
+
+            clean_unused_files(root)
+            _, message = pack(
+                str(root), str(output_file), str(original), validate=validate
+            )
+            return None, message.replace(str(root), str(self.path))
+
+    def _slide_part(self, name: str) -> str:
+        part = f"{SLIDES_DIR}/{name}"
+        if part not in self.parts or name not in self._slide_rids:
+            raise KeyError(f"{name} not found in {self.path}")
+        return part
+
+    def _next_slide_name(self) -> str:
+        names = (
+            posixpath.basename(part)
+            for part in self.parts
+            if posixpath.dirname(part) == SLIDES_DIR
+        )
+        return f"slide{next_slide_number(names)}.xml"
+
+    def _register_slide(self, dest: str) -> None:
+        content_types = self.parts[CONTENT_TYPES].decode("utf-8")
+        content_types = add_content_type_override(content_types, dest)
+        self.parts[CONTENT_TYPES] = content_types.encode("utf-8")
+
+        pres_rels = self.parts[PRESENTATION_RELS].decode("utf-8")
+        pres_rels, rid = add_presentation_relationship(pres_rels, dest)
+        self.parts[PRESENTATION_RELS] = pres_rels.encode("utf-8")
+        self._slide_rids[dest] = rid
+
+        sld_id_lst = self._slide_id_list()
+        ids = [int(sld_id.get("id")) for sld_id in sld_id_lst.iter(_tag("sldId"))]
+        sld_id = lxml.etree.SubElement(sld_id_lst, _tag("sldId"))
+        sld_id.set("id", str(max(ids) + 1 if ids else 256))
+        sld_id.set(f"{{{RELATIONSHIPS_NS}}}id", rid)
+
+    def _slide_id_list(self):
+        sld_id_lst = self._presentation.find(_tag("sldIdLst"))
+        if sld_id_lst is None:
+            sld_id_lst = lxml.etree.Element(_tag("sldIdLst"))
+            master_list = self._presentation.find(_tag("sldMasterIdLst"))
+            notes_list = self._presentation.find(_tag("notesMasterIdLst"))
+            anchor = notes_list if notes_list is not None else master_list
+            anchor.addnext(sld_id_lst)
+        return sld_id_lst
+
+
+def _tag(name: str) -> str:
+    return f"{{{PRESENTATION_NS}}}{name}"
+
+
+def _rels_part(part: str) -> str:
+    directory, name = posixpath.split(part)
+    return f"{directory}/_rels/{name}.rels"
+
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build a PPTX from a template with a batch of slide operations"
+    )
+    parser.add_argument("template", help="Template .pptx file")
+    parser.add_argument("output", help="Output .pptx file")
+    parser.add_argument("operations", help="JSON file with the list of operations")
+    parser.add_argument(
+        "--validate",
+        type=lambda x: x.lower() == "true",
+        default=True,
+        metavar="true|false",
+        help="Validate against the template before packing (default: true)",
+    )
+    args = parser.parse_args()
+
+    try:
+        operations = json.loads(Path(args.operations).read_text(encoding="utf-8"))
+        deck = Deck(args.template)
+        deck.apply(operations)
+        _, message = deck.save(args.output, validate=args.validate)
+    except (KeyError, ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(message)
+
+    if "Error" in message:
+        sys.exit(1)
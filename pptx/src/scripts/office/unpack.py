@@ -4,6 +4,9 @@ Extracts the ZIP archive, pretty-prints XML files, and optionally:
 - Merges adjacent runs with identical formatting (DOCX only)
 - Simplifies adjacent tracked changes from same author (DOCX only)
 
+Each XML part is parsed once, transformed in memory and written once.
+Use --jobs to spread parts across worker processes.
+
 Usage:
     python unpack.py <office_file> <output_dir> [options]
 
@@ -11,17 +14,22 @@ Examples:
     python unpack.py document.docx unpacked/
     python unpack.py presentation.pptx unpacked/
     python unpack.py document.docx unpacked/ --merge-runs false
+    python unpack.py document.docx unpacked/ --jobs 8
 """
 
 import argparse
 import sys
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-import defusedxml.minidom
+import lxml.etree
+
+from helpers.merge_runs import merge_runs_in_tree
+from helpers.simplify_redlines import simplify_redlines_in_tree
 
-from helpers.merge_runs import merge_runs as do_merge_runs
-from helpers.simplify_redlines import simplify_redlines as do_simplify_redlines
+PARSER = lxml.etree.XMLParser(resolve_entities=False, no_network=True, load_dtd=False)
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
 
 SMART_QUOTE_REPLACEMENTS = {
     "\u201c": "&#x201C;",  
@@ -36,6 +44,7 @@ def unpack(
     output_directory: str,
     merge_runs: bool = True,
     simplify_redlines: bool = True,
+    jobs: int = 1,
 ) -> tuple[None, str]:
     input_path = Path(input_file)
     output_path = Path(output_directory)
@@ -51,26 +60,49 @@ def unpack(
         output_path.mkdir(parents=True, exist_ok=True)
 
         with zipfile.ZipFile(input_path, "r") as zf:
-            zf.extractall(output_path)
-
-        xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-        for xml_file in xml_files:
-            _pretty_print_xml(xml_file)
-
-        message = f"Unpacked {input_file} ({len(xml_files)} XML files)"
+            xml_members = []
+            for member in zf.infolist():
+                if not member.is_dir() and member.filename.endswith((".xml", ".rels")):
+                    xml_members.append(member)
+                else:
+                    zf.extract(member, output_path)
+
+            document_xml = "word/document.xml" if suffix == ".docx" else None
+            tasks = [
+                (
+                    zf.read(member),
+                    member.filename == document_xml and simplify_redlines,
+                    member.filename == document_xml and merge_runs,
+                )
+                for member in xml_members
+            ]
+
+        if jobs > 1 and len(tasks) > 1:
+            chunksize = max(1, len(tasks) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(
+                    executor.map(_transform_part, *zip(*tasks), chunksize=chunksize)
+                )
+        else:
+            results = [_transform_part(*task) for task in tasks]
+
+        simplify_count = merge_count = 0
+        for member, (content, simplified, merged) in zip(xml_members, results):
+            target = _member_path(output_path, member.filename)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content)
+            simplify_count += simplified
+            merge_count += merged
+
+        message = f"Unpacked {input_file} ({len(xml_members)} XML files)"
 
         if suffix == ".docx":
             if simplify_redlines:
-                simplify_count, _ = do_simplify_redlines(str(output_path))
                 message += f", simplified {simplify_count} tracked changes"
 
             if merge_runs:
-                merge_count, _ = do_merge_runs(str(output_path))
                 message += f", merged {merge_count} runs"
 
-        for xml_file in xml_files:
-            _escape_smart_quotes(xml_file)
-
         return None, message
 
     except zipfile.BadZipFile:
@@ -79,23 +111,59 @@ def unpack(
         return None, f"Error unpacking: {e}"
 
 
-def _pretty_print_xml(xml_file: Path) -> None:
+def _member_path(output_path: Path, filename: str) -> Path:
+    parts = filename.replace("\\", "/").split("/")
+    return output_path.joinpath(*[p for p in parts if p not in ("", ".", "..")])
+
+
+def _transform_part(
+    content: bytes, simplify_redlines: bool, merge_runs: bool
+) -> tuple[bytes, int, int]:
+    simplify_count = merge_count = 0
     try:
-        content = xml_file.read_text(encoding="utf-8")
-        dom = defusedxml.minidom.parseString(content)
-        xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="utf-8"))
+        root = lxml.etree.fromstring(content, PARSER)
     except Exception:
-        pass  
+        return _escape_smart_quotes(content), 0, 0
+
+    _strip_blank_text(root)
+    if simplify_redlines:
+        simplify_count = simplify_redlines_in_tree(root)
+    if merge_runs:
+        merge_count = merge_runs_in_tree(root)
 
+    content = b'<?xml version="1.0" encoding="utf-8"?>\n' + lxml.etree.tostring(
+        root.getroottree(), encoding="utf-8", xml_declaration=False, pretty_print=True
+    )
+    return _escape_smart_quotes(content), simplify_count, merge_count
+
+
+def _strip_blank_text(element, preserve: bool = False) -> None:
+    space = element.get(XML_SPACE)
+    if space is not None:
+        preserve = space == "preserve"
+    children = [child for child in element if isinstance(child.tag, str)]
+    if preserve or not len(element):
+        for child in children:
+            _strip_blank_text(child, preserve)
+        return
+
+    if element.text is not None and not element.text.strip():
+        element.text = None
+    for child in element:
+        if child.tail is not None and not child.tail.strip():
+            child.tail = None
+    for child in children:
+        _strip_blank_text(child, preserve)
 
-def _escape_smart_quotes(xml_file: Path) -> None:
+
+def _escape_smart_quotes(content: bytes) -> bytes:
     try:
-        content = xml_file.read_text(encoding="utf-8")
-        for char, entity in SMART_QUOTE_REPLACEMENTS.items():
-            content = content.replace(char, entity)
-        xml_file.write_text(content, encoding="utf-8")
-    except Exception:
-        pass
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        return content
+    for char, entity in SMART_QUOTE_REPLACEMENTS.items():
+        text = text.replace(char, entity)
+    return text.encode("utf-8")
 
 
 if __name__ == "__main__":
@@ -118,6 +186,13 @@ if __name__ == "__main__":
         metavar="true|false",
         help="Merge adjacent tracked changes from same author (DOCX only, default: true)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for transforming XML parts (default: 1)",
+    )
     args = parser.parse_args()
 
     _, message = unpack(
@@ -125,6 +200,7 @@ if __name__ == "__main__":
         args.output_directory,
         merge_runs=args.merge_runs,
         simplify_redlines=args.simplify_redlines,
+        jobs=args.jobs,
     )
     print(message)
 
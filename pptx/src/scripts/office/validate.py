@@ -2,7 +2,7 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <path> [--original <original_file>] [--auto-repair] [--author NAME]
+    python validate.py <path> [--original <original_file>] [--auto-repair] [--author NAME] [--jobs N] [--incremental]
 
 The first argument can be either:
 - An unpacked directory containing the Office document XML files
@@ -19,7 +19,12 @@ import tempfile
 import zipfile
 from pathlib import Path
 
-from validators import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validators import (
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+    XMLTreeCache,
+)
 
 
 def main():
@@ -50,6 +55,18 @@ def main():
         default="Claude",
         help="Author name for redlining validation (default: Claude)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for per-part validation (default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse results for unchanged parts from the previous run on this directory",
+    )
     args = parser.parse_args()
 
     path = Path(args.path)
@@ -77,18 +94,40 @@ def main():
         assert path.is_dir(), f"Error: {path} is not a directory or Office file"
         unpacked_dir = path
 
+    trees = XMLTreeCache()
+
     match file_extension:
         case ".docx":
             validators = [
-                DOCXSchemaValidator(unpacked_dir, original_file, verbose=args.verbose),
+                DOCXSchemaValidator(
+                    unpacked_dir,
+                    original_file,
+                    verbose=args.verbose,
+                    jobs=args.jobs,
+                    trees=trees,
+                    incremental=args.incremental,
+                ),
             ]
             if original_file:
                 validators.append(
-                    RedliningValidator(unpacked_dir, original_file, verbose=args.verbose, author=args.author)  
+                    RedliningValidator(
+                        unpacked_dir,
+                        original_file,
+                        verbose=args.verbose,
+                        author=args.author,
+                        trees=trees,
+                    )
                 )
         case ".pptx":
             validators = [
-                PPTXSchemaValidator(unpacked_dir, original_file, verbose=args.verbose),
+                PPTXSchemaValidator(
+                    unpacked_dir,
+                    original_file,
+                    verbose=args.verbose,
+                    jobs=args.jobs,
+                    trees=trees,
+                    incremental=args.incremental,
+                ),
             ]
         case _:
             print(f"Error: Validation not supported for file type {file_extension}")
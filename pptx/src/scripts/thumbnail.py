@@ -4,8 +4,13 @@ Creates a grid layout of slide thumbnails for quick visual analysis.
 Labels each thumbnail with its XML filename (e.g., slide1.xml).
 Hidden slides are shown with a placeholder pattern.
 
+Rendered slides are cached by a hash of the slide XML and everything it
+references (layout, master, theme, media, charts), so re-running after an edit
+only renders the slides that changed.
+
 Usage:
-    python thumbnail.py input.pptx [output_prefix] [--cols N]
+    python thumbnail.py input.pptx [output_prefix] [--cols N] [--jobs N]
+    python thumbnail.py input.pptx --no-cache
 
 Examples:
     python thumbnail.py presentation.pptx
@@ -16,14 +21,20 @@ Examples:
 """
 
 import argparse
+import hashlib
+import os
+import posixpath
+import re
 import subprocess
 import sys
 import tempfile
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import defusedxml.minidom
-from office.soffice import get_soffice_env
+from office.soffice import convert_document
 from PIL import Image, ImageDraw, ImageFont
 
 THUMBNAIL_WIDTH = 300
@@ -35,6 +46,15 @@ GRID_PADDING = 20
 BORDER_WIDTH = 2
 FONT_SIZE_RATIO = 0.10
 LABEL_PADDING_RATIO = 0.4
+# Per-user by default: tiles are trusted as rendered, so the cache must not
+# be writable by others.
+CACHE_DIR = Path(
+    os.environ.get("PPTX_THUMBNAIL_CACHE")
+    or Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "pptx-thumbnails"
+)
+CACHE_MAX_AGE_DAYS = 30
+UNRENDERED_RELATIONSHIPS = ("/slide", "/notesSlide", "/notesMaster", "/comments")
 
 
 def main():
@@ -54,6 +74,22 @@ def main():
         default=DEFAULT_COLS,
         help=f"Number of columns (default: {DEFAULT_COLS}, max: {MAX_COLS})",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Parallel pdftoppm processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=CACHE_DIR,
+        help=f"Rendered slide cache (default: {CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Render every slide from scratch"
+    )
 
     args = parser.parse_args()
 
@@ -73,7 +109,10 @@ def main():
 
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
-            visible_images = convert_to_images(input_path, temp_path)
+            cache_dir = None if args.no_cache else args.cache_dir
+            visible_images = render_slides(
+                input_path, slide_info, temp_path, cache_dir, args.jobs
+            )
 
             if not visible_images and not any(s["hidden"] for s in slide_info):
                 print("Error: No slides found", file=sys.stderr)
@@ -103,7 +142,7 @@ def get_slide_info(pptx_path: Path) -> list[dict]:
             target = rel.getAttribute("Target")
             rel_type = rel.getAttribute("Type")
             if "slide" in rel_type and target.startswith("slides/"):
-                rid_to_slide[rid] = target.replace("slides/", "")
+                rid_to_slide[rid] = target
 
         pres_content = zf.read("ppt/presentation.xml").decode("utf-8")
         pres_dom = defusedxml.minidom.parseString(pres_content)
@@ -113,11 +152,161 @@ def get_slide_info(pptx_path: Path) -> list[dict]:
             rid = sld_id.getAttribute("r:id")
             if rid in rid_to_slide:
                 hidden = sld_id.getAttribute("show") == "0"
-                slides.append({"name": rid_to_slide[rid], "hidden": hidden})
+                slides.append(
+                    {
+                        "name": rid_to_slide[rid].replace("slides/", ""),
+                        "part": f"ppt/{rid_to_slide[rid]}",
+                        "rid": rid,
+                        "hidden": hidden,
+                    }
+                )
 
         return slides
 
 
+def render_slides(
+    pptx_path: Path,
+    slide_info: list[dict],
+    temp_dir: Path,
+    cache_dir: Path | None = None,
+    jobs: int = 1,
+    width: int = THUMBNAIL_WIDTH,
+) -> list[Path]:
+    visible = [info for info in slide_info if not info["hidden"]]
+    if cache_dir is None:
+        return convert_to_images(pptx_path, temp_dir, len(visible), jobs, width)
+
+    cache_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+    keys = slide_cache_keys(pptx_path, visible, width)
+    tiles = [cache_dir / f"{keys[info['part']]}.jpg" for info in visible]
+
+    missing = {}
+    for info, tile in zip(visible, tiles):
+        if not tile.exists() and tile not in missing.values():
+            missing[info["rid"]] = tile
+
+    if missing:
+        # Render next to the cache so tiles can be moved in atomically, even
+        # when the cache is on another filesystem than temp_dir.
+        with tempfile.TemporaryDirectory(dir=cache_dir, prefix=".render-") as render:
+            render_dir = Path(render)
+            subset_path = render_dir / f"render-{pptx_path.name}"
+            _write_render_subset(pptx_path, set(missing), subset_path)
+            images = convert_to_images(
+                subset_path, render_dir, len(missing), jobs, width
+            )
+            if len(images) != len(missing):
+                raise RuntimeError(
+                    f"Expected {len(missing)} rendered slides, got {len(images)}"
+                )
+            for image, tile in zip(images, missing.values()):
+                os.replace(image, tile)
+
+    now = time.time()
+    for tile in set(tiles):
+        os.utime(tile, (now, now))
+    _prune_cache(cache_dir, now)
+    return tiles
+
+
+def slide_cache_keys(
+    pptx_path: Path, slides: list[dict], width: int = THUMBNAIL_WIDTH
+) -> dict[str, str]:
+    with zipfile.ZipFile(pptx_path, "r") as zf:
+        names = set(zf.namelist())
+        digests = {}
+
+        def digest(part):
+            if part not in digests:
+                digests[part] = hashlib.sha256(zf.read(part)).hexdigest()
+            return digests[part]
+
+        pres_content = zf.read("ppt/presentation.xml").decode("utf-8")
+        # Presentation-wide inputs to every slide's rendering: the root
+        # element (firstSlideNum), slide size, default text style and
+        # table styles.
+        shared = [str(width)]
+        for pattern in (
+            r"<p:presentation\b[^>]*>",
+            r"<p:sldSz\b[^>]*>",
+            r"<p:defaultTextStyle\b.*?</p:defaultTextStyle>",
+        ):
+            match = re.search(pattern, pres_content, re.DOTALL)
+            shared.append(match.group(0) if match else "")
+        if "ppt/tableStyles.xml" in names:
+            shared.append(digest("ppt/tableStyles.xml"))
+        settings = "|".join(shared)
+        order = re.findall(r'<p:sldId\b[^>]*\br:id="([^"]+)"', pres_content)
+
+        keys = {}
+        for info in slides:
+            parts = _rendered_parts(zf, info["part"], names)
+            # The position drives slide-number fields
+            position = order.index(info["rid"]) if info["rid"] in order else -1
+            key = hashlib.sha256(f"{settings}|{position}".encode())
+            for part in sorted(parts):
+                key.update(f"{part}\0{digest(part)}\0".encode())
+            keys[info["part"]] = key.hexdigest()
+        return keys
+
+
+def _rendered_parts(zf: zipfile.ZipFile, slide_part: str, names: set) -> set:
+    parts = set()
+    pending = [slide_part]
+    while pending:
+        part = pending.pop()
+        if part in parts or part not in names:
+            continue
+        parts.add(part)
+
+        directory, filename = posixpath.split(part)
+        rels_part = posixpath.join(directory, "_rels", f"{filename}.rels")
+        if rels_part not in names:
+            continue
+        parts.add(rels_part)
+
+        rels_dom = defusedxml.minidom.parseString(zf.read(rels_part))
+        for rel in rels_dom.getElementsByTagName("Relationship"):
+            if rel.getAttribute("TargetMode") == "External":
+                continue
+            if rel.getAttribute("Type").endswith(UNRENDERED_RELATIONSHIPS):
+                continue
+            target = rel.getAttribute("Target")
+            if target.startswith("/"):
+                pending.append(target.lstrip("/"))
+            else:
+                pending.append(posixpath.normpath(posixpath.join(directory, target)))
+    return parts
+
+
+def _write_render_subset(pptx_path: Path, rids: set, output_path: Path) -> None:
+    with zipfile.ZipFile(pptx_path, "r") as zin:
+        pres_dom = defusedxml.minidom.parseString(zin.read("ppt/presentation.xml"))
+        for sld_id in pres_dom.getElementsByTagName("p:sldId"):
+            if sld_id.getAttribute("r:id") in rids:
+                if sld_id.hasAttribute("show"):
+                    sld_id.removeAttribute("show")
+            else:
+                sld_id.setAttribute("show", "0")
+
+        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zout:
+            for item in zin.infolist():
+                if item.filename == "ppt/presentation.xml":
+                    zout.writestr(item, pres_dom.toxml(encoding="UTF-8"))
+                else:
+                    zout.writestr(item, zin.read(item))
+
+
+def _prune_cache(cache_dir: Path, now: float) -> None:
+    cutoff = now - CACHE_MAX_AGE_DAYS * 86400
+    for tile in cache_dir.glob("*.jpg"):
+        try:
+            if tile.stat().st_mtime < cutoff:
+                tile.unlink()
+        except OSError:
+            pass
+
+
 def build_slide_list(
     slide_info: list[dict],
     visible_images: list[Path],
@@ -127,16 +316,17 @@ def build_slide_list(
         with Image.open(visible_images[0]) as img:
             placeholder_size = img.size
     else:
-        placeholder_size = (1920, 1080)
+        placeholder_size = (THUMBNAIL_WIDTH, THUMBNAIL_WIDTH * 9 // 16)
 
     slides = []
     visible_idx = 0
+    placeholder_path = temp_dir / "hidden.jpg"
 
     for info in slide_info:
         if info["hidden"]:
-            placeholder_path = temp_dir / f"hidden-{info['name']}.jpg"
-            placeholder_img = create_hidden_placeholder(placeholder_size)
-            placeholder_img.save(placeholder_path, "JPEG")
+            if not placeholder_path.exists():
+                placeholder_img = create_hidden_placeholder(placeholder_size)
+                placeholder_img.save(placeholder_path, "JPEG")
             slides.append((placeholder_path, f"{info['name']} (hidden)"))
         else:
             if visible_idx < len(visible_images):
@@ -155,42 +345,48 @@ def create_hidden_placeholder(size: tuple[int, int]) -> Image.Image:
     return img
 
 
-def convert_to_images(pptx_path: Path, temp_dir: Path) -> list[Path]:
-    pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
-
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-        env=get_soffice_env(),
-    )
-    if result.returncode != 0 or not pdf_path.exists():
-        raise RuntimeError("PDF conversion failed")
-
-    result = subprocess.run(
-        [
-            "pdftoppm",
-            "-jpeg",
-            "-r",
-            str(CONVERSION_DPI),
-            str(pdf_path),
-            str(temp_dir / "slide"),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        raise RuntimeError("Image conversion failed")
+def convert_to_images(
+    pptx_path: Path,
+    temp_dir: Path,
+    page_count: int | None = None,
+    jobs: int = 1,
+    width: int | None = None,
+) -> list[Path]:
+    try:
+        pdf_path = convert_document(pptx_path, temp_dir, "pdf")
+    except Exception as e:
+        raise RuntimeError("PDF conversion failed") from e
+
+    output_dir = temp_dir / f"{pdf_path.stem}-pages"
+    output_dir.mkdir()
+    if page_count and jobs > 1:
+        shards = min(jobs, page_count)
+        bounds = [
+            (page_count * index // shards + 1, page_count * (index + 1) // shards)
+            for index in range(shards)
+        ]
+    else:
+        bounds = [None]
 
-    return sorted(temp_dir.glob("slide-*.jpg"))
+    def rasterize(pages):
+        cmd = ["pdftoppm", "-jpeg"]
+        if width:
+            cmd += ["-scale-to-x", str(width), "-scale-to-y", "-1"]
+        else:
+            cmd += ["-r", str(CONVERSION_DPI)]
+        if pages:
+            cmd += ["-f", str(pages[0]), "-l", str(pages[1])]
+        cmd += [str(pdf_path), str(output_dir / "slide")]
+        return subprocess.run(cmd, capture_output=True, text=True).returncode
+
+    with ThreadPoolExecutor(max_workers=len(bounds)) as executor:
+        if any(executor.map(rasterize, bounds)):
+            raise RuntimeError("Image conversion failed")
+
+    return sorted(
+        output_dir.glob("slide-*.jpg"),
+        key=lambda path: int(path.stem.rsplit("-", 1)[1]),
+    )
 
 
 def create_grids(
@@ -266,6 +462,7 @@ def create_grid(
         y_thumbnail = y_base + label_padding + font_size + label_padding
 
         with Image.open(img_path) as img:
+            img.draft("RGB", (width, height))
             img.thumbnail((width, height), Image.Resampling.LANCZOS)
             w, h = img.size
             tx = x + (width - w) // 2
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import importlib.util
+import re
+import sys
+import zipfile
+from pathlib import Path
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / f"{name}.py")
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+add_slide = _load("add_slide")
+deck = _load("deck")
+
+SLIDE_TYPE = add_slide.SLIDE_RELATIONSHIP_TYPE
+# rId7 is left over from a deleted slide2.xml, with Target before Id.
+PARTS = {
+    "[Content_Types].xml": (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">\n'
+        f'  <Override PartName="/ppt/slides/slide1.xml" ContentType="{add_slide.SLIDE_CONTENT_TYPE}"/>\n'
+        "</Types>"
+    ),
+    "ppt/_rels/presentation.xml.rels": (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">\n'
+        f'  <Relationship Id="rId2" Type="{SLIDE_TYPE}" Target="slides/slide1.xml"/>\n'
+        f'  <Relationship Target="slides/slide2.xml" Type="{SLIDE_TYPE}" Id="rId7"/>\n'
+        "</Relationships>"
+    ),
+    "ppt/presentation.xml": (
+        f'<p:presentation xmlns:p="{deck.PRESENTATION_NS}" xmlns:r="{deck.RELATIONSHIPS_NS}">'
+        '<p:sldMasterIdLst/><p:sldIdLst><p:sldId id="256" r:id="rId2"/></p:sldIdLst>'
+        "</p:presentation>"
+    ),
+    "ppt/slides/slide1.xml": add_slide.BLANK_SLIDE_XML,
+}
+
+
+def _targets(pres_rels: str) -> list[tuple[str, str]]:
+    relationships = re.findall(r"<Relationship\b[^>]*>", pres_rels)
+    return [
+        (
+            re.search(r'\bId="([^"]*)"', rel).group(1),
+            re.search(r'Target="([^"]*)"', rel).group(1),
+        )
+        for rel in relationships
+    ]
+
+
+def test_relationship_reuses_stale_target() -> None:
+    pres_rels = PARTS["ppt/_rels/presentation.xml.rels"]
+
+    unchanged, rid = add_slide.add_presentation_relationship(pres_rels, "slide2.xml")
+    assert (unchanged, rid) == (pres_rels, "rId7")
+
+    updated, rid = add_slide.add_presentation_relationship(pres_rels, "slide3.xml")
+    assert rid == "rId8"
+    assert _targets(updated)[-1] == ("rId8", "slides/slide3.xml")
+
+
+def test_add_slides_reuses_stale_relationship(tmp_path: Path) -> None:
+    for name, content in PARTS.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(content, encoding="utf-8")
+
+    created = add_slide.add_slides(tmp_path, [("slide1.xml", 2)])
+
+    assert created == [
+        ("slide2.xml", "slide1.xml", 257, "rId7"),
+        ("slide3.xml", "slide1.xml", 258, "rId8"),
+    ]
+    pres_rels = (tmp_path / "ppt/_rels/presentation.xml.rels").read_text(encoding="utf-8")
+    assert _targets(pres_rels) == [
+        ("rId2", "slides/slide1.xml"),
+        ("rId7", "slides/slide2.xml"),
+        ("rId8", "slides/slide3.xml"),
+    ]
+    content_types = (tmp_path / "[Content_Types].xml").read_text(encoding="utf-8")
+    assert content_types.count('PartName="/ppt/slides/slide2.xml"') == 1
+
+
+def test_deck_registers_stale_relationship(tmp_path: Path) -> None:
+    path = tmp_path / "template.pptx"
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, content in PARTS.items():
+            zf.writestr(name, content)
+
+    slides = deck.Deck(path)
+    assert slides.duplicate_slide("slide1.xml") == "slide2.xml"
+
+    assert slides.slides == ["slide1.xml", "slide2.xml"]
+    rids = [
+        sld_id.get(f"{{{deck.RELATIONSHIPS_NS}}}id")
+        for sld_id in slides._slide_id_list()
+    ]
+    assert rids == ["rId2", "rId7"]
@@ -1,110 +1,25 @@
 #!/usr/bin/env python3
 """
 BID-2026-001 Auchan AI Discovery Audit
-Builds two PPTX decks from the TokenShift template using unpack/add_slide/edit/pack.
+Builds two PPTX decks from the TokenShift template with the in-memory Deck API.
   1. Internal Bid Validation (10 slides, English)
   2. External Proposal for Auchan (14 slides, French)
 """
-import os, sys, shutil, subprocess, re, copy
+import os, sys
 
 SKILL_DIR  = "/home/pascal/.claude/skills/pptx/scripts"
 TEMPLATE   = "/mnt/c/Users/pasca/TokenShift/08_Brand_Templates/01_Brand_Guidelines/TokenShift-Brand/tokenshift-template-v2.pptx"
 OUT_DIR    = "/mnt/c/Users/pasca/TokenShift/90_Agent_Workspaces/sales_enablement/03_Proposed_Changes"
-WORK_BASE  = "/tmp/auchan-build"
+
+sys.path.insert(0, SKILL_DIR)
+from deck import Deck
 
 # ── Helpers ────────────────────────────────────────────────────
 
-def run(cmd, cwd=None):
-    """Run a shell command and print output."""
-    r = subprocess.run(cmd, shell=True, capture_output=True, text=True, cwd=cwd)
-    if r.stdout.strip():
-        print(r.stdout.strip())
-    if r.returncode != 0:
-        print(f"WARN: {cmd}\n{r.stderr.strip()}")
-    return r
-
-def unpack(pptx, dest):
-    run(f"python3 {SKILL_DIR}/office/unpack.py '{pptx}' '{dest}'")
-
-def add_slide(work_dir, source_slide):
-    """Duplicate a slide. Inserts sldId into presentation.xml. Returns (slide_num, id, rId)."""
-    r = run(f"python3 {SKILL_DIR}/add_slide.py '{work_dir}' '{source_slide}'")
-    output = r.stdout.strip()
-    # Parse the output: e.g. 'Created slide10.xml from slide4.xml\nAdd to presentation.xml...: <p:sldId id="265" r:id="rId16"/>'
-    slide_match = re.search(r"Created (slide(\d+)\.xml)", output)
-    rid_match = re.search(r'r:id="(rId\d+)"', output)
-    if not slide_match or not rid_match:
-        print(f"WARN: Could not parse add_slide output: {output}")
-        return None
-    slide_num = int(slide_match.group(2))
-    rid = rid_match.group(1)
-
-    # Assign a unique ID (find max existing ID and increment)
-    pres_path = os.path.join(work_dir, "ppt", "presentation.xml")
-    with open(pres_path, "r", encoding="utf-8") as f:
-        pxml = f.read()
-    existing_ids = [int(x) for x in re.findall(r'<p:sldId id="(\d+)"', pxml)]
-    new_id = max(existing_ids) + 1 if existing_ids else 265
-    # Insert the new sldId before </p:sldIdLst>
-    new_entry = f'<p:sldId id="{new_id}" r:id="{rid}"/>\n  '
-    pxml = pxml.replace("</p:sldIdLst>", f"  {new_entry}</p:sldIdLst>")
-    with open(pres_path, "w", encoding="utf-8") as f:
-        f.write(pxml)
-    print(f"  Added sldId id={new_id} r:id={rid} for slide{slide_num}.xml")
-    return (slide_num, str(new_id), rid)
-
-def clean(work_dir):
-    run(f"python3 {SKILL_DIR}/clean.py '{work_dir}'")
-
-def pack(work_dir, output, original):
-    run(f"python3 {SKILL_DIR}/office/pack.py '{work_dir}' '{output}' --original '{original}'")
-
-def replace_in_file(filepath, old, new):
-    """Simple string replacement in a file."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        content = f.read()
-    if old not in content:
-        return False
-    content = content.replace(old, new)
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(content)
-    return True
-
-def replace_text_in_slide(slide_path, replacements):
-    """Replace text in <a:t> elements. Handles split runs by joining adjacent runs."""
-    with open(slide_path, "r", encoding="utf-8") as f:
-        xml = f.read()
-    for old_text, new_text in replacements.items():
-        # Escape for XML
-        new_escaped = new_text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        old_escaped = old_text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        # Direct replacement in <a:t> tags
-        xml = xml.replace(f">{old_escaped}</a:t>", f">{new_escaped}</a:t>")
-    with open(slide_path, "w", encoding="utf-8") as f:
-        f.write(xml)
-
-def set_slide_order(work_dir, slide_ids):
-    """Rewrite <p:sldIdLst> in presentation.xml with the given ordered list of (id, rId) tuples."""
-    pres_path = os.path.join(work_dir, "ppt", "presentation.xml")
-    with open(pres_path, "r", encoding="utf-8") as f:
-        xml = f.read()
-    # Build new sldIdLst
-    entries = "\n    ".join(f'<p:sldId id="{sid}" r:id="{rid}"/>' for sid, rid in slide_ids)
-    new_list = f"<p:sldIdLst>\n    {entries}\n  </p:sldIdLst>"
-    xml = re.sub(r"<p:sldIdLst>.*?</p:sldIdLst>", new_list, xml, flags=re.DOTALL)
-    with open(pres_path, "w", encoding="utf-8") as f:
-        f.write(xml)
-
-def get_slide_ids(work_dir):
-    """Parse current slide IDs from presentation.xml."""
-    pres_path = os.path.join(work_dir, "ppt", "presentation.xml")
-    with open(pres_path, "r", encoding="utf-8") as f:
-        xml = f.read()
-    return re.findall(r'<p:sldId id="(\d+)" r:id="(rId\d+)"/>', xml)
-
-def get_slide_path(work_dir, slide_num):
-    """Get the path to a slide XML file."""
-    return os.path.join(work_dir, "ppt", "slides", f"slide{slide_num}.xml")
+def save(deck, output):
+    """Clean, validate against the template and pack in a single write."""
+    _, message = deck.save(output, TEMPLATE)
+    print(message)
 
 # ══════════════════════════════════════════════════════════════
 #  INTERNAL DECK (10 slides, English)
@@ -112,12 +27,7 @@ def get_slide_path(work_dir, slide_num):
 
 def build_internal():
     print("\n=== BUILDING INTERNAL DECK ===")
-    work = os.path.join(WORK_BASE, "internal")
-    if os.path.exists(work):
-        shutil.rmtree(work)
-
-    # 1. Unpack template
-    unpack(TEMPLATE, work)
+    deck = Deck(TEMPLATE)
 
     # Template slides: 1=Title, 2=Agenda, 3=SectionDiv, 4=Content, 5=TwoCol, 6=Metrics, 7=4Phase, 8=Chart, 9=ThankYou
     # Target: 10 slides
@@ -133,82 +43,46 @@ def build_internal():
     #   T4dup → S9: Risk Assessment (content)
     #   T9 → S10: Go/No-Go (thank you)
 
-    # 2. Duplicate slides we need extra copies of
-    dup_content = add_slide(work, "slide4.xml")  # for Risk Assessment
-    dup_metrics = add_slide(work, "slide6.xml")  # for Pricing & P&L
-    dup_4phase  = add_slide(work, "slide7.xml")  # for Delivery Plan
-
-    # 3. Build rId→slide mapping
-    rels_path = os.path.join(work, "ppt", "_rels", "presentation.xml.rels")
-    with open(rels_path, "r", encoding="utf-8") as f:
-        rels_xml = f.read()
-    rid_to_slide = {}
-    for m in re.finditer(r'Id="(rId\d+)"[^>]*Target="slides/(slide\d+\.xml)"', rels_xml):
-        rid_to_slide[m.group(1)] = m.group(2)
-
-    # Map original template slides (1-9) from presentation.xml
-    ids = get_slide_ids(work)
-    slide_by_num = {}
-    for sid, rid in ids:
-        sfile = rid_to_slide.get(rid, "")
-        if sfile:
-            num = int(re.search(r"slide(\d+)", sfile).group(1))
-            slide_by_num[num] = (sid, rid)
-    print(f"Slide map: {slide_by_num}")
-
-    # Duplicated slides: use the returned (slide_num, id, rId) tuples
-    dup_content_entry = (dup_content[1], dup_content[2])
-    dup_metrics_entry = (dup_metrics[1], dup_metrics[2])
-    dup_4phase_entry  = (dup_4phase[1], dup_4phase[2])
-
-    # Original slide entries: (id, rId)
-    T1 = slide_by_num[1]   # Title
-    T3 = slide_by_num[3]   # Section Divider
-    T4 = slide_by_num[4]   # Content
-    T5 = slide_by_num[5]   # Two-Column
-    T6 = slide_by_num[6]   # Metrics
-    T7 = slide_by_num[7]   # 4-Phase
-    T9 = slide_by_num[9]   # Thank You
-
-    # 4. Set slide order for internal deck (10 slides)
+    # 1. Duplicate slides we need extra copies of
+    dup_content = deck.duplicate_slide("slide4.xml")  # for Risk Assessment
+    dup_metrics = deck.duplicate_slide("slide6.xml")  # for Pricing & P&L
+    dup_4phase  = deck.duplicate_slide("slide7.xml")  # for Delivery Plan
+
+    # Original template slides
+    T1 = "slide1.xml"   # Title
+    T3 = "slide3.xml"   # Section Divider
+    T4 = "slide4.xml"   # Content
+    T5 = "slide5.xml"   # Two-Column
+    T6 = "slide6.xml"   # Metrics
+    T7 = "slide7.xml"   # 4-Phase
+    T9 = "slide9.xml"   # Thank You
+
+    # 2. Set slide order for internal deck (10 slides)
     order = [
         T1,                  # S1: Title
         T6,                  # S2: Opportunity Summary (Metrics)
         T3,                  # S3: Client Context (Section Divider)
         T7,                  # S4: Solution (4-Phase)
         T5,                  # S5: Win Strategy (Two-Column)
-        dup_4phase_entry,    # S6: Delivery Plan (4-Phase dup)
-        dup_metrics_entry,   # S7: Pricing & P&L (Metrics dup)
+        dup_4phase,          # S6: Delivery Plan (4-Phase dup)
+        dup_metrics,         # S7: Pricing & P&L (Metrics dup)
         T4,                  # S8: Competitive Landscape (Content)
-        dup_content_entry,   # S9: Risk Assessment (Content dup)
+        dup_content,         # S9: Risk Assessment (Content dup)
         T9,                  # S10: Go/No-Go (Thank You)
     ]
-    set_slide_order(work, order)
-
-    # 5. Edit slide content (English)
-    slides_dir = os.path.join(work, "ppt", "slides")
+    deck.set_order(order)
 
-    # Re-read rels after add_slide calls added new entries
-    with open(rels_path, "r", encoding="utf-8") as f:
-        rels_xml = f.read()
-    rid_to_slide = {}
-    for m in re.finditer(r'Id="(rId\d+)"[^>]*Target="slides/(slide\d+\.xml)"', rels_xml):
-        rid_to_slide[m.group(1)] = m.group(2)
-    print(f"Updated rId→slide: {rid_to_slide}")
-
-    # Helper to get slide file from rId
-    def sf(rid):
-        return os.path.join(slides_dir, rid_to_slide[rid])
+    # 3. Edit slide content (English)
 
     # S1: Title
-    replace_text_in_slide(sf(order[0][1]), {
+    deck.replace_text(order[0], {
         "Presentation Title": "Auchan AI Discovery Audit",
         "Subtitle or context line goes here": "Internal Bid Validation | BID-2026-001",
         "February 2026": "23 February 2026 | CONFIDENTIAL - INTERNAL",
     })
 
     # S2: Opportunity Summary (Metrics slide)
-    replace_text_in_slide(sf(order[1][1]), {
+    deck.replace_text(order[1], {
         "Key Metrics": "Opportunity Summary",
         "4": "EUR 95K",
         "85%": "5 wks",
@@ -225,14 +99,14 @@ def build_internal():
     })
 
     # S3: Client Context (Section Divider)
-    replace_text_in_slide(sf(order[2][1]), {
+    deck.replace_text(order[2], {
         "01": "",
         "Section Title": "Client Context: Auchan Retail",
         "Supporting context for this section": "EUR 32B revenue | 160K employees | EUR 1.2B net loss | 9+ AI projects | EU AI Act deadline Aug 2026",
     })
 
     # S4: Solution (4-Phase slide)
-    replace_text_in_slide(sf(order[3][1]), {
+    deck.replace_text(order[3], {
         "Our 4-Phase Approach": "Proposed Solution: DIAGNOSE Framework",
         "Diagnose": "AI Landscape",
         "Build": "Process & ROI",
@@ -245,7 +119,7 @@ def build_internal():
     })
 
     # S5: Win Strategy (Two-Column)
-    replace_text_in_slide(sf(order[4][1]), {
+    deck.replace_text(order[4], {
         "Two-Column Comparison": "Win Strategy: Our Advantages vs. Competition",
         "Before": "Our Advantages",
         "After": "Competition Weaknesses",
@@ -260,7 +134,7 @@ def build_internal():
     })
 
     # S6: Delivery Plan (4-Phase duplicate)
-    replace_text_in_slide(sf(order[5][1]), {
+    deck.replace_text(order[5], {
         "Our 4-Phase Approach": "Delivery Plan: 5-Week Timeline",
         "Diagnose": "W1: Kick-off",
         "Build": "W2: AI Assess",
@@ -273,7 +147,7 @@ def build_internal():
     })
 
     # S7: Pricing & P&L (Metrics duplicate)
-    replace_text_in_slide(sf(order[6][1]), {
+    deck.replace_text(order[6], {
         "Key Metrics": "Deal Economics: Pricing & P&L",
         "4": "EUR 95K",
         "85%": "EUR 35.6K",
@@ -290,7 +164,7 @@ def build_internal():
     })
 
     # S8: Competitive Landscape (Content slide)
-    replace_text_in_slide(sf(order[7][1]), {
+    deck.replace_text(order[7], {
         "Content Slide Title": "Competitive Landscape",
         "Key point one with supporting detail that provides context for the audience.": "Accenture/Capgemini: HIGH threat. Strong brand but expensive, slow, generic. We win on price (-60%), speed (5 vs 12 wks).",
         "Key point two explaining another aspect of the topic or insight.": "IBM: MEDIUM threat. Proprietary AI stack, existing infra. Conflict of interest. We win on independence and holistic approach.",
@@ -301,7 +175,7 @@ def build_internal():
     })
 
     # S9: Risk Assessment (Content duplicate)
-    replace_text_in_slide(sf(order[8][1]), {
+    deck.replace_text(order[8], {
         "Content Slide Title": "Risk Assessment: 5 Identified Risks",
         "Key point one with supporting detail that provides context for the audience.": "Sponsor instability (MEDIUM): Identify backup sponsor from W1. Maintain 2+ COMEX contact points.",
         "Key point two explaining another aspect of the topic or insight.": "Scope creep (HIGH): Strict scoping in W1, formal change request process. Scope validated in kick-off memo.",
@@ -312,7 +186,7 @@ def build_internal():
     })
 
     # S10: Go/No-Go (Thank You slide)
-    replace_text_in_slide(sf(order[9][1]), {
+    deck.replace_text(order[9], {
         "Thank you": "RECOMMENDATION: GO",
         "From code to culture.": "Score: 4.5 / 5",
         "pascal@tokenshift.com": "Validate with stakeholders by 24 Feb",
@@ -320,10 +194,9 @@ def build_internal():
         "tokenshift.com": "BID-2026-001 | CONFIDENTIAL - INTERNAL",
     })
 
-    # 6. Clean and pack
-    clean(work)
+    # 4. Clean and pack
     out_path = os.path.join(OUT_DIR, "Auchan-Internal-Bid-Validation-2026-02-23.pptx")
-    pack(work, out_path, TEMPLATE)
+    save(deck, out_path)
     print(f"\nInternal deck: {out_path}")
     return out_path
 
@@ -333,12 +206,7 @@ def build_internal():
 
 def build_external():
     print("\n=== BUILDING EXTERNAL DECK ===")
-    work = os.path.join(WORK_BASE, "external")
-    if os.path.exists(work):
-        shutil.rmtree(work)
-
-    # 1. Unpack template
-    unpack(TEMPLATE, work)
+    deck = Deck(TEMPLATE)
 
     # Target: 14 slides
     # Slide mapping:
@@ -358,42 +226,18 @@ def build_external():
     #   T9 → S14: Let's Start (Thank You)
     # Remove T8 (Chart)
 
-    # 2. Duplicate slides
-    dup4a = add_slide(work, "slide4.xml")   # for Deliverables
-    dup4b = add_slide(work, "slide4.xml")   # for Team
-    dup5a = add_slide(work, "slide5.xml")   # for WS 3&4
-    dup5b = add_slide(work, "slide5.xml")   # for Why TokenShift
-    dup7a = add_slide(work, "slide7.xml")   # for Timeline
-    dup7b = add_slide(work, "slide7.xml")   # for What Comes Next
-
-    # Build rId→slide mapping
-    rels_path = os.path.join(work, "ppt", "_rels", "presentation.xml.rels")
-    with open(rels_path, "r", encoding="utf-8") as f:
-        rels_xml = f.read()
-    rid_to_slide = {}
-    for m in re.finditer(r'Id="(rId\d+)"[^>]*Target="slides/(slide\d+\.xml)"', rels_xml):
-        rid_to_slide[m.group(1)] = m.group(2)
-
-    ids = get_slide_ids(work)
-    slide_by_num = {}
-    for sid, rid in ids:
-        sfile = rid_to_slide.get(rid, "")
-        if sfile:
-            num = int(re.search(r"slide(\d+)", sfile).group(1))
-            slide_by_num[num] = (sid, rid)
-    print(f"Slide map: {slide_by_num}")
-
-    # Original entries
-    T1 = slide_by_num[1]; T2 = slide_by_num[2]; T3 = slide_by_num[3]
-    T4 = slide_by_num[4]; T5 = slide_by_num[5]; T6 = slide_by_num[6]
-    T7 = slide_by_num[7]; T9 = slide_by_num[9]
-
-    # Dup entries from add_slide returns: (slide_num, id, rId)
-    D4a = (dup4a[1], dup4a[2]); D4b = (dup4b[1], dup4b[2])
-    D5a = (dup5a[1], dup5a[2]); D5b = (dup5b[1], dup5b[2])
-    D7a = (dup7a[1], dup7a[2]); D7b = (dup7b[1], dup7b[2])
-
-    # 3. Set slide order (14 slides, remove T8=Chart)
+    # 1. Duplicate slides
+    D4a = deck.duplicate_slide("slide4.xml")   # for Deliverables
+    D4b = deck.duplicate_slide("slide4.xml")   # for Team
+    D5a = deck.duplicate_slide("slide5.xml")   # for WS 3&4
+    D5b = deck.duplicate_slide("slide5.xml")   # for Why TokenShift
+    D7a = deck.duplicate_slide("slide7.xml")   # for Timeline
+    D7b = deck.duplicate_slide("slide7.xml")   # for What Comes Next
+
+    # Original template slides
+    T1, T2, T3, T4, T5, T6, T7, T9 = (f"slide{n}.xml" for n in (1, 2, 3, 4, 5, 6, 7, 9))
+
+    # 2. Set slide order (14 slides, remove T8=Chart)
     order = [
         T1,   # S1: Title
         T2,   # S2: Executive Summary (Agenda)
@@ -410,31 +254,19 @@ def build_external():
         D7b,  # S13: What Comes Next (4-Phase dup)
         T9,   # S14: Let's Start (Thank You)
     ]
-    set_slide_order(work, order)
-
-    # 4. Edit slide content (French)
-    slides_dir = os.path.join(work, "ppt", "slides")
-
-    # Re-read rels after add_slide calls
-    with open(rels_path, "r", encoding="utf-8") as f:
-        rels_xml = f.read()
-    rid_to_slide = {}
-    for m in re.finditer(r'Id="(rId\d+)"[^>]*Target="slides/(slide\d+\.xml)"', rels_xml):
-        rid_to_slide[m.group(1)] = m.group(2)
-    print(f"Updated rId→slide: {rid_to_slide}")
+    deck.set_order(order)
 
-    def sf(rid):
-        return os.path.join(slides_dir, rid_to_slide[rid])
+    # 3. Edit slide content (French)
 
     # S1: Title
-    replace_text_in_slide(sf(order[0][1]), {
+    deck.replace_text(order[0], {
         "Presentation Title": "AI Discovery Audit",
         "Subtitle or context line goes here": "Proposition pour Auchan Retail",
         "February 2026": "Fevrier 2026 | CONFIDENTIEL",
     })
 
     # S2: Executive Summary (Agenda slide - 4 sections)
-    replace_text_in_slide(sf(order[1][1]), {
+    deck.replace_text(order[1], {
         "Agenda": "Synthese Executive",
         "Section One": "Clarte",
         "Section Two": "Conformite",
@@ -442,42 +274,27 @@ def build_external():
         "Section Four": "Rapidite",
     })
     # Also replace the descriptions
-    replace_text_in_slide(sf(order[1][1]), {
+    deck.replace_text(order[1], {
         "Brief description of section content": "",
     })
-    # Need to replace each description individually - they all have same text
-    # Use a more targeted approach for the agenda slide
-    agenda_path = sf(order[1][1])
-    with open(agenda_path, "r", encoding="utf-8") as f:
-        xml = f.read()
-    # The 4 descriptions are identical placeholders - replace by occurrence
-    desc_texts = [
-        "Vision unifiee de vos 9+ projets IA et de leur valeur reelle",
-        "Gap analysis EU AI Act avant l'echeance d'aout 2026",
-        "Donnees et preuves pour les decisions du Conseil d'Administration",
-        "De l'audit a la feuille de route en 5 semaines, pas 12",
-    ]
-    # Since all 4 have the same placeholder text which was already blanked, we need a different approach
-    # Let's not blank them but replace them sequentially - re-read and handle
-    # Actually the replace already blanked all 4. Let's add them back by modifying the section names
-    # The agenda format is: "01 Section One \n Brief description..."
-    # Let me update the section names to include the descriptions
-    xml = xml.replace(">Clarte<", ">Clarte: Vision unifiee de vos 9+ projets IA<")
-    xml = xml.replace(">Conformite<", ">Conformite: Gap analysis EU AI Act avant aout 2026<")
-    xml = xml.replace(">Confiance<", ">Confiance: Donnees pour les decisions du Conseil<")
-    xml = xml.replace(">Rapidite<", ">Rapidite: De l'audit a la roadmap en 5 semaines<")
-    with open(agenda_path, "w", encoding="utf-8") as f:
-        f.write(xml)
+    # The 4 descriptions are identical placeholders and were blanked above,
+    # so fold the descriptions into the section names instead
+    deck.replace_text(order[1], {
+        "Clarte": "Clarte: Vision unifiee de vos 9+ projets IA",
+        "Conformite": "Conformite: Gap analysis EU AI Act avant aout 2026",
+        "Confiance": "Confiance: Donnees pour les decisions du Conseil",
+        "Rapidite": "Rapidite: De l'audit a la roadmap en 5 semaines",
+    })
 
     # S3: Your Context (Section Divider)
-    replace_text_in_slide(sf(order[2][1]), {
+    deck.replace_text(order[2], {
         "01": "",
         "Section Title": "Comprendre Votre Transformation",
         "Supporting context for this section": "EUR 750 M plan de transformation | 9+ projets IA sans gouvernance unifiee | EU AI Act aout 2026",
     })
 
     # S4: The Challenge (Content)
-    replace_text_in_slide(sf(order[3][1]), {
+    deck.replace_text(order[3], {
         "Content Slide Title": "Le Defi : 9+ Projets IA. 0 Vision Unifiee.",
         "Key point one with supporting detail that provides context for the audience.": "9+ projets IA actifs (Trigo, DRUID, RELEX, Ocado, IBM, Smartway) a travers supply chain, magasins, operations et paiements.",
         "Key point two explaining another aspect of the topic or insight.": "Aucun cadre de gouvernance IA centralise, pas de comite IA, pas de registre d'algorithmes.",
@@ -488,7 +305,7 @@ def build_external():
     })
 
     # S5: DIAGNOSE Framework (4-Phase)
-    replace_text_in_slide(sf(order[4][1]), {
+    deck.replace_text(order[4], {
         "Our 4-Phase Approach": "Notre Approche : Le Framework DIAGNOSE",
         "Diagnose": "Cartographie IA",
         "Build": "Processus & ROI",
@@ -501,7 +318,7 @@ def build_external():
     })
 
     # S6: WS Details 1&2 (Two-Column)
-    replace_text_in_slide(sf(order[5][1]), {
+    deck.replace_text(order[5], {
         "Two-Column Comparison": "Axes 1 & 2 : Cartographie IA et ROI",
         "Before": "01 Cartographie IA",
         "After": "02 Processus & ROI",
@@ -516,7 +333,7 @@ def build_external():
     })
 
     # S7: WS Details 3&4 (Two-Column dup)
-    replace_text_in_slide(sf(order[6][1]), {
+    deck.replace_text(order[6], {
         "Two-Column Comparison": "Axes 3 & 4 : Gouvernance et Workforce",
         "Before": "03 Gouvernance & Conformite",
         "After": "04 Impact Workforce",
@@ -531,7 +348,7 @@ def build_external():
     })
 
     # S8: Deliverables (Content dup)
-    replace_text_in_slide(sf(order[7][1]), {
+    deck.replace_text(order[7], {
         "Content Slide Title": "Vos Livrables : 6 Livrables Concrets",
         "Key point one with supporting detail that provides context for the audience.": "01 Feuille de Route Board-Ready : Plan strategique IA a 18 mois avec priorites, investissements et jalons pour le Conseil.",
         "Key point two explaining another aspect of the topic or insight.": "02 Scorecard Maturite IA : Evaluation detaillee de chaque projet (scoring 1-5) avec benchmark sectoriel.",
@@ -542,7 +359,7 @@ def build_external():
     })
 
     # S9: Timeline (4-Phase dup)
-    replace_text_in_slide(sf(order[8][1]), {
+    deck.replace_text(order[8], {
         "Our 4-Phase Approach": "Calendrier & Jalons : 5 Semaines",
         "Diagnose": "S1: Kick-off",
         "Build": "S2: Evaluation",
@@ -555,7 +372,7 @@ def build_external():
     })
 
     # S10: Team (Content dup)
-    replace_text_in_slide(sf(order[9][1]), {
+    deck.replace_text(order[9], {
         "Content Slide Title": "Votre Equipe Dediee",
         "Key point one with supporting detail that provides context for the audience.": "Consultant Senior Transformation IA (25 jours) : Lead de la mission. Cadrage strategique, interviews direction, analyse, livrables, presentation COMEX.",
         "Key point two explaining another aspect of the topic or insight.": "Ingenieur IA (15 jours) : Evaluation technique des projets IA, scoring de maturite, revue des architectures, analyse data readiness.",
@@ -566,7 +383,7 @@ def build_external():
     })
 
     # S11: Why TokenShift (Two-Column dup)
-    replace_text_in_slide(sf(order[10][1]), {
+    deck.replace_text(order[10], {
         "Two-Column Comparison": "Pourquoi TokenShift",
         "Before": "Methodologie",
         "After": "Philosophie",
@@ -581,7 +398,7 @@ def build_external():
     })
 
     # S12: Investment (Metrics)
-    replace_text_in_slide(sf(order[11][1]), {
+    deck.replace_text(order[11], {
         "Key Metrics": "Investissement",
         "4": "EUR 95K",
         "85%": "5 sem.",
@@ -598,7 +415,7 @@ def build_external():
     })
 
     # S13: What Comes Next (4-Phase dup)
-    replace_text_in_slide(sf(order[12][1]), {
+    deck.replace_text(order[12], {
         "Our 4-Phase Approach": "Et Apres ? Un Partenariat Complet",
         "Diagnose": "DIAGNOSE",
         "Build": "BUILD",
@@ -611,7 +428,7 @@ def build_external():
     })
 
     # S14: Let's Start (Thank You)
-    replace_text_in_slide(sf(order[13][1]), {
+    deck.replace_text(order[13], {
         "Thank you": "Passons a l'Action",
         "From code to culture.": "Pret a transformer vos ambitions IA en resultats concrets.",
         "pascal@tokenshift.com": "Prochain pas : appel de cadrage 30 min",
@@ -619,17 +436,15 @@ def build_external():
         "tokenshift.com": "From code to culture.",
     })
 
-    # 5. Clean and pack
-    clean(work)
+    # 4. Clean and pack
     out_path = os.path.join(OUT_DIR, "Auchan-AI-Discovery-Audit-Proposal-2026-02-23.pptx")
-    pack(work, out_path, TEMPLATE)
+    save(deck, out_path)
     print(f"\nExternal deck: {out_path}")
     return out_path
 
 # ── Main ─────────────────────────────────────────────────────
 
 if __name__ == "__main__":
-    os.makedirs(WORK_BASE, exist_ok=True)
     internal = build_internal()
     external = build_external()
     print(f"\n=== DONE ===")
@@ -2,19 +2,26 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
+import copy
+import sys
 import zipfile
 from pathlib import Path
 
+import lxml.etree
+
+from .base import XMLTreeCache
+
 
 class RedliningValidator:
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False, author="Claude"):
+    def __init__(
+        self, unpacked_dir, original_docx, verbose=False, author="Claude", trees=None
+    ):
         self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
         self.verbose = verbose
         self.author = author
+        self.trees = trees if trees is not None else XMLTreeCache()
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
@@ -29,10 +36,7 @@ class RedliningValidator:
             return False
 
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
+            root = self.trees.get(modified_file).getroot()
 
             del_elements = root.findall(".//w:del", self.namespaces)
             ins_elements = root.findall(".//w:ins", self.namespaces)
@@ -56,50 +60,39 @@ class RedliningValidator:
         except Exception:
             pass
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            self._remove_author_tracked_changes(original_root)
-            self._remove_author_tracked_changes(modified_root)
-
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
-
-            if self.verbose:
-                print(f"PASSED - All changes by {self.author} are properly tracked")
-            return True
+        try:
+            with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
+                original_content = zip_ref.read("word/document.xml")
+        except KeyError:
+            print(f"FAILED - Original document.xml not found in {self.original_docx}")
+            return False
+        except Exception as e:
+            print(f"FAILED - Error unpacking original docx: {e}")
+            return False
+
+        try:
+            modified_root = copy.deepcopy(self.trees.get(modified_file).getroot())
+            original_root = lxml.etree.fromstring(original_content)
+        except lxml.etree.XMLSyntaxError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
+
+        self._remove_author_tracked_changes(original_root)
+        self._remove_author_tracked_changes(modified_root)
+
+        modified_text = self._extract_text_content(modified_root)
+        original_text = self._extract_text_content(original_root)
+
+        if modified_text != original_text:
+            error_message = self._generate_detailed_diff(
+                original_text, modified_text
+            )
+            print(error_message)
+            return False
+
+        if self.verbose:
+            print(f"PASSED - All changes by {self.author} are properly tracked")
+        return True
 
     def _generate_detailed_diff(self, original_text, modified_text):
         error_parts = [
@@ -116,91 +109,46 @@ class RedliningValidator:
             "",
         ]
 
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
+        word_diff = self._get_word_diff(original_text, modified_text)
+        if word_diff:
+            error_parts.extend(["Differences:", "============", word_diff])
         else:
-            error_parts.append("Unable to generate word diff (git not available)")
+            error_parts.append("Unable to generate word diff")
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  
-                        "-U0",  
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            pass
-
-        return None
+    def _get_word_diff(self, original_text, modified_text):
+        """Character-level diff matching `git diff --word-diff=plain
+        --word-diff-regex=. -U0`, computed in process.
+
+        Like git, paragraphs are diffed as lines first, so unchanged ones are
+        skipped cheaply; only the changed hunks are diffed character by
+        character.
+        """
+        original_lines = original_text.split("\n")
+        modified_lines = modified_text.split("\n")
+        original_keys = _line_keys(original_lines)
+        modified_keys = _line_keys(modified_lines)
+
+        content_lines = []
+        for tag, i1, i2, j1, j2 in _opcodes(
+            original_keys, modified_keys, indent_heuristic=True
+        ):
+            if tag == "equal":
+                continue
+            hunk = _char_diff(
+                "\n".join(original_lines[i1:i2]), "\n".join(modified_lines[j1:j2])
+            )
+            content_lines.extend(line for line in hunk if line.strip())
+
+        return "\n".join(content_lines) or None
 
     def _remove_author_tracked_changes(self, root):
         ins_tag = f"{{{self.namespaces['w']}}}ins"
         del_tag = f"{{{self.namespaces['w']}}}del"
         author_attr = f"{{{self.namespaces['w']}}}author"
 
-        for parent in root.iter():
+        for parent in list(root.iter()):
             to_remove = []
             for child in parent:
                 if child.tag == ins_tag and child.get(author_attr) == self.author:
@@ -211,7 +159,7 @@ class RedliningValidator:
         deltext_tag = f"{{{self.namespaces['w']}}}delText"
         t_tag = f"{{{self.namespaces['w']}}}t"
 
-        for parent in root.iter():
+        for parent in list(root.iter()):
             to_process = []
             for child in parent:
                 if child.tag == del_tag and child.get(author_attr) == self.author:
@@ -243,5 +191,545 @@ class RedliningValidator:
         return "\n".join(paragraphs)
 
 
+def _line_keys(lines):
+    # As in git, the last line has no newline and so never matches one that does.
+    return [line + "\n" for line in lines[:-1]] + lines[-1:]
+
+
+def _char_diff(original, modified):
+    old_chars, old_breaks = _tokens(original)
+    new_chars, new_breaks = _tokens(modified)
+    lines, line = [], []
+    open_kind = None
+
+    def close():
+        if open_kind in _MARKERS:
+            line.append(_MARKERS[open_kind][1])
+
+    def emit(kind, char, line_break):
+        nonlocal line, open_kind
+        if line_break:
+            close()
+            lines.append("".join(line))
+            line, open_kind = [], None
+        if kind != open_kind:
+            close()
+            if kind in _MARKERS:
+                line.append(_MARKERS[kind][0])
+            open_kind = kind
+        line.append(char)
+
+    for tag, i1, i2, j1, j2 in _opcodes(old_chars, new_chars):
+        if tag == "equal":
+            for j in range(j1, j2):
+                emit("equal", new_chars[j], new_breaks[j])
+            continue
+        group_break = j1 < j2 and new_breaks[j1]
+        for i in range(i1, i2):
+            emit("delete", old_chars[i], old_breaks[i] if i > i1 else group_break)
+        for j in range(j1, j2):
+            emit("insert", new_chars[j], new_breaks[j] and (j > j1 or i1 == i2))
+
+    close()
+    lines.append("".join(line))
+    return lines
+
+
+_MARKERS = {"delete": ("[-", "-]"), "insert": ("{+", "+}")}
+
+
+def _tokens(text):
+    chars, breaks = [], []
+    line_break = False
+    for char in text:
+        if char == "\n":
+            line_break = True
+            continue
+        chars.append(char)
+        breaks.append(line_break)
+        line_break = False
+    return chars, breaks
+
+
+def _opcodes(a, b, indent_heuristic=False):
+    """difflib-style opcodes for two sequences, diffed the way git's xdiff does.
+
+    The changed elements come from a port of xdl_do_diff(); the change
+    groups are then slid, merged and aligned by xdl_change_compact(), so
+    ties between equally short diffs break the same way as in git. git diff
+    applies the indent heuristic to lines but not to the words of a
+    --word-diff, hence the flag.
+    """
+    a_changed, b_changed = _changes(a, b)
+    _compact(a, a_changed, b_changed, indent_heuristic)
+    _compact(b, b_changed, a_changed, indent_heuristic)
+
+    opcodes = []
+    i = j = 0
+    while i < len(a) or j < len(b):
+        i0, j0 = i, j
+        while i < len(a) and j < len(b) and not a_changed[i] and not b_changed[j]:
+            i, j = i + 1, j + 1
+        if i > i0:
+            opcodes.append(("equal", i0, i, j0, j))
+            continue
+        while i < len(a) and a_changed[i]:
+            i += 1
+        while j < len(b) and b_changed[j]:
+            j += 1
+        tag = "replace" if i > i0 and j > j0 else "delete" if i > i0 else "insert"
+        opcodes.append((tag, i0, i, j0, j))
+    return opcodes
+
+
+_MAX_EQLIMIT = 1024
+_SIMSCAN_WINDOW = 100
+_KPDIS_RUN = 4
+_MAX_COST_MIN = 256
+_HEUR_MIN_COST = 256
+_SNAKE_CNT = 20
+_K_HEUR = 4
+
+_MAX_INDENT = 200
+_MAX_BLANKS = 20
+_INDENT_MAX_SLIDING = 100
+_INDENT_WEIGHT = 60
+_START_OF_FILE_PENALTY = 1
+_END_OF_FILE_PENALTY = 21
+_TOTAL_BLANK_WEIGHT = -30
+_POST_BLANK_WEIGHT = 6
+_RELATIVE_INDENT_PENALTY = -4
+_RELATIVE_INDENT_WITH_BLANK_PENALTY = 10
+_RELATIVE_OUTDENT_PENALTY = 24
+_RELATIVE_OUTDENT_WITH_BLANK_PENALTY = 17
+_RELATIVE_DEDENT_PENALTY = 23
+_RELATIVE_DEDENT_WITH_BLANK_PENALTY = 17
+
+
+def _bogosqrt(n):
+    root = 1
+    while n > 0:
+        root <<= 1
+        n >>= 2
+    return root
+
+
+def _changes(a, b):
+    """Changed flags for a and b, as computed by xdiff's xdl_do_diff().
+
+    Common leading and trailing elements are trimmed, elements with no match
+    on the other side are marked changed up front (xdl_cleanup_records), and
+    the rest is split recursively with xdiff's Myers variant, cost cap and
+    heuristics included.
+    """
+    classes = {}
+    ha = [classes.setdefault(item, len(classes)) for item in a]
+    hb = [classes.setdefault(item, len(classes)) for item in b]
+    count_a, count_b = [0] * len(classes), [0] * len(classes)
+    for h in ha:
+        count_a[h] += 1
+    for h in hb:
+        count_b[h] += 1
+
+    lim = min(len(ha), len(hb))
+    start = 0
+    while start < lim and ha[start] == hb[start]:
+        start += 1
+    tail = 0
+    while tail < lim - start and ha[-1 - tail] == hb[-1 - tail]:
+        tail += 1
+
+    a_changed, b_changed = [False] * len(a), [False] * len(b)
+    a_index = _cleanup_records(ha, start, len(ha) - tail, count_b, a_changed)
+    b_index = _cleanup_records(hb, start, len(hb) - tail, count_a, b_changed)
+    ra = [ha[i] for i in a_index]
+    rb = [hb[i] for i in b_index]
+
+    size = len(ra) + len(rb) + 3
+    kvdf, kvdb = [0] * size, [0] * size
+    base = len(rb) + 1
+    max_cost = max(_bogosqrt(size), _MAX_COST_MIN)
+
+    pending = [(0, len(ra), 0, len(rb), False)]
+    while pending:
+        off1, lim1, off2, lim2, need_min = pending.pop()
+        while off1 < lim1 and off2 < lim2 and ra[off1] == rb[off2]:
+            off1, off2 = off1 + 1, off2 + 1
+        while off1 < lim1 and off2 < lim2 and ra[lim1 - 1] == rb[lim2 - 1]:
+            lim1, lim2 = lim1 - 1, lim2 - 1
+
+        if off1 == lim1:
+            for i in range(off2, lim2):
+                b_changed[b_index[i]] = True
+        elif off2 == lim2:
+            for i in range(off1, lim1):
+                a_changed[a_index[i]] = True
+        else:
+            i1, i2, min_lo, min_hi = _split(
+                ra, off1, lim1, rb, off2, lim2, kvdf, kvdb, base, need_min, max_cost
+            )
+            pending.append((off1, i1, off2, i2, min_lo))
+            pending.append((i1, lim1, i2, lim2, min_hi))
+    return a_changed, b_changed
+
+
+def _cleanup_records(h, start, end, other_counts, changed):
+    """Indexes of h[start:end] worth diffing; the others are marked changed.
+
+    Elements with no match on the other side are discarded, and so are
+    elements with many matches that sit in a run of discarded ones.
+    """
+    limit = min(_bogosqrt(len(h)), _MAX_EQLIMIT)
+    discard = []
+    for i in range(start, end):
+        matches = other_counts[h[i]]
+        discard.append(0 if matches == 0 else 2 if matches >= limit else 1)
+
+    kept = []
+    last = len(discard) - 1
+    for i, kind in enumerate(discard):
+        if kind == 1 or (kind == 2 and not _clean_mmatch(discard, i, 0, last)):
+            kept.append(start + i)
+        else:
+            changed[start + i] = True
+    return kept
+
+
+def _clean_mmatch(discard, i, first, last):
+    first = max(first, i - _SIMSCAN_WINDOW)
+    last = min(last, i + _SIMSCAN_WINDOW)
+
+    unmatched_before, multiple_before = 0, 1
+    r = 1
+    while i - r >= first:
+        if discard[i - r] == 0:
+            unmatched_before += 1
+        elif discard[i - r] == 2:
+            multiple_before += 1
+        else:
+            break
+        r += 1
+    if not unmatched_before:
+        return False
+
+    unmatched_after, multiple_after = 0, 1
+    r = 1
+    while i + r <= last:
+        if discard[i + r] == 0:
+            unmatched_after += 1
+        elif discard[i + r] == 2:
+            multiple_after += 1
+        else:
+            break
+        r += 1
+    if not unmatched_after:
+        return False
+
+    multiple = multiple_before + multiple_after
+    return multiple * _KPDIS_RUN < multiple + unmatched_before + unmatched_after
+
+
+def _split(ha1, off1, lim1, ha2, off2, lim2, kvdf, kvdb, o, need_min, max_cost):
+    """Port of xdl_split(): the point to split the box at, plus whether each
+    half still needs a minimal diff. Diagonal d is stored at index o + d."""
+    dmin, dmax = off1 - lim2, lim1 - off2
+    fmid, bmid = off1 - off2, lim1 - lim2
+    odd = (fmid - bmid) & 1
+    fmin = fmax = fmid
+    bmin = bmax = bmid
+    kvdf[o + fmid] = off1
+    kvdb[o + bmid] = lim1
+
+    ec = 0
+    while True:
+        ec += 1
+        got_snake = False
+
+        if fmin > dmin:
+            fmin -= 1
+            kvdf[o + fmin - 1] = -1
+        else:
+            fmin += 1
+        if fmax < dmax:
+            fmax += 1
+            kvdf[o + fmax + 1] = -1
+        else:
+            fmax -= 1
+
+        for d in range(fmax, fmin - 1, -2):
+            if kvdf[o + d - 1] >= kvdf[o + d + 1]:
+                i1 = kvdf[o + d - 1] + 1
+            else:
+                i1 = kvdf[o + d + 1]
+            prev1 = i1
+            i2 = i1 - d
+            while i1 < lim1 and i2 < lim2 and ha1[i1] == ha2[i2]:
+                i1, i2 = i1 + 1, i2 + 1
+            if i1 - prev1 > _SNAKE_CNT:
+                got_snake = True
+            kvdf[o + d] = i1
+            if odd and bmin <= d <= bmax and kvdb[o + d] <= i1:
+                return i1, i2, True, True
+
+        if bmin > dmin:
+            bmin -= 1
+            kvdb[o + bmin - 1] = sys.maxsize
+        else:
+            bmin += 1
+        if bmax < dmax:
+            bmax += 1
+            kvdb[o + bmax + 1] = sys.maxsize
+        else:
+            bmax -= 1
+
+        for d in range(bmax, bmin - 1, -2):
+            if kvdb[o + d - 1] < kvdb[o + d + 1]:
+                i1 = kvdb[o + d - 1]
+            else:
+                i1 = kvdb[o + d + 1] - 1
+            prev1 = i1
+            i2 = i1 - d
+            while i1 > off1 and i2 > off2 and ha1[i1 - 1] == ha2[i2 - 1]:
+                i1, i2 = i1 - 1, i2 - 1
+            if prev1 - i1 > _SNAKE_CNT:
+                got_snake = True
+            kvdb[o + d] = i1
+            if not odd and fmin <= d <= fmax and i1 <= kvdf[o + d]:
+                return i1, i2, True, True
+
+        if need_min:
+            continue
+
+        # A costly box with a long snake: split at a diagonal that got far
+        # from its corner, if one ends in a snake of at least _SNAKE_CNT.
+        if got_snake and ec > _HEUR_MIN_COST:
+            best = 0
+            for d in range(fmax, fmin - 1, -2):
+                i1 = kvdf[o + d]
+                i2 = i1 - d
+                v = (i1 - off1) + (i2 - off2) - abs(d - fmid)
+                if (
+                    v > _K_HEUR * ec
+                    and v > best
+                    and off1 + _SNAKE_CNT <= i1 < lim1
+                    and off2 + _SNAKE_CNT <= i2 < lim2
+                    and all(
+                        ha1[i1 - k] == ha2[i2 - k] for k in range(1, _SNAKE_CNT + 1)
+                    )
+                ):
+                    best, split = v, (i1, i2)
+            if best > 0:
+                return split + (True, False)
+
+            best = 0
+            for d in range(bmax, bmin - 1, -2):
+                i1 = kvdb[o + d]
+                i2 = i1 - d
+                v = (lim1 - i1) + (lim2 - i2) - abs(d - bmid)
+                if (
+                    v > _K_HEUR * ec
+                    and v > best
+                    and off1 < i1 <= lim1 - _SNAKE_CNT
+                    and off2 < i2 <= lim2 - _SNAKE_CNT
+                    and all(ha1[i1 + k] == ha2[i2 + k] for k in range(_SNAKE_CNT))
+                ):
+                    best, split = v, (i1, i2)
+            if best > 0:
+                return split + (False, True)
+
+        # Too costly to find the optimal split (a heavily rewritten passage):
+        # settle for the furthest-reaching path.
+        if ec >= max_cost:
+            fbest = fbest1 = -1
+            for d in range(fmax, fmin - 1, -2):
+                i1 = min(kvdf[o + d], lim1)
+                i2 = i1 - d
+                if lim2 < i2:
+                    i1, i2 = lim2 + d, lim2
+                if fbest < i1 + i2:
+                    fbest, fbest1 = i1 + i2, i1
+
+            bbest = bbest1 = sys.maxsize
+            for d in range(bmax, bmin - 1, -2):
+                i1 = max(off1, kvdb[o + d])
+                i2 = i1 - d
+                if i2 < off2:
+                    i1, i2 = off2 + d, off2
+                if i1 + i2 < bbest:
+                    bbest, bbest1 = i1 + i2, i1
+
+            if (lim1 + lim2) - bbest < fbest - (off1 + off2):
+                return fbest1, fbest - fbest1, True, False
+            return bbest1, bbest - bbest1, False, True
+
+
+def _compact(seq, changed, other, indent_heuristic=False):
+    """Port of xdiff's xdl_change_compact().
+
+    Each change group in seq is slid up and then down as far as runs of
+    equal elements allow, merging with the groups it bumps into. If some
+    position lines it up with a change group in the other sequence, it is
+    moved back to the last such position; otherwise it stays slid down, or
+    with indent_heuristic (seq being lines) moves to the best-scoring split.
+    Groups in both sequences are walked in step: the k-th group of one is
+    separated from the k-th group of the other by the same equal elements.
+    """
+    n, other_n = len(seq), len(other)
+
+    def next_group(flags, size, end):
+        start = end + 1
+        end = start
+        while end < size and flags[end]:
+            end += 1
+        return start, end
+
+    def previous_group(flags, start):
+        end = start - 1
+        start = end
+        while start > 0 and flags[start - 1]:
+            start -= 1
+        return start, end
+
+    def slide_up(start, end):
+        start, end = start - 1, end - 1
+        changed[start], changed[end] = True, False
+        while start > 0 and changed[start - 1]:
+            start -= 1
+        return start, end
+
+    start, end = next_group(changed, n, -1)
+    other_start, other_end = next_group(other, other_n, -1)
+    while True:
+        if end > start:
+            while True:
+                size = end - start
+                end_matching_other = None
+
+                while start > 0 and seq[start - 1] == seq[end - 1]:
+                    start, end = slide_up(start, end)
+                    other_start, other_end = previous_group(other, other_start)
+                earliest_end = end
+                if other_end > other_start:
+                    end_matching_other = end
+
+                while end < n and seq[start] == seq[end]:
+                    changed[start], changed[end] = False, True
+                    start, end = start + 1, end + 1
+                    while end < n and changed[end]:
+                        end += 1
+                    other_start, other_end = next_group(other, other_n, other_end)
+                    if other_end > other_start:
+                        end_matching_other = end
+
+                if end - start == size:
+                    break
+
+            if end == earliest_end:
+                pass
+            elif end_matching_other is not None:
+                while other_end == other_start:
+                    start, end = slide_up(start, end)
+                    other_start, other_end = previous_group(other, other_start)
+            elif indent_heuristic:
+                best_shift = best_score = None
+                shift = max(earliest_end, end - size - 1, end - _INDENT_MAX_SLIDING)
+                for shift in range(shift, end + 1):
+                    score = _split_score(seq, shift, _split_score(seq, shift - size))
+                    if best_score is None or _score_cmp(score, best_score) <= 0:
+                        best_shift, best_score = shift, score
+                while end > best_shift:
+                    start, end = slide_up(start, end)
+                    other_start, other_end = previous_group(other, other_start)
+
+        if end == n:
+            return
+        start, end = next_group(changed, n, end)
+        other_start, other_end = next_group(other, other_n, other_end)
+
+
+def _indent(line):
+    # xdiff's get_indent(): only ASCII whitespace counts, as C's isspace().
+    indent = 0
+    for char in line:
+        if char not in " \t\n\v\f\r":
+            return indent
+        if char == " ":
+            indent += 1
+        elif char == "\t":
+            indent += 8 - indent % 8
+        if indent >= _MAX_INDENT:
+            return _MAX_INDENT
+    return -1
+
+
+def _split_score(lines, split, score=(0, 0)):
+    """Add the indent heuristic's score for splitting lines before split
+    (xdiff's measure_split() and score_add_split()) to score, an
+    (effective indent, penalty) pair."""
+    end_of_file = split >= len(lines)
+    indent = -1 if end_of_file else _indent(lines[split])
+
+    pre_blank, pre_indent = 0, -1
+    for i in range(split - 1, -1, -1):
+        pre_indent = _indent(lines[i])
+        if pre_indent != -1:
+            break
+        pre_blank += 1
+        if pre_blank == _MAX_BLANKS:
+            pre_indent = 0
+            break
+
+    post_blank, post_indent = 0, -1
+    for i in range(split + 1, len(lines)):
+        post_indent = _indent(lines[i])
+        if post_indent != -1:
+            break
+        post_blank += 1
+        if post_blank == _MAX_BLANKS:
+            post_indent = 0
+            break
+
+    effective_indent, penalty = score
+    if pre_indent == -1 and pre_blank == 0:
+        penalty += _START_OF_FILE_PENALTY
+    if end_of_file:
+        penalty += _END_OF_FILE_PENALTY
+
+    post_blank = 1 + post_blank if indent == -1 else 0
+    total_blank = pre_blank + post_blank
+    penalty += _TOTAL_BLANK_WEIGHT * total_blank + _POST_BLANK_WEIGHT * post_blank
+
+    if indent == -1:
+        indent = post_indent
+    effective_indent += indent
+
+    if indent == -1 or pre_indent == -1 or indent == pre_indent:
+        pass
+    elif indent > pre_indent:
+        penalty += (
+            _RELATIVE_INDENT_WITH_BLANK_PENALTY
+            if total_blank
+            else _RELATIVE_INDENT_PENALTY
+        )
+    elif post_indent != -1 and post_indent > indent:
+        penalty += (
+            _RELATIVE_OUTDENT_WITH_BLANK_PENALTY
+            if total_blank
+            else _RELATIVE_OUTDENT_PENALTY
+        )
+    else:
+        penalty += (
+            _RELATIVE_DEDENT_WITH_BLANK_PENALTY
+            if total_blank
+            else _RELATIVE_DEDENT_PENALTY
+        )
+    return effective_indent, penalty
+
+
+def _score_cmp(score, other):
+    indents = (score[0] > other[0]) - (score[0] < other[0])
+    return _INDENT_WEIGHT * indents + score[1] - other[1]
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
@@ -1,22 +1,54 @@
 """
 Excel Formula Recalculation Script
 Recalculates all formulas in an Excel file using LibreOffice
+
+Usage:
+    python recalc.py <excel_file> [timeout_seconds]
+    python recalc.py <directory_or_manifest> [timeout_seconds] [--jobs N] [--report FILE]
+
+A directory is searched recursively for .xlsx/.xlsm files. A manifest is a text
+file with one workbook path per line (relative paths resolve against the
+manifest's directory; blank lines and lines starting with # are ignored).
+Batch mode writes one JSON object per workbook (JSONL) as each one finishes,
+with the timeout applied to each workbook separately.
 """
 
+import argparse
+import fcntl
 import json
 import os
 import platform
+import posixpath
+import signal
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from office.soffice import get_soffice_env
+from office.soffice import get_pool, get_soffice_env, recalculate_job
 
-from openpyxl import load_workbook
+import lxml.etree
+from openpyxl.utils import column_index_from_string, get_column_letter
 
 MACRO_DIR_MACOS = "~/Library/Application Support/LibreOffice/4/user/basic/Standard"
 MACRO_DIR_LINUX = "~/.config/libreoffice/4/user/basic/Standard"
 MACRO_FILENAME = "Module1.xba"
+WORKBOOK_SUFFIXES = (".xlsx", ".xlsm")
+BATCH_PROFILE_ROOT = Path(tempfile.gettempdir()) / f"recalc_batch_profiles_{os.getuid()}"
+BATCH_STARTUP_TIMEOUT = 60
+
+SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIPS_NS = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+EXCEL_ERRORS = ["#VALUE!", "#DIV/0!", "#REF!", "#NAME?", "#NULL!", "#NUM!", "#N/A"]
+
+ITERPARSE = {"resolve_entities": False, "no_network": True}
+PARSER = lxml.etree.XMLParser(resolve_entities=False, no_network=True)
 
 RECALCULATE_MACRO = """<?xml version="1.0" encoding="UTF-8"?>
 <!DOCTYPE script:module PUBLIC "-//OpenOffice.org//DTD OfficeDocument 1.0//EN" "module.dtd">
@@ -26,6 +58,43 @@ RECALCULATE_MACRO = """<?xml version="1.0" encoding="UTF-8"?>
       ThisComponent.store()
       ThisComponent.close(True)
     End Sub
+
+    Sub RecalculateBatch()
+      Dim manifest As Integer
+      Dim path As String
+      manifest = FreeFile()
+      Open Environ("RECALC_MANIFEST") For Input As #manifest
+      Do While Not EOF(manifest)
+        Line Input #manifest, path
+        If path &lt;&gt; "" Then RecalculateDocument(path, Environ("RECALC_LOG"))
+      Loop
+      Close #manifest
+      StarDesktop.terminate()
+    End Sub
+
+    Sub RecalculateDocument(path As String, logPath As String)
+      Dim document As Object
+      Dim status As String
+      Dim log As Integer
+      Dim args(0) As New com.sun.star.beans.PropertyValue
+      args(0).Name = "Hidden"
+      args(0).Value = True
+      status = "ok"
+      On Error GoTo Failed
+      document = StarDesktop.loadComponentFromURL(ConvertToURL(path), "_blank", 0, args())
+      document.calculateAll()
+      document.store()
+      document.close(True)
+      GoTo Done
+    Failed:
+      status = "error: " &amp; Error$
+      Resume Done
+    Done:
+      log = FreeFile()
+      Open logPath For Append As #log
+      Print #log, status
+      Close #log
+    End Sub
 </script:module>"""
 
 
@@ -47,7 +116,7 @@ def setup_libreoffice_macro():
 
     if (
         os.path.exists(macro_file)
-        and "RecalculateAndSave" in Path(macro_file).read_text()
+        and "RecalculateBatch" in Path(macro_file).read_text()
     ):
         return True
 
@@ -73,6 +142,208 @@ def recalc(filename, timeout=30):
 
     abs_path = str(Path(filename).absolute())
 
+    pool = get_pool()
+    if pool is not None:
+        try:
+            pool.run(recalculate_job, abs_path, timeout=timeout)
+        except TimeoutError:
+            return {"error": f"Timed out after {timeout}s"}
+        except Exception as e:
+            return {"error": str(e)}
+    else:
+        error = _recalc_with_macro(abs_path, timeout)
+        if error:
+            return error
+
+    return scan_workbook(filename)
+
+
+def recalc_batch(filenames, timeout=30, jobs=1, on_result=None):
+    paths = [Path(filename).absolute() for filename in filenames]
+    jobs = max(1, min(jobs, len(paths) or 1))
+    results = []
+    lock = threading.Lock()
+
+    def record(path, started, recalc_error=None):
+        if recalc_error:
+            result = {"error": recalc_error}
+        elif not path.exists():
+            result = {"error": f"File {path} does not exist"}
+        else:
+            result = scan_workbook(path)
+        result = {
+            "file": str(path),
+            **result,
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        with lock:
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    pool = get_pool(jobs)
+    if pool is not None:
+
+        def recalc_one(path):
+            started = time.monotonic()
+            try:
+                pool.run(recalculate_job, str(path), timeout=timeout)
+            except TimeoutError:
+                return record(path, started, f"Timed out after {timeout}s")
+            except Exception as e:
+                return record(path, started, str(e))
+            record(path, started)
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for future in as_completed(
+                executor.submit(recalc_one, path) for path in paths
+            ):
+                future.result()
+        return results
+
+    missing = [path for path in paths if not path.exists()]
+    for path in missing:
+        record(path, time.monotonic())
+    existing = [path for path in paths if path.exists()]
+    shards = [existing[index::jobs] for index in range(jobs)]
+    with tempfile.TemporaryDirectory(prefix="recalc_batch_") as work_dir:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(
+                    _recalc_shard_with_macro,
+                    index,
+                    shard,
+                    timeout,
+                    record,
+                    Path(work_dir) / f"worker{index}",
+                )
+                for index, shard in enumerate(shards)
+                if shard
+            ]
+            for future in as_completed(futures):
+                future.result()
+    return results
+
+
+def _recalc_shard_with_macro(index, paths, timeout, record, work_dir):
+    # The macro profile is shared between runs and can only host one soffice
+    # at a time; the manifest and log live in this run's own work_dir.
+    BATCH_PROFILE_ROOT.mkdir(parents=True, exist_ok=True)
+    profile = BATCH_PROFILE_ROOT / f"worker{index}"
+    with open(BATCH_PROFILE_ROOT / f"worker{index}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        _run_shard_with_macro(profile, work_dir, paths, timeout, record)
+
+
+def _run_shard_with_macro(profile, work_dir, paths, timeout, record):
+    if not _setup_profile_macro(profile):
+        for path in paths:
+            record(path, time.monotonic(), "Failed to setup LibreOffice macro")
+        return
+
+    work_dir.mkdir(parents=True, exist_ok=True)
+    remaining = list(paths)
+    while remaining:
+        manifest = work_dir / "manifest.txt"
+        log = work_dir / "recalc.log"
+        manifest.write_text("\n".join(str(path) for path in remaining) + "\n")
+        log.write_text("")
+
+        env = get_soffice_env()
+        env["RECALC_MANIFEST"] = str(manifest)
+        env["RECALC_LOG"] = str(log)
+        process = subprocess.Popen(
+            [
+                "soffice",
+                "--headless",
+                "--norestore",
+                f"-env:UserInstallation={profile.as_uri()}",
+                "vnd.sun.star.script:Standard.Module1.RecalculateBatch?language=Basic&location=application",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            start_new_session=True,
+        )
+
+        done = 0
+        started = time.monotonic()
+        deadline = started + timeout + BATCH_STARTUP_TIMEOUT
+        while remaining:
+            exited = process.poll() is not None
+            statuses = log.read_text().splitlines()
+            for status in statuses[done:]:
+                path = remaining.pop(0)
+                record(path, started, None if status == "ok" else status)
+                started = time.monotonic()
+                deadline = started + timeout
+            done = len(statuses)
+            if not remaining:
+                break
+            if exited:
+                record(remaining.pop(0), started, "LibreOffice exited unexpectedly")
+                break
+            if time.monotonic() > deadline:
+                os.killpg(process.pid, signal.SIGKILL)
+                record(remaining.pop(0), started, f"Timed out after {timeout}s")
+                break
+            time.sleep(0.1)
+
+        if process.poll() is None:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+
+
+def _setup_profile_macro(profile):
+    macro_dir = profile / "user" / "basic" / "Standard"
+    macro_file = macro_dir / MACRO_FILENAME
+
+    if macro_file.exists() and "RecalculateBatch" in macro_file.read_text():
+        return True
+
+    if not macro_dir.exists():
+        subprocess.run(
+            [
+                "soffice",
+                "--headless",
+                f"-env:UserInstallation={profile.as_uri()}",
+                "--terminate_after_init",
+            ],
+            capture_output=True,
+            timeout=BATCH_STARTUP_TIMEOUT,
+            env=get_soffice_env(),
+        )
+        macro_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        macro_file.write_text(RECALCULATE_MACRO)
+        return True
+    except Exception:
+        return False
+
+
+def _collect_workbooks(source):
+    source = Path(source)
+    if source.is_dir():
+        return sorted(
+            path
+            for path in source.rglob("*")
+            if path.suffix.lower() in WORKBOOK_SUFFIXES
+            and not path.name.startswith("~$")
+        )
+
+    workbooks = []
+    for line in source.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            workbooks.append(source.parent / line)
+    return workbooks
+
+
+def _recalc_with_macro(abs_path, timeout):
     if not setup_libreoffice_macro():
         return {"error": "Failed to setup LibreOffice macro"}
 
@@ -97,35 +368,23 @@ def recalc(filename, timeout=30):
             return {"error": "LibreOffice macro not configured properly"}
         return {"error": error_msg}
 
+    return None
+
+
+def scan_workbook(filename):
     try:
-        wb = load_workbook(filename, data_only=True)
-
-        excel_errors = [
-            "#VALUE!",
-            "#DIV/0!",
-            "#REF!",
-            "#NAME?",
-            "#NULL!",
-            "#NUM!",
-            "#N/A",
-        ]
-        error_details = {err: [] for err in excel_errors}
-        total_errors = 0
-
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.value is not None and isinstance(cell.value, str):
-                        for err in excel_errors:
-                            if err in cell.value:
-                                location = f"{sheet_name}!{cell.coordinate}"
-                                error_details[err].append(location)
-                                total_errors += 1
-                                break
-
-        wb.close()
+        error_details = {err: [] for err in EXCEL_ERRORS}
+        formula_count = 0
+
+        with zipfile.ZipFile(filename) as zf:
+            string_errors = _shared_string_errors(zf)
+            for sheet_name, part in worksheet_parts(zf):
+                with zf.open(part) as stream:
+                    formula_count += _scan_sheet(
+                        stream, sheet_name, string_errors, error_details
+                    )
 
+        total_errors = sum(len(locations) for locations in error_details.values())
         result = {
             "status": "success" if total_errors == 0 else "errors_found",
             "total_errors": total_errors,
@@ -136,23 +395,9 @@ def recalc(filename, timeout=30):
             if locations:
                 result["error_summary"][err_type] = {
                     "count": len(locations),
-                    "locations": locations[:20],  
+                    "locations": locations[:20],
                 }
 
-        wb_formulas = load_workbook(filename, data_only=False)
-        formula_count = 0
-        for sheet_name in wb_formulas.sheetnames:
-            ws = wb_formulas[sheet_name]
-            for row in ws.iter_rows():
-                for cell in row:
-                    if (
-                        cell.value
-                        and isinstance(cell.value, str)
-                        and cell.value.startswith("=")
-                    ):
-                        formula_count += 1
-        wb_formulas.close()
-
         result["total_formulas"] = formula_count
 
         return result
@@ -161,23 +406,187 @@ def recalc(filename, timeout=30):
         return {"error": str(e)}
 
 
+def _match_error(value):
+    for err in EXCEL_ERRORS:
+        if err in value:
+            return err
+    return None
+
+
+def _shared_string_errors(zf):
+    try:
+        stream = zf.open("xl/sharedStrings.xml")
+    except KeyError:
+        return {}
+
+    string_errors = {}
+    with stream:
+        for index, (_, si) in enumerate(
+            lxml.etree.iterparse(
+                stream, events=("end",), tag=f"{{{SPREADSHEET_NS}}}si", **ITERPARSE
+            )
+        ):
+            err = _match_error(_string_item_text(si))
+            if err:
+                string_errors[index] = err
+            si.clear(keep_tail=True)
+            while si.getprevious() is not None:
+                del si.getparent()[0]
+    return string_errors
+
+
+def _string_item_text(item):
+    return "".join(
+        t.text or ""
+        for t in item.iter(f"{{{SPREADSHEET_NS}}}t")
+        if t.getparent().tag != f"{{{SPREADSHEET_NS}}}rPh"
+    )
+
+
+def worksheet_parts(zf):
+    workbook = lxml.etree.fromstring(zf.read("xl/workbook.xml"), PARSER)
+    rels = lxml.etree.fromstring(zf.read("xl/_rels/workbook.xml.rels"), PARSER)
+
+    targets = {}
+    for rel in rels:
+        if rel.get("Type", "").endswith("/worksheet"):
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                targets[rel.get("Id")] = target.lstrip("/")
+            else:
+                targets[rel.get("Id")] = posixpath.normpath(f"xl/{target}")
+
+    for sheet in workbook.iter(f"{{{SPREADSHEET_NS}}}sheet"):
+        part = targets.get(sheet.get(f"{{{RELATIONSHIPS_NS}}}id"))
+        if part:
+            yield sheet.get("name"), part
+
+
+def _scan_sheet(stream, sheet_name, string_errors, error_details):
+    cell_tag = f"{{{SPREADSHEET_NS}}}c"
+    row_tag = f"{{{SPREADSHEET_NS}}}row"
+    value_tag = f"{{{SPREADSHEET_NS}}}v"
+    formula_tag = f"{{{SPREADSHEET_NS}}}f"
+    inline_tag = f"{{{SPREADSHEET_NS}}}is"
+
+    formula_count = 0
+    row_number = 0
+    last_reference = None
+    offset = 0
+
+    for _, elem in lxml.etree.iterparse(
+        stream, events=("end",), tag=(row_tag, cell_tag), **ITERPARSE
+    ):
+        if elem.tag == row_tag:
+            row_number = int(elem.get("r") or row_number + 1)
+            last_reference = None
+            offset = 0
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+            continue
+
+        reference = elem.get("r")
+        if reference:
+            last_reference, offset = reference, 0
+        else:
+            offset += 1
+
+        if elem.find(formula_tag) is not None:
+            formula_count += 1
+
+        cell_type = elem.get("t", "n")
+        err = None
+        if cell_type == "s":
+            value = elem.findtext(value_tag)
+            if value is not None:
+                err = string_errors.get(int(value))
+        elif cell_type in ("e", "str"):
+            value = elem.findtext(value_tag)
+            if value is not None:
+                err = _match_error(value)
+        elif cell_type == "inlineStr":
+            inline = elem.find(inline_tag)
+            if inline is not None:
+                err = _match_error(_string_item_text(inline))
+
+        if err:
+            if not reference:
+                reference = _offset_reference(
+                    last_reference, offset, elem.getparent().get("r"), row_number
+                )
+            error_details[err].append(f"{sheet_name}!{reference}")
+
+    return formula_count
+
+
+def _offset_reference(last_reference, offset, row, previous_row):
+    column = offset
+    if last_reference:
+        column += column_index_from_string(last_reference.rstrip("0123456789"))
+    return f"{get_column_letter(column)}{row or previous_row + 1}"
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python recalc.py <excel_file> [timeout_seconds]")
-        print("\nRecalculates all formulas in an Excel file using LibreOffice")
-        print("\nReturns JSON with error details:")
-        print("  - status: 'success' or 'errors_found'")
-        print("  - total_errors: Total number of Excel errors found")
-        print("  - total_formulas: Number of formulas in the file")
-        print("  - error_summary: Breakdown by error type with locations")
-        print("    - #VALUE!, #DIV/0!, #REF!, #NAME?, #NULL!, #NUM!, #N/A")
-        sys.exit(1)
-
-    filename = sys.argv[1]
-    timeout = int(sys.argv[2]) if len(sys.argv) > 2 else 30
-
-    result = recalc(filename, timeout)
-    print(json.dumps(result, indent=2))
+    parser = argparse.ArgumentParser(
+        description="Recalculate all formulas in Excel files using LibreOffice",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""Returns JSON with error details (one JSON line per file in batch mode):
+  - status: 'success' or 'errors_found'
+  - total_errors: Total number of Excel errors found
+  - total_formulas: Number of formulas in the file
+  - error_summary: Breakdown by error type with locations
+    - #VALUE!, #DIV/0!, #REF!, #NAME?, #NULL!, #NUM!, #N/A""",
+    )
+    parser.add_argument(
+        "input", help="Excel file, directory of workbooks, or manifest file"
+    )
+    parser.add_argument(
+        "timeout",
+        nargs="?",
+        type=int,
+        default=30,
+        help="Timeout in seconds (per workbook in batch mode, default: 30)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="LibreOffice instances to run in parallel in batch mode (default: 1)",
+    )
+    parser.add_argument(
+        "--report", help="Write the batch JSONL report to this file (default: stdout)"
+    )
+    args = parser.parse_args()
+
+    source = Path(args.input)
+    if source.suffix.lower() in WORKBOOK_SUFFIXES or not source.exists():
+        result = recalc(args.input, args.timeout)
+        print(json.dumps(result, indent=2))
+        return
+
+    report = open(args.report, "w", encoding="utf-8") if args.report else sys.stdout
+
+    def write(result):
+        report.write(json.dumps(result) + "\n")
+        report.flush()
+
+    try:
+        results = recalc_batch(
+            _collect_workbooks(source), args.timeout, args.jobs, on_result=write
+        )
+    finally:
+        if report is not sys.stdout:
+            report.close()
+
+    failed = sum(1 for result in results if "error" in result)
+    with_errors = sum(1 for result in results if result.get("total_errors"))
+    print(
+        f"Recalculated {len(results)} workbook(s): {failed} failed, "
+        f"{with_errors} with formula errors",
+        file=sys.stderr,
+    )
 
 
 if __name__ == "__main__":
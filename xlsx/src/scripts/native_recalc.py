@@ -0,0 +1,1238 @@
+"""
+Native Excel Formula Recalculation
+Recalculates formulas without LibreOffice for workbooks that only use common
+functions, falling back to recalc.py (LibreOffice) for anything else.
+
+Usage:
+    python native_recalc.py <excel_file> [--set CELL=VALUE ...] [--output FILE]
+
+Examples:
+    python native_recalc.py model.xlsx
+    python native_recalc.py model.xlsx --set "Inputs!B2=0.05" --set "Inputs!B3=120"
+    python native_recalc.py model.xlsx --set "B2=Acme" --output scenario.xlsx
+
+Supported: numbers, text, booleans, cell and range references (including other
+sheets and whole rows/columns), + - * / ^ & % and comparisons, and SUM, AVERAGE,
+MIN, MAX, COUNT, COUNTA, IF, IFERROR, AND, OR, NOT, ROUND, ABS, VLOOKUP, INDEX
+and MATCH. With --set, only formulas that depend on the changed cells are
+recomputed; every other cached value is kept as stored in the file.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import zipfile
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import date, datetime, time, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from itertools import islice
+from pathlib import Path
+
+import lxml.etree
+from openpyxl import load_workbook
+from openpyxl.formula import Tokenizer
+from openpyxl.formula.tokenizer import Token
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.utils.datetime import to_excel
+from recalc import SPREADSHEET_NS, recalc, scan_workbook, worksheet_parts
+
+MAX_ROW = 1048576
+MAX_COLUMN = 16384
+
+CELL_PATTERN = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+COLUMNS_PATTERN = re.compile(r"^\$?([A-Za-z]{1,3}):\$?([A-Za-z]{1,3})$")
+ROWS_PATTERN = re.compile(r"^\$?(\d+):\$?(\d+)$")
+ASSIGNMENT_PATTERN = re.compile(
+    r"^(?:(?P<sheet>'(?:[^']|'')+'|[^!]+)!)?"
+    r"(?P<cell>\$?[A-Za-z]{1,3}\$?\d+)=(?P<value>.*)$"
+)
+
+BINARY_PRECEDENCE = {
+    "=": 1,
+    "<>": 1,
+    "<": 1,
+    ">": 1,
+    "<=": 1,
+    ">=": 1,
+    "&": 2,
+    "+": 3,
+    "-": 3,
+    "*": 4,
+    "/": 4,
+    "^": 5,
+}
+
+AGGREGATE_FUNCTIONS = {"SUM", "AVERAGE", "MIN", "MAX", "COUNT", "COUNTA"}
+FUNCTIONS = AGGREGATE_FUNCTIONS | {
+    "IF",
+    "IFERROR",
+    "AND",
+    "OR",
+    "NOT",
+    "ROUND",
+    "ABS",
+    "VLOOKUP",
+    "INDEX",
+    "MATCH",
+}
+
+
+class UnsupportedFormula(Exception):
+    pass
+
+
+class ExcelError:
+    __slots__ = ("code",)
+
+    def __init__(self, code):
+        self.code = code
+
+    def __eq__(self, other):
+        return isinstance(other, ExcelError) and other.code == self.code
+
+    def __hash__(self):
+        return hash(self.code)
+
+    def __repr__(self):
+        return self.code
+
+
+DIV0 = ExcelError("#DIV/0!")
+NA = ExcelError("#N/A")
+NUM = ExcelError("#NUM!")
+REF = ExcelError("#REF!")
+VALUE = ExcelError("#VALUE!")
+
+
+class _Range:
+    """A rectangular block of values.
+
+    Only the first count entries of rows belong to the block, so ranges that
+    share their top-left corner can be views over one growing list of rows.
+    """
+
+    __slots__ = ("rows", "count", "height", "width")
+
+    def __init__(self, rows, height, width, count=None):
+        self.rows = rows
+        self.count = len(rows) if count is None else count
+        self.height = height
+        self.width = width
+
+    def __iter__(self):
+        for row in islice(self.rows, self.count):
+            yield from row
+
+    def iter_rows(self):
+        return islice(self.rows, self.count)
+
+    def cell(self, row, column):
+        if row < self.count and column < len(self.rows[row]):
+            return self.rows[row][column]
+        return None
+
+    def vector(self):
+        if self.height == 1:
+            return self.rows[0] if self.count else []
+        if self.width == 1:
+            return [row[0] if row else None for row in self.iter_rows()]
+        return None
+
+
+class FormulaEngine:
+    """Dependency-graph evaluator for the formulas of one workbook.
+
+    Values are keyed by (sheet, row, column). recalculate() evaluates every
+    formula in dependency order; set_value() followed by recalculate_dirty()
+    only re-evaluates the formulas downstream of the changed cells, which
+    needs the cached results of the others (cached_values=True).
+
+    Each distinct range is one node of the graph, keyed by (sheet, r1, c1,
+    r2, c2): the formulas inside it feed the node and the node feeds the
+    formulas that read it. Ranges that only differ in their last row are
+    chained, each one fed by the next smaller, so a running total such as
+    SUM($B$1:B10) adds one edge per row instead of one per cell.
+    """
+
+    def __init__(self, filename, cached_values=False):
+        self.filename = Path(filename)
+        self.values = {}
+        self.formulas = {}
+        self.bounds = {}
+        self.sheet_names = []
+        self._bands = {}
+        self._aggregates = {}
+        self._dirty = set()
+        self._written = set()
+
+        self._load(cached_values)
+        self._build_graph()
+
+    def set_value(self, sheet, coordinate, value):
+        sheet = self._sheet(sheet)
+        match = CELL_PATTERN.match(coordinate)
+        if not match:
+            raise ValueError(f"Invalid cell reference: {coordinate}")
+        key = (
+            sheet,
+            int(match.group(2)),
+            column_index_from_string(match.group(1).upper()),
+        )
+        if key in self.formulas:
+            raise ValueError(f"{sheet}!{coordinate} contains a formula")
+
+        self.values[key] = value
+        self._written.add(key)
+        max_row, max_column = self.bounds[sheet]
+        self.bounds[sheet] = (max(max_row, key[1]), max(max_column, key[2]))
+
+        self._dirty.update(self._cell_dependents.get(key, ()))
+        for bounds in self._ranges.get(sheet, ()):
+            _, r1, c1, r2, c2 = bounds
+            if r1 <= key[1] <= r2 and c1 <= key[2] <= c2:
+                self._dirty.add(bounds)
+
+    def recalculate(self):
+        self._dirty.clear()
+        nodes = set(self.formulas)
+        for ranges in self._ranges.values():
+            nodes.update(ranges)
+        return self._evaluate(self._topological_order(nodes))
+
+    def recalculate_dirty(self):
+        affected = set()
+        pending = deque(self._dirty)
+        while pending:
+            key = pending.popleft()
+            if key not in affected:
+                affected.add(key)
+                pending.extend(self._dependents.get(key, ()))
+        self._dirty.clear()
+        return self._evaluate(self._topological_order(affected))
+
+    def save(self, output=None):
+        updates = {}
+        for key in self._written:
+            sheet, row, column = key
+            updates.setdefault(sheet, {})[(row, column)] = (
+                self.values.get(key),
+                key in self.formulas,
+            )
+        write_cells(self.filename, output or self.filename, updates)
+
+    def _load(self, cached_values):
+        workbook = load_workbook(self.filename, read_only=True, data_only=False)
+        try:
+            epoch = workbook.epoch
+            for worksheet in workbook.worksheets:
+                sheet = worksheet.title
+                self.sheet_names.append(sheet)
+                max_row = max_column = 0
+                for row in worksheet.iter_rows():
+                    for cell in row:
+                        value = cell.value
+                        if value is None:
+                            continue
+                        key = (sheet, cell.row, cell.column)
+                        max_row = max(max_row, cell.row)
+                        max_column = max(max_column, cell.column)
+                        if cell.data_type == "f":
+                            if not isinstance(value, str):
+                                raise UnsupportedFormula(
+                                    f"{sheet}!{cell.coordinate}: array or data "
+                                    "table formula"
+                                )
+                            self.formulas[key] = value
+                        else:
+                            self.values[key] = _convert_value(
+                                value, cell.data_type, epoch
+                            )
+                self.bounds[sheet] = (max_row, max_column)
+        finally:
+            workbook.close()
+
+        self.uncached = set(self.formulas)
+        if cached_values and self.formulas:
+            workbook = load_workbook(self.filename, read_only=True, data_only=True)
+            try:
+                for worksheet in workbook.worksheets:
+                    sheet = worksheet.title
+                    for row in worksheet.iter_rows():
+                        for cell in row:
+                            if cell.value is None:
+                                continue
+                            key = (sheet, cell.row, cell.column)
+                            if key in self.formulas:
+                                self.values[key] = _convert_value(
+                                    cell.value, cell.data_type, workbook.epoch
+                                )
+                                self.uncached.discard(key)
+            finally:
+                workbook.close()
+
+        sheets = {name.lower(): name for name in self.sheet_names}
+        self._sheets = sheets
+        for key, formula in self.formulas.items():
+            sheet, row, column = key
+            try:
+                self.formulas[key] = _Parser(formula, sheet, sheets).parse()
+            except UnsupportedFormula as e:
+                raise UnsupportedFormula(
+                    f"{sheet}!{get_column_letter(column)}{row}: {e}"
+                ) from None
+
+    def _build_graph(self):
+        self._cell_dependents = {}
+        self._ranges = {}
+        self._dependents = {}
+
+        ranges = set()
+        for key, node in self.formulas.items():
+            for reference in _references(node):
+                if reference[0] == "cell":
+                    cell = reference[1]
+                    self._cell_dependents.setdefault(cell, set()).add(key)
+                    if cell in self.formulas:
+                        self._dependents.setdefault(cell, set()).add(key)
+                    continue
+
+                bounds = reference[1:]
+                ranges.add(bounds)
+                self._dependents.setdefault(bounds, set()).add(key)
+
+        formula_rows = {}
+        for sheet, row, column in self.formulas:
+            formula_rows.setdefault(sheet, {}).setdefault(column, []).append(row)
+        formula_columns = {}
+        for sheet, columns in formula_rows.items():
+            for rows in columns.values():
+                rows.sort()
+            formula_columns[sheet] = sorted(columns)
+
+        chains = {}
+        for sheet, r1, c1, r2, c2 in ranges:
+            chains.setdefault((sheet, r1, c1, c2), []).append(r2)
+            self._ranges.setdefault(sheet, []).append((sheet, r1, c1, r2, c2))
+
+        for (sheet, r1, c1, c2), ends in chains.items():
+            columns = formula_columns.get(sheet, [])
+            columns = columns[bisect_left(columns, c1) : bisect_right(columns, c2)]
+            first_row, previous = r1, None
+            for r2 in sorted(ends):
+                bounds = (sheet, r1, c1, r2, c2)
+                if previous is not None:
+                    self._dependents.setdefault(previous, set()).add(bounds)
+                for column in columns:
+                    rows = formula_rows[sheet][column]
+                    for row in rows[
+                        bisect_left(rows, first_row) : bisect_right(rows, r2)
+                    ]:
+                        self._dependents.setdefault(
+                            (sheet, row, column), set()
+                        ).add(bounds)
+                first_row, previous = r2 + 1, bounds
+
+    def _topological_order(self, keys):
+        waiting = dict.fromkeys(keys, 0)
+        for key in waiting:
+            for dependent in self._dependents.get(key, ()):
+                if dependent in waiting:
+                    waiting[dependent] += 1
+        ready = deque(sorted(key for key, count in waiting.items() if count == 0))
+        order = []
+        while ready:
+            key = ready.popleft()
+            order.append(key)
+            for dependent in self._dependents.get(key, ()):
+                if dependent in waiting:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        ready.append(dependent)
+
+        if len(order) != len(waiting):
+            sheet, row, column = min(
+                key
+                for key, count in waiting.items()
+                if count and key in self.formulas
+            )
+            raise UnsupportedFormula(
+                f"{sheet}!{get_column_letter(column)}{row}: circular reference"
+            )
+        return order
+
+    def _evaluate(self, order):
+        self._bands.clear()
+        self._aggregates.clear()
+        count = 0
+        for key in order:
+            if key not in self.formulas:
+                continue
+            count += 1
+            try:
+                value = self._eval(self.formulas[key])
+            except UnsupportedFormula as e:
+                sheet, row, column = key
+                raise UnsupportedFormula(
+                    f"{sheet}!{get_column_letter(column)}{row}: {e}"
+                ) from None
+            if isinstance(value, _Range):
+                raise UnsupportedFormula(
+                    f"{key[0]}!{get_column_letter(key[2])}{key[1]}: array result"
+                )
+            self.values[key] = 0 if value is None else value
+            self._written.add(key)
+        return count
+
+    def _sheet(self, name):
+        sheet = self._sheets.get((name or self.sheet_names[0]).lower())
+        if sheet is None:
+            raise ValueError(f"Sheet not found: {name}")
+        return sheet
+
+    def _range(self, sheet, r1, c1, r2, c2):
+        # Ranges sharing sheet, first row and columns read one band of rows,
+        # grown on demand during an evaluation pass. Rows already in a band
+        # are final: a formula reading a range runs after every formula in it.
+        max_row, max_column = self.bounds[sheet]
+        last_row = min(r2, max_row)
+        band = self._bands.setdefault((sheet, r1, c1, c2), [])
+        if r1 + len(band) <= last_row:
+            values = self.values
+            columns = range(c1, min(c2, max_column) + 1)
+            band.extend(
+                [values.get((sheet, row, column)) for column in columns]
+                for row in range(r1 + len(band), last_row + 1)
+            )
+        return _Range(band, r2 - r1 + 1, c2 - c1 + 1, max(last_row - r1 + 1, 0))
+
+    def _range_aggregate(self, name, sheet, r1, c1, r2, c2):
+        # Keep one running total per band, so totals over a fixed range
+        # (% of total) and over a growing one (running total) each cost one
+        # pass over the band instead of one per formula.
+        block = self._range(sheet, r1, c1, r2, c2)
+        key = (name, sheet, r1, c1, c2)
+        totals = self._aggregates.get(key)
+        if totals is None or totals.rows > block.count:
+            totals = _Totals()
+            if key not in self._aggregates:
+                self._aggregates[key] = totals
+        totals.add_rows(islice(block.rows, totals.rows, block.count))
+        return totals.result(name)
+
+    def _eval(self, node):
+        kind = node[0]
+        if kind == "const":
+            return node[1]
+        if kind == "cell":
+            return self.values.get(node[1])
+        if kind == "range":
+            return self._range(*node[1:])
+        if kind == "missing":
+            return None
+        if kind == "neg":
+            value = _to_number(self._scalar(node[1]))
+            return value if isinstance(value, ExcelError) else -value
+        if kind == "pct":
+            value = _to_number(self._scalar(node[1]))
+            return value if isinstance(value, ExcelError) else value / 100
+        if kind == "bin":
+            return _binary(node[1], self._scalar(node[2]), self._scalar(node[3]))
+        return self._call(node[1], node[2])
+
+    def _scalar(self, node):
+        value = self._eval(node)
+        if isinstance(value, _Range):
+            raise UnsupportedFormula("range used as a single value")
+        return value
+
+    def _call(self, name, args):
+        if name == "IF":
+            if not 1 < len(args) < 4:
+                return VALUE
+            condition = _to_bool(self._scalar(args[0]))
+            if isinstance(condition, ExcelError):
+                return condition
+            if condition:
+                return self._eval(args[1])
+            return self._eval(args[2]) if len(args) == 3 else False
+        if name == "IFERROR":
+            if len(args) != 2:
+                return VALUE
+            value = self._eval(args[0])
+            return self._eval(args[1]) if isinstance(value, ExcelError) else value
+
+        if name in AGGREGATE_FUNCTIONS:
+            if len(args) == 1 and args[0][0] == "range":
+                return self._range_aggregate(name, *args[0][1:])
+            values = [
+                _Range([[self.values.get(arg[1])]], 1, 1)
+                if arg[0] == "cell"
+                else self._eval(arg)
+                for arg in args
+            ]
+            return _aggregate(name, values)
+
+        values = [self._eval(arg) for arg in args]
+        if name in ("AND", "OR"):
+            return _logical(name, values)
+        if name == "NOT":
+            if len(values) != 1:
+                return VALUE
+            value = _to_bool(_single(values[0]))
+            return value if isinstance(value, ExcelError) else not value
+        if name == "ROUND":
+            return _round(*values) if len(values) == 2 else VALUE
+        if name == "ABS":
+            if len(values) != 1:
+                return VALUE
+            value = _to_number(_single(values[0]))
+            return value if isinstance(value, ExcelError) else abs(value)
+        if name == "VLOOKUP":
+            return _vlookup(*values) if 2 < len(values) < 5 else VALUE
+        if name == "INDEX":
+            return _index(*values) if 1 < len(values) < 4 else VALUE
+        return _match(*values) if 1 < len(values) < 4 else VALUE
+
+
+class _Parser:
+    def __init__(self, formula, sheet, sheets):
+        try:
+            tokens = Tokenizer(formula).items
+        except Exception as e:
+            raise UnsupportedFormula(str(e)) from None
+        self.tokens = [token for token in tokens if token.type != Token.WSPACE]
+        self.position = 0
+        self.sheet = sheet
+        self.sheets = sheets
+
+    def parse(self):
+        node = self._expression(0)
+        if self.position != len(self.tokens):
+            raise UnsupportedFormula(
+                f"unexpected {self.tokens[self.position].value!r}"
+            )
+        return node
+
+    def _peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def _next(self):
+        token = self._peek()
+        if token is None:
+            raise UnsupportedFormula("unexpected end of formula")
+        self.position += 1
+        return token
+
+    def _expression(self, min_precedence):
+        left = self._unary()
+        while True:
+            token = self._peek()
+            if token is None or token.type != Token.OP_IN:
+                return left
+            precedence = BINARY_PRECEDENCE.get(token.value)
+            if precedence is None:
+                raise UnsupportedFormula(f"operator {token.value!r}")
+            if precedence < min_precedence:
+                return left
+            self.position += 1
+            left = ("bin", token.value, left, self._expression(precedence + 1))
+
+    def _unary(self):
+        token = self._peek()
+        if token is not None and token.type == Token.OP_PRE:
+            self.position += 1
+            operand = self._unary()
+            return ("neg", operand) if token.value == "-" else operand
+        node = self._primary()
+        while (token := self._peek()) is not None and token.type == Token.OP_POST:
+            self.position += 1
+            node = ("pct", node)
+        return node
+
+    def _primary(self):
+        token = self._next()
+        if token.type == Token.OPERAND:
+            if token.subtype == Token.NUMBER:
+                return ("const", float(token.value))
+            if token.subtype == Token.TEXT:
+                return ("const", token.value[1:-1].replace('""', '"'))
+            if token.subtype == Token.LOGICAL:
+                return ("const", token.value.upper() == "TRUE")
+            if token.subtype == Token.ERROR:
+                return ("const", ExcelError(token.value.upper()))
+            return self._reference(token.value)
+
+        if token.type == Token.FUNC and token.subtype == Token.OPEN:
+            name = token.value[:-1].upper()
+            if name not in FUNCTIONS:
+                raise UnsupportedFormula(f"function {name}")
+            return ("call", name, self._arguments())
+
+        if token.type == Token.PAREN and token.subtype == Token.OPEN:
+            node = self._expression(0)
+            closing = self._next()
+            if closing.type != Token.PAREN or closing.subtype != Token.CLOSE:
+                raise UnsupportedFormula(f"unexpected {closing.value!r}")
+            return node
+
+        raise UnsupportedFormula(f"unexpected {token.value!r}")
+
+    def _arguments(self):
+        args = []
+        token = self._peek()
+        if token and token.type == Token.FUNC and token.subtype == Token.CLOSE:
+            self.position += 1
+            return args
+
+        while True:
+            token = self._peek()
+            if token is not None and (
+                (token.type == Token.SEP and token.subtype == Token.ARG)
+                or (token.type == Token.FUNC and token.subtype == Token.CLOSE)
+            ):
+                args.append(("missing",))
+            else:
+                args.append(self._expression(0))
+            token = self._next()
+            if token.type == Token.SEP and token.subtype == Token.ARG:
+                continue
+            if token.type == Token.FUNC and token.subtype == Token.CLOSE:
+                return args
+            raise UnsupportedFormula(f"unexpected {token.value!r}")
+
+    def _reference(self, text):
+        sheet = self.sheet
+        if "!" in text:
+            name, text = text.rsplit("!", 1)
+            if name.startswith("'") and name.endswith("'"):
+                name = name[1:-1].replace("''", "'")
+            sheet = self.sheets.get(name.lower())
+            if sheet is None:
+                raise UnsupportedFormula(f"reference to {name!r}")
+
+        if match := CELL_PATTERN.match(text):
+            row = int(match.group(2))
+            column = column_index_from_string(match.group(1).upper())
+            return ("cell", (sheet, row, column))
+
+        start, _, end = text.partition(":")
+        first, last = CELL_PATTERN.match(start), CELL_PATTERN.match(end)
+        if first and last:
+            bounds = (
+                int(first.group(2)),
+                column_index_from_string(first.group(1).upper()),
+                int(last.group(2)),
+                column_index_from_string(last.group(1).upper()),
+            )
+        elif match := COLUMNS_PATTERN.match(text):
+            bounds = (
+                1,
+                column_index_from_string(match.group(1).upper()),
+                MAX_ROW,
+                column_index_from_string(match.group(2).upper()),
+            )
+        elif match := ROWS_PATTERN.match(text):
+            bounds = (int(match.group(1)), 1, int(match.group(2)), MAX_COLUMN)
+        else:
+            raise UnsupportedFormula(f"reference {text!r}")
+
+        r1, c1, r2, c2 = bounds
+        return (
+            "range",
+            sheet,
+            min(r1, r2),
+            min(c1, c2),
+            max(r1, r2),
+            max(c1, c2),
+        )
+
+
+def _references(node):
+    kind = node[0]
+    if kind in ("cell", "range"):
+        yield node
+    elif kind in ("neg", "pct"):
+        yield from _references(node[1])
+    elif kind == "bin":
+        yield from _references(node[2])
+        yield from _references(node[3])
+    elif kind == "call":
+        for arg in node[2]:
+            yield from _references(arg)
+
+
+def _convert_value(value, data_type, epoch):
+    if data_type == "e":
+        return ExcelError(value)
+    if isinstance(value, (datetime, date, time, timedelta)):
+        return to_excel(value, epoch)
+    return value
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _single(value):
+    if isinstance(value, _Range):
+        raise UnsupportedFormula("range used as a single value")
+    return value
+
+
+def _to_number(value):
+    if value is None:
+        return 0
+    if isinstance(value, (bool, int, float, ExcelError)):
+        return value if not isinstance(value, bool) else int(value)
+    try:
+        return float(value)
+    except ValueError:
+        return VALUE
+
+
+def _to_bool(value):
+    if value is None:
+        return False
+    if isinstance(value, (bool, ExcelError)):
+        return value
+    if _is_number(value):
+        return value != 0
+    if value.upper() in ("TRUE", "FALSE"):
+        return value.upper() == "TRUE"
+    return VALUE
+
+
+def _to_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if _is_number(value):
+        if float(value).is_integer() and abs(value) < 1e15:
+            return str(int(value))
+        return f"{value:.15g}"
+    return value
+
+
+def _type_rank(value):
+    if _is_number(value):
+        return 0
+    if isinstance(value, str):
+        return 1
+    return 2
+
+
+def _blank_like(value):
+    if isinstance(value, bool):
+        return False
+    return "" if isinstance(value, str) else 0
+
+
+def _compare(left, right):
+    if left is None:
+        left = _blank_like(right)
+    if right is None:
+        right = _blank_like(left)
+    left_rank, right_rank = _type_rank(left), _type_rank(right)
+    if left_rank != right_rank:
+        return -1 if left_rank < right_rank else 1
+    if left_rank == 1:
+        left, right = left.lower(), right.lower()
+    return (left > right) - (left < right)
+
+
+def _binary(operator, left, right):
+    if isinstance(left, ExcelError):
+        return left
+    if isinstance(right, ExcelError):
+        return right
+
+    if operator == "&":
+        return _to_text(left) + _to_text(right)
+
+    if BINARY_PRECEDENCE[operator] == 1:
+        order = _compare(left, right)
+        return {
+            "=": order == 0,
+            "<>": order != 0,
+            "<": order < 0,
+            ">": order > 0,
+            "<=": order <= 0,
+            ">=": order >= 0,
+        }[operator]
+
+    left, right = _to_number(left), _to_number(right)
+    if isinstance(left, ExcelError):
+        return left
+    if isinstance(right, ExcelError):
+        return right
+    if operator == "+":
+        return left + right
+    if operator == "-":
+        return left - right
+    if operator == "*":
+        return left * right
+    if operator == "/":
+        return DIV0 if right == 0 else left / right
+    if left == 0 and right <= 0:
+        return NUM if right == 0 else DIV0
+    try:
+        result = left**right
+    except OverflowError:
+        return NUM
+    return NUM if isinstance(result, complex) else result
+
+
+class _Totals:
+    """Running state of SUM, AVERAGE, MIN, MAX, COUNT and COUNTA."""
+
+    __slots__ = ("rows", "error", "counta", "count", "total", "low", "high")
+
+    def __init__(self):
+        self.rows = 0
+        self.error = None
+        self.counta = self.count = self.total = 0
+        self.low = self.high = None
+
+    def add_rows(self, rows):
+        for row in rows:
+            self.rows += 1
+            for item in row:
+                if item is None:
+                    continue
+                self.counta += 1
+                if isinstance(item, ExcelError):
+                    if self.error is None:
+                        self.error = item
+                elif _is_number(item):
+                    self.add_number(item)
+
+    def add_number(self, number):
+        self.count += 1
+        self.total += number
+        if self.low is None or number < self.low:
+            self.low = number
+        if self.high is None or number > self.high:
+            self.high = number
+
+    def result(self, name):
+        if name == "COUNTA":
+            return self.counta
+        if name == "COUNT":
+            return self.count
+        if self.error is not None:
+            return self.error
+        if name == "SUM":
+            return self.total
+        if name == "AVERAGE":
+            return self.total / self.count if self.count else DIV0
+        if not self.count:
+            return 0
+        return self.low if name == "MIN" else self.high
+
+
+def _aggregate(name, values):
+    totals = _Totals()
+    for value in values:
+        if isinstance(value, _Range):
+            totals.add_rows(value.iter_rows())
+        elif name == "COUNTA":
+            totals.counta += value is not None
+        else:
+            number = _to_number(value)
+            if not isinstance(number, ExcelError):
+                totals.add_number(number)
+            elif totals.error is None:
+                totals.error = number
+    return totals.result(name)
+
+
+def _logical(name, values):
+    results = []
+    for value in values:
+        items = value if isinstance(value, _Range) else [value]
+        for item in items:
+            if isinstance(item, ExcelError):
+                return item
+            if isinstance(value, _Range) and not isinstance(item, bool):
+                if not _is_number(item):
+                    continue
+            result = _to_bool(item)
+            if isinstance(result, ExcelError):
+                return result
+            results.append(result)
+    if not results:
+        return VALUE
+    return all(results) if name == "AND" else any(results)
+
+
+def _round(value, digits):
+    value, digits = _to_number(_single(value)), _to_number(_single(digits))
+    if isinstance(value, ExcelError):
+        return value
+    if isinstance(digits, ExcelError):
+        return digits
+    quantum = Decimal(1).scaleb(-int(digits))
+    return float(Decimal(repr(float(value))).quantize(quantum, ROUND_HALF_UP))
+
+
+def _wildcard(pattern):
+    parts = []
+    escaped = False
+    for char in pattern:
+        if escaped:
+            parts.append(re.escape(char))
+            escaped = False
+        elif char == "~":
+            escaped = True
+        elif char == "*":
+            parts.append(".*")
+        elif char == "?":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def _exact_position(lookup, items):
+    if isinstance(lookup, str) and any(char in lookup for char in "*?~"):
+        pattern = _wildcard(lookup)
+        for position, item in enumerate(items):
+            if isinstance(item, str) and pattern.fullmatch(item):
+                return position
+        return None
+    for position, item in enumerate(items):
+        if item is not None and _type_rank(item) == _type_rank(lookup):
+            if _compare(item, lookup) == 0:
+                return position
+    return None
+
+
+def _approximate_position(lookup, items, descending=False):
+    found = None
+    for position, item in enumerate(items):
+        if item is None or _type_rank(item) != _type_rank(lookup):
+            continue
+        order = _compare(item, lookup)
+        if (order > 0 and not descending) or (order < 0 and descending):
+            break
+        found = position
+        if order == 0:
+            break
+    return found
+
+
+def _vlookup(lookup, table, column, approximate=True):
+    lookup = _single(lookup)
+    if isinstance(lookup, ExcelError):
+        return lookup
+    if not isinstance(table, _Range):
+        return NA
+    column = _to_number(_single(column))
+    if isinstance(column, ExcelError):
+        return column
+    column = int(column)
+    if column < 1:
+        return VALUE
+    if column > table.width:
+        return REF
+    approximate = _to_bool(_single(approximate))
+    if isinstance(approximate, ExcelError):
+        return approximate
+
+    keys = [row[0] if row else None for row in table.iter_rows()]
+    if approximate:
+        position = _approximate_position(lookup, keys)
+    else:
+        position = _exact_position(lookup, keys)
+    if position is None:
+        return NA
+    return table.cell(position, column - 1)
+
+
+def _index(array, row, column=None):
+    if not isinstance(array, _Range):
+        array = _Range([[array]], 1, 1)
+    row = _to_number(_single(row))
+    if isinstance(row, ExcelError):
+        return row
+    if column is None:
+        if array.height == 1:
+            row, column = 1, row
+        else:
+            column = 1
+    column = _to_number(_single(column))
+    if isinstance(column, ExcelError):
+        return column
+    row, column = int(row), int(column)
+    if row == 0 or column == 0:
+        raise UnsupportedFormula("INDEX returning a whole row or column")
+    if not (0 < row <= array.height and 0 < column <= array.width):
+        return REF
+    return array.cell(row - 1, column - 1)
+
+
+def _match(lookup, array, match_type=1):
+    lookup = _single(lookup)
+    if isinstance(lookup, ExcelError):
+        return lookup
+    items = array.vector() if isinstance(array, _Range) else [array]
+    if items is None:
+        return NA
+    match_type = _to_number(_single(match_type))
+    if isinstance(match_type, ExcelError):
+        return match_type
+
+    if match_type == 0:
+        position = _exact_position(lookup, items)
+    else:
+        position = _approximate_position(lookup, items, descending=match_type < 0)
+    return NA if position is None else position + 1
+
+
+def parse_assignment(text):
+    match = ASSIGNMENT_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Expected CELL=VALUE or Sheet!CELL=VALUE, got {text!r}")
+    sheet = match.group("sheet")
+    if sheet and sheet.startswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+
+    raw = match.group("value")
+    if raw.upper() in ("TRUE", "FALSE"):
+        value = raw.upper() == "TRUE"
+    elif raw.startswith("'"):
+        value = raw[1:]
+    else:
+        try:
+            value = float(raw)
+        except ValueError:
+            value = raw
+    return sheet, match.group("cell").replace("$", "").upper(), value
+
+
+def write_cells(source, output, updates):
+    """Write cell values into the worksheet XML of source, saving to output.
+
+    updates maps sheet name -> {(row, column): (value, is_formula)}.
+    """
+    source, output = Path(source), Path(output)
+    with zipfile.ZipFile(source) as zin:
+        parts = {}
+        for sheet, part in worksheet_parts(zin):
+            if sheet in updates:
+                parts[part] = updates[sheet]
+
+        fd, temp_path = tempfile.mkstemp(suffix=".xlsx", dir=output.parent)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as zout:
+                for info in zin.infolist():
+                    data = zin.read(info)
+                    if info.filename in parts:
+                        data = _update_sheet_xml(data, parts[info.filename])
+                    zout.writestr(info, data)
+            os.replace(temp_path, output)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def _tag(name):
+    return f"{{{SPREADSHEET_NS}}}{name}"
+
+
+def _update_sheet_xml(data, cells):
+    root = lxml.etree.fromstring(
+        data, lxml.etree.XMLParser(resolve_entities=False, no_network=True)
+    )
+    sheet_data = root.find(_tag("sheetData"))
+    # The r attributes on rows and cells are optional; when absent the
+    # position follows the previous row or cell.
+    rows = {}
+    row_number = 0
+    for row in sheet_data.iter(_tag("row")):
+        row_number = int(row.get("r") or row_number + 1)
+        rows[row_number] = row
+
+    by_row = {}
+    for (row, column), update in cells.items():
+        by_row.setdefault(row, {})[column] = update
+
+    for row_number, columns in sorted(by_row.items()):
+        row = rows.get(row_number)
+        if row is None:
+            row = lxml.etree.Element(_tag("row"), r=str(row_number))
+            following = [number for number in rows if number > row_number]
+            if following:
+                rows[min(following)].addprevious(row)
+            else:
+                sheet_data.append(row)
+            rows[row_number] = row
+
+        existing = {}
+        column = 0
+        for cell in row.iter(_tag("c")):
+            reference = cell.get("r", "").rstrip("0123456789")
+            column = column_index_from_string(reference) if reference else column + 1
+            existing[column] = cell
+
+        for column, (value, is_formula) in sorted(columns.items()):
+            cell = existing.get(column)
+            if cell is None:
+                cell = lxml.etree.Element(
+                    _tag("c"), r=f"{get_column_letter(column)}{row_number}"
+                )
+                following = [number for number in existing if number > column]
+                if following:
+                    existing[min(following)].addprevious(cell)
+                else:
+                    row.append(cell)
+                existing[column] = cell
+            elif not is_formula and cell.find(_tag("f")) is not None:
+                raise ValueError(
+                    f"{get_column_letter(column)}{row_number} contains a formula"
+                )
+            _set_cell_value(cell, value, is_formula)
+
+    return lxml.etree.tostring(
+        root, xml_declaration=True, encoding="UTF-8", standalone=True
+    )
+
+
+def _set_cell_value(cell, value, is_formula):
+    for child in cell.findall(_tag("v")) + cell.findall(_tag("is")):
+        cell.remove(child)
+
+    if isinstance(value, bool):
+        cell_type, text = "b", "1" if value else "0"
+    elif isinstance(value, ExcelError):
+        cell_type, text = "e", value.code
+    elif _is_number(value):
+        cell_type = None
+        if float(value).is_integer() and abs(value) < 1e15:
+            text = str(int(value))
+        else:
+            text = repr(float(value))
+    else:
+        cell_type, text = ("str" if is_formula else "inlineStr"), value
+
+    if cell_type:
+        cell.set("t", cell_type)
+    else:
+        cell.attrib.pop("t", None)
+
+    if cell_type == "inlineStr":
+        inline = lxml.etree.SubElement(cell, _tag("is"))
+        lxml.etree.SubElement(inline, _tag("t")).text = text
+        return
+
+    element = lxml.etree.Element(_tag("v"))
+    element.text = text
+    formula = cell.find(_tag("f"))
+    if formula is not None:
+        formula.addnext(element)
+    else:
+        cell.insert(0, element)
+
+
+def native_recalc(filename, changes=None, output=None, fallback=True, timeout=30):
+    if not Path(filename).exists():
+        return {"error": f"File {filename} does not exist"}
+    target = Path(output or filename)
+    changes = [parse_assignment(change) for change in changes or []]
+
+    try:
+        engine = FormulaEngine(filename, cached_values=bool(changes))
+        for sheet, coordinate, value in changes:
+            engine.set_value(sheet, coordinate, value)
+        if changes and not engine.uncached:
+            count = engine.recalculate_dirty()
+        else:
+            count = engine.recalculate()
+        engine.save(target)
+    except UnsupportedFormula as e:
+        if not fallback:
+            return {"error": f"Unsupported formula: {e}"}
+        reason = str(e)
+    else:
+        result = scan_workbook(target)
+        result.update(engine="native", recalculated_formulas=count)
+        return result
+
+    if changes:
+        updates = {}
+        sheets = _sheet_names(filename)
+        for sheet, coordinate, value in changes:
+            match = CELL_PATTERN.match(coordinate)
+            name = sheets.get((sheet or next(iter(sheets.values()))).lower())
+            if name is None:
+                return {"error": f"Sheet not found: {sheet}"}
+            key = (int(match.group(2)), column_index_from_string(match.group(1)))
+            updates.setdefault(name, {})[key] = (value, False)
+        write_cells(filename, target, updates)
+    elif target != Path(filename):
+        shutil.copyfile(filename, target)
+
+    result = recalc(str(target), timeout)
+    result.update(engine="libreoffice", fallback_reason=reason)
+    return result
+
+
+def _sheet_names(filename):
+    with zipfile.ZipFile(filename) as zf:
+        return {name.lower(): name for name, _ in worksheet_parts(zf)}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recalculate Excel formulas natively, falling back to LibreOffice"
+    )
+    parser.add_argument("input_file", help="Excel file to recalculate")
+    parser.add_argument(
+        "--set",
+        dest="changes",
+        action="append",
+        metavar="CELL=VALUE",
+        help="Change an input cell and recompute only its dependents (repeatable)",
+    )
+    parser.add_argument(
+        "--output", help="Write the result here instead of updating the input file"
+    )
+    parser.add_argument(
+        "--no-fallback",
+        action="store_true",
+        help="Report unsupported formulas instead of running LibreOffice",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=30,
+        help="LibreOffice timeout in seconds when falling back (default: 30)",
+    )
+    args = parser.parse_args()
+
+    try:
+        result = native_recalc(
+            args.input_file,
+            args.changes,
+            args.output,
+            fallback=not args.no_fallback,
+            timeout=args.timeout,
+        )
+    except ValueError as e:
+        result = {"error": str(e)}
+    print(json.dumps(result, indent=2))
+    if "error" in result:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,9 +14,10 @@ import xml.etree.ElementTree as ET
 import zipfile
 from pathlib import Path
 
-import defusedxml.minidom
+import lxml.etree
 
 WORD_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+PARSER = lxml.etree.XMLParser(resolve_entities=False, no_network=True, load_dtd=False)
 
 
 def simplify_redlines(input_dir: str) -> tuple[int, str]:
@@ -26,101 +27,100 @@ def simplify_redlines(input_dir: str) -> tuple[int, str]:
         return 0, f"Error: {doc_xml} not found"
 
     try:
-        dom = defusedxml.minidom.parseString(doc_xml.read_text(encoding="utf-8"))
-        root = dom.documentElement
+        tree = lxml.etree.parse(str(doc_xml), PARSER)
+        merge_count = simplify_redlines_in_tree(tree.getroot())
 
-        merge_count = 0
-
-        containers = _find_elements(root, "p") + _find_elements(root, "tc")
-
-        for container in containers:
-            merge_count += _merge_tracked_changes_in(container, "ins")
-            merge_count += _merge_tracked_changes_in(container, "del")
-
-        doc_xml.write_bytes(dom.toxml(encoding="UTF-8"))
+        doc_xml.write_bytes(
+            b'<?xml version="1.0" encoding="UTF-8"?>'
+            + lxml.etree.tostring(tree, encoding="UTF-8", xml_declaration=False)
+        )
         return merge_count, f"Simplified {merge_count} tracked changes"
 
     except Exception as e:
         return 0, f"Error: {e}"
 
 
-def _merge_tracked_changes_in(container, tag: str) -> int:
+def simplify_redlines_in_tree(root) -> int:
     merge_count = 0
 
-    tracked = [
-        child
-        for child in container.childNodes
-        if child.nodeType == child.ELEMENT_NODE and _is_element(child, tag)
+    containers = [
+        elem
+        for elem in root.iter(lxml.etree.Element)
+        if _local_name(elem) in ("p", "tc")
     ]
 
-    if len(tracked) < 2:
-        return 0
+    for container in containers:
+        merge_count += _merge_tracked_changes_in(container)
 
-    i = 0
-    while i < len(tracked) - 1:
-        curr = tracked[i]
-        next_elem = tracked[i + 1]
+    return merge_count
 
-        if _can_merge_tracked(curr, next_elem):
-            _merge_tracked_content(curr, next_elem)
-            container.removeChild(next_elem)
-            tracked.pop(i + 1)
+
+def _merge_tracked_changes_in(container) -> int:
+    merge_count = 0
+    prev = prev_tag = None
+
+    for child in list(container):
+        if not isinstance(child.tag, str):
+            if child.tail and child.tail.strip():
+                prev = prev_tag = None
+            continue
+
+        tag = _local_name(child)
+        if tag not in ("ins", "del"):
+            prev = prev_tag = None
+            continue
+
+        if (
+            prev is not None
+            and tag == prev_tag
+            and not (prev.tail and prev.tail.strip())
+            and _get_author(prev) == _get_author(child)
+        ):
+            _merge_tracked_content(prev, child)
+            if child.tail and child.tail.strip():
+                prev = prev_tag = None
+            _remove_keeping_tail(child)
             merge_count += 1
         else:
-            i += 1
+            prev, prev_tag = child, tag
 
     return merge_count
 
 
-def _is_element(node, tag: str) -> bool:
-    name = node.localName or node.tagName
-    return name == tag or name.endswith(f":{tag}")
+def _local_name(node) -> str | None:
+    if not isinstance(node.tag, str):
+        return None
+    return lxml.etree.QName(node).localname
 
 
 def _get_author(elem) -> str:
-    author = elem.getAttribute("w:author")
+    author = elem.get(f"{{{WORD_NS}}}author")
     if not author:
-        for attr in elem.attributes.values():
-            if attr.localName == "author" or attr.name.endswith(":author"):
-                return attr.value
-    return author
-
-
-def _can_merge_tracked(elem1, elem2) -> bool:
-    if _get_author(elem1) != _get_author(elem2):
-        return False
-
-    node = elem1.nextSibling
-    while node and node != elem2:
-        if node.nodeType == node.ELEMENT_NODE:
-            return False
-        if node.nodeType == node.TEXT_NODE and node.data.strip():
-            return False
-        node = node.nextSibling
-
-    return True
+        for name, value in elem.attrib.items():
+            if lxml.etree.QName(name).localname == "author":
+                return value
+    return author or ""
 
 
 def _merge_tracked_content(target, source):
-    while source.firstChild:
-        child = source.firstChild
-        source.removeChild(child)
-        target.appendChild(child)
-
-
-def _find_elements(root, tag: str) -> list:
-    results = []
+    if source.text:
+        if len(target):
+            target[-1].tail = (target[-1].tail or "") + source.text
+        else:
+            target.text = (target.text or "") + source.text
+    for child in list(source):
+        target.append(child)
 
-    def traverse(node):
-        if node.nodeType == node.ELEMENT_NODE:
-            name = node.localName or node.tagName
-            if name == tag or name.endswith(f":{tag}"):
-                results.append(node)
-            for child in node.childNodes:
-                traverse(child)
 
-    traverse(root)
-    return results
+def _remove_keeping_tail(node) -> None:
+    parent = node.getparent()
+    if node.tail:
+        previous = node.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + node.tail
+        else:
+            parent.text = (parent.text or "") + node.tail
+    parent.remove(node)
 
 
 def get_tracked_change_authors(doc_xml_path: Path) -> dict[str, int]:
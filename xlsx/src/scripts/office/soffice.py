@@ -12,14 +12,47 @@ Usage:
     # Option 2 – get env dict for your own subprocess calls
     env = get_soffice_env()
     subprocess.run(["soffice", ...], env=env)
+
+    # Option 3 – submit jobs to long-lived instances driven over UNO
+    pdf = convert_document("input.pptx", "out/")
+    with SofficePool(size=4) as pool:
+        futures = [pool.submit(recalculate_job, path) for path in paths]
+
+The pool needs the LibreOffice Python bridge (``import uno``). When it is
+missing, or SOFFICE_POOL=0 is set, the helpers fall back to one soffice
+process per call. By default each process gets private instances (free
+ports, temporary profiles) that are shut down at exit. To keep warm
+instances around across commands, start shared ones and set
+SOFFICE_POOL_KEEPALIVE=1 so later commands reuse them:
+
+    python soffice.py pool start --size 4
+    python soffice.py pool stop
 """
 
+import atexit
+import importlib.util
 import os
+import queue
+import shutil
+import signal
 import socket
 import subprocess
 import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
+POOL_BASE_PORT = int(os.environ.get("SOFFICE_POOL_PORT", "2202"))
+POOL_ROOT = Path(tempfile.gettempdir()) / f"soffice_pool_{os.getuid()}"
+
+PDF_EXPORT_FILTERS = {
+    "com.sun.star.presentation.PresentationDocument": "impress_pdf_Export",
+    "com.sun.star.drawing.DrawingDocument": "draw_pdf_Export",
+    "com.sun.star.sheet.SpreadsheetDocument": "calc_pdf_Export",
+    "com.sun.star.text.TextDocument": "writer_pdf_Export",
+}
+
 
 def get_soffice_env() -> dict:
     env = os.environ.copy()
@@ -37,6 +70,359 @@ def run_soffice(args: list[str], **kwargs) -> subprocess.CompletedProcess:
     return subprocess.run(["soffice"] + args, env=env, **kwargs)
 
 
+def convert_document(
+    input_path, output_dir, fmt: str = "pdf", timeout: float | None = None
+) -> Path:
+    input_path = Path(input_path).absolute()
+    output_path = Path(output_dir).absolute() / f"{input_path.stem}.{fmt}"
+
+    pool = get_pool()
+    if pool is not None and fmt == "pdf":
+        pool.run(convert_job, input_path, output_path, timeout=timeout)
+    else:
+        run_soffice(
+            ["--headless", "--convert-to", fmt, "--outdir", str(output_path.parent)]
+            + [str(input_path)],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+
+    if not output_path.exists():
+        raise RuntimeError(f"Conversion of {input_path.name} to {fmt} failed")
+    return output_path
+
+
+def convert_job(context, input_path, output_path) -> None:
+    document = _load_document(context, input_path)
+    try:
+        export_filter = next(
+            name
+            for service, name in PDF_EXPORT_FILTERS.items()
+            if document.supportsService(service)
+        )
+        document.storeToURL(
+            _file_url(output_path), _properties(FilterName=export_filter)
+        )
+    finally:
+        document.close(True)
+
+
+def recalculate_job(context, path) -> None:
+    document = _load_document(context, path)
+    try:
+        document.calculateAll()
+        document.store()
+    finally:
+        document.close(True)
+
+
+def accept_changes_job(context, path) -> None:
+    document = _load_document(context, path)
+    try:
+        dispatcher = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.DispatchHelper", context
+        )
+        frame = document.getCurrentController().getFrame()
+        dispatcher.executeDispatch(
+            frame, ".uno:AcceptAllTrackedChanges", "", 0, ()
+        )
+        document.store()
+    finally:
+        document.close(True)
+
+
+class SofficePool:
+    """Long-lived headless LibreOffice instances driven over UNO sockets.
+
+    Each instance listens on its own port with its own user profile. Private
+    pools (the default) use free ports and temporary profiles and never talk
+    to instances they did not start. Shared pools use fixed ports from
+    SOFFICE_POOL_PORT and per-user profiles, and reuse instances already
+    listening there (e.g. from ``python soffice.py pool start``). Instances
+    started here are shut down by close() unless keep_alive is set. Jobs are
+    callables taking the remote component context.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        keep_alive: bool = False,
+        startup_timeout: float = 60,
+        shared: bool = False,
+    ):
+        if importlib.util.find_spec("uno") is None:
+            raise ImportError("SofficePool needs the LibreOffice Python bridge (uno)")
+
+        self.keep_alive = keep_alive
+        self.shared = shared
+        self.startup_timeout = startup_timeout
+        self._instances = []
+        self._idle = queue.Queue()
+        self._executor = None
+        self._executor_size = 0
+        self.resize(size)
+
+    @property
+    def size(self) -> int:
+        return len(self._instances)
+
+    def resize(self, size: int) -> None:
+        """Grow the pool to at least size instances (it never shrinks)."""
+        for index in range(len(self._instances), max(1, size)):
+            instance = _PoolInstance(index, self.startup_timeout, self.shared)
+            self._instances.append(instance)
+            self._idle.put(instance)
+
+        if self._executor_size < self.size:
+            # Work already queued on the old executor still runs to completion
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=self.size)
+            self._executor_size = self.size
+
+    def submit(self, job, *args, timeout: float | None = None) -> Future:
+        return self._executor.submit(self.run, job, *args, timeout=timeout)
+
+    def run(self, job, *args, timeout: float | None = None):
+        instance = self._idle.get()
+        try:
+            return instance.run(job, args, timeout)
+        finally:
+            self._idle.put(instance)
+
+    def start(self) -> None:
+        for instance in self._instances:
+            instance.connect()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        if not self.keep_alive:
+            for instance in self._instances:
+                instance.stop(owned_only=True)
+
+    def stop_all(self) -> None:
+        for instance in self._instances:
+            instance.stop(owned_only=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _PoolInstance:
+    def __init__(self, index: int, startup_timeout: float, shared: bool):
+        self.shared = shared
+        if shared:
+            self.port = POOL_BASE_PORT + index
+            self.profile = POOL_ROOT / f"worker{index}"
+        else:
+            self.port = _free_port()
+            self.profile = Path(tempfile.mkdtemp(prefix="soffice_worker_"))
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.context = None
+        self.timed_out = False
+
+    def run(self, job, args, timeout):
+        for attempt in range(2):
+            context = self.connect()
+            self.timed_out = False
+            watchdog = threading.Timer(timeout, self._expire) if timeout else None
+            if watchdog:
+                watchdog.start()
+            try:
+                return job(context, *args)
+            except Exception:
+                if self.timed_out:
+                    raise TimeoutError(
+                        f"LibreOffice job exceeded {timeout}s on port {self.port}"
+                    ) from None
+                if attempt or self.healthy():
+                    raise
+                self.kill()
+            finally:
+                if watchdog:
+                    watchdog.cancel()
+
+    def connect(self):
+        if self.context is not None and self.healthy():
+            return self.context
+
+        if self.shared:
+            self.context = self._resolve()
+            if self.context is not None:
+                return self.context
+
+        self._spawn()
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process is not None and self.process.poll() is not None:
+                break
+            self.context = self._resolve()
+            if self.context is not None:
+                return self.context
+            time.sleep(0.25)
+
+        self.kill()
+        raise RuntimeError(f"LibreOffice did not start on port {self.port}")
+
+    def healthy(self) -> bool:
+        if self.process is not None and self.process.poll() is not None:
+            return False
+        try:
+            _desktop(self.context).getFrames().getCount()
+            return True
+        except Exception:
+            return False
+
+    def kill(self) -> None:
+        pid = self.process.pid if self.process is not None else self._read_pid()
+        if pid:
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        if self.process is not None:
+            self.process.wait()
+        self.process = None
+        self.context = None
+
+    def _expire(self) -> None:
+        self.timed_out = True
+        self.kill()
+
+    def stop(self, owned_only: bool) -> None:
+        if owned_only and self.process is None:
+            if not self.shared:
+                shutil.rmtree(self.profile, ignore_errors=True)
+            return
+        context = self.context or self._resolve()
+        if context is not None:
+            try:
+                _desktop(context).terminate()
+            except Exception:
+                pass
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.kill()
+        self.process = None
+        self.context = None
+        if self.shared:
+            (self.profile / "soffice.pid").unlink(missing_ok=True)
+        else:
+            shutil.rmtree(self.profile, ignore_errors=True)
+
+    def _resolve(self):
+        import uno
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local
+        )
+        try:
+            return resolver.resolve(
+                f"uno:socket,host=127.0.0.1,port={self.port};urp;"
+                "StarOffice.ComponentContext"
+            )
+        except Exception:
+            return None
+
+    def _spawn(self) -> None:
+        self.profile.mkdir(parents=True, exist_ok=True)
+        self.process = subprocess.Popen(
+            [
+                "soffice",
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                "--nolockcheck",
+                f"-env:UserInstallation={self.profile.as_uri()}",
+                f"--accept=socket,host=127.0.0.1,port={self.port};urp;"
+                "StarOffice.ComponentContext",
+            ],
+            env=get_soffice_env(),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        (self.profile / "soffice.pid").write_text(str(self.process.pid))
+
+    def _read_pid(self) -> int | None:
+        try:
+            return int((self.profile / "soffice.pid").read_text())
+        except (OSError, ValueError):
+            return None
+
+
+_POOL = None
+
+
+def get_pool(size: int | None = None) -> SofficePool | None:
+    """The process-wide pool, grown to size instances if it is smaller.
+
+    SOFFICE_POOL_KEEPALIVE=1 opts in to the shared instances started by
+    ``python soffice.py pool start`` and leaves them running at exit.
+    """
+    global _POOL
+    if _POOL is None:
+        _POOL = False
+        if os.environ.get("SOFFICE_POOL", "1") != "0" and shutil.which("soffice"):
+            shared = os.environ.get("SOFFICE_POOL_KEEPALIVE") == "1"
+            try:
+                _POOL = SofficePool(
+                    size=size or int(os.environ.get("SOFFICE_POOL_SIZE", "1")),
+                    keep_alive=shared,
+                    shared=shared,
+                )
+                atexit.register(_POOL.close)
+            except ImportError:
+                pass
+    elif _POOL and size:
+        _POOL.resize(size)
+    return _POOL or None
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _desktop(context):
+    return context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.frame.Desktop", context
+    )
+
+
+def _load_document(context, path):
+    return _desktop(context).loadComponentFromURL(
+        _file_url(path), "_blank", 0, _properties(Hidden=True)
+    )
+
+
+def _file_url(path) -> str:
+    import uno
+
+    return uno.systemPathToFileUrl(str(Path(path).absolute()))
+
+
+def _properties(**values) -> tuple:
+    import uno
+
+    return tuple(
+        uno.createUnoStruct("com.sun.star.beans.PropertyValue", name, 0, value, 0)
+        for name, value in values.items()
+    )
+
+
 
 _SHIM_SO = Path(tempfile.gettempdir()) / "lo_socket_shim.so"
 
@@ -179,5 +565,30 @@ int close(int fd) {
 
 if __name__ == "__main__":
     import sys
+
+    if sys.argv[1:2] == ["pool"]:
+        import argparse
+
+        parser = argparse.ArgumentParser(
+            prog="soffice.py pool",
+            description="Start or stop long-lived LibreOffice instances",
+        )
+        parser.add_argument("action", choices=["start", "stop"])
+        parser.add_argument("--size", type=int, default=1, help="Number of instances")
+        args = parser.parse_args(sys.argv[2:])
+
+        pool = SofficePool(size=args.size, keep_alive=True, shared=True)
+        if args.action == "start":
+            pool.start()
+            print(
+                f"Started {args.size} LibreOffice instance(s) "
+                f"from port {POOL_BASE_PORT}"
+            )
+        else:
+            pool.stop_all()
+            print(f"Stopped LibreOffice instances from port {POOL_BASE_PORT}")
+        pool.close()
+        sys.exit(0)
+
     result = run_soffice(sys.argv[1:])
     sys.exit(result.returncode)
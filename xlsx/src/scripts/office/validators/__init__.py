@@ -2,7 +2,7 @@
 Validation modules for Word document processing.
 """
 
-from .base import BaseSchemaValidator
+from .base import BaseSchemaValidator, XMLTreeCache
 from .docx import DOCXSchemaValidator
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
@@ -12,4 +12,5 @@ __all__ = [
     "DOCXSchemaValidator",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "XMLTreeCache",
 ]
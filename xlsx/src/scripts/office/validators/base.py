@@ -2,12 +2,82 @@
 Base validator with common validation logic for document files.
 """
 
+import hashlib
+import inspect
+import io
+import json
+import os
 import re
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-import defusedxml.minidom
 import lxml.etree
 
+_COMPILED_SCHEMAS = {}
+_ORIGINAL_BASELINES = {}
+_VALIDATOR_FINGERPRINTS = {}
+
+
+def _to_json(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(_to_json(v) for v in value)
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    return value
+
+
+class XMLTreeCache:
+    """Parsed lxml trees shared by the validators of a single run.
+
+    Entries are keyed by resolved path and stamped with the file's mtime and
+    size, so a part rewritten on disk is parsed again on its next lookup.
+    Callers must not mutate returned trees unless they write them back with
+    ``write``.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, xml_file):
+        path = Path(xml_file).resolve()
+        stamp = self._stamp(path)
+
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != stamp:
+            try:
+                entry = (stamp, lxml.etree.parse(str(path)))
+            except lxml.etree.XMLSyntaxError as e:
+                entry = (stamp, e)
+            self._entries[path] = entry
+
+        if isinstance(entry[1], Exception):
+            raise entry[1]
+        return entry[1]
+
+    def write(self, xml_file, tree):
+        path = Path(xml_file).resolve()
+        declaration = '<?xml version="1.0" encoding="UTF-8"'
+        if tree.docinfo.standalone:
+            declaration += ' standalone="yes"'
+        path.write_bytes(
+            f"{declaration}?>".encode()
+            + lxml.etree.tostring(tree, encoding="UTF-8", xml_declaration=False)
+        )
+        self._entries[path] = (self._stamp(path), tree)
+
+    def invalidate(self, xml_file=None):
+        if xml_file is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(Path(xml_file).resolve(), None)
+
+    @staticmethod
+    def _stamp(path):
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
 
 class BaseSchemaValidator:
 
@@ -73,6 +143,9 @@ class BaseSchemaValidator:
 
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
 
+    MANIFEST_FILENAME = ".validation-manifest.json"
+    MANIFEST_VERSION = 1
+
     OOXML_NAMESPACES = {
         "http://schemas.openxmlformats.org/officeDocument/2006/math",
         "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
@@ -91,10 +164,21 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file=None, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file=None,
+        verbose=False,
+        jobs=1,
+        trees=None,
+        incremental=False,
+    ):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file) if original_file else None
         self.verbose = verbose
+        self.jobs = max(1, jobs or 1)
+        self.trees = trees if trees is not None else XMLTreeCache()
+        self.incremental = incremental
 
         self.schemas_dir = Path(__file__).parent.parent / "schemas"
 
@@ -106,34 +190,210 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_manifest", None)
+        state.pop("_relationship_indexes", None)
+        state["trees"] = XMLTreeCache()
+        return state
+
     def validate(self):
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def _map_xml_files(self, func):
+        if not self.incremental:
+            return self._run_per_part(func, self.xml_files)
+
+        manifest = self._load_manifest()
+        parts = manifest["parts"]
+        check = func.__name__
+
+        stale = [
+            xml_file
+            for xml_file in self.xml_files
+            if check not in parts[self._part_key(xml_file)]["results"]
+        ]
+        if self.verbose and stale:
+            print(
+                f"Incremental: {check} on {len(stale)} of {len(self.xml_files)} parts"
+            )
+
+        for xml_file, result in zip(stale, self._run_per_part(func, stale)):
+            parts[self._part_key(xml_file)]["results"][check] = _to_json(result)
+        self._save_manifest()
+
+        return [
+            parts[self._part_key(xml_file)]["results"][check]
+            for xml_file in self.xml_files
+        ]
+
+    def _run_per_part(self, func, xml_files):
+        if self.jobs <= 1 or len(xml_files) < 2:
+            return [func(xml_file) for xml_file in xml_files]
+
+        chunksize = max(1, len(xml_files) // (self.jobs * 4))
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            return list(executor.map(func, xml_files, chunksize=chunksize))
+
+    def _part_key(self, xml_file):
+        return Path(xml_file).relative_to(self.unpacked_dir).as_posix()
+
+    def _load_manifest(self):
+        manifest = getattr(self, "_manifest", None)
+        if manifest is not None:
+            return manifest
+
+        fingerprint = {
+            "version": self.MANIFEST_VERSION,
+            "validator": type(self).__name__,
+            "code": self._validator_fingerprint(),
+            "original": self._get_original_digest() if self.original_file else None,
+        }
+
+        try:
+            previous = json.loads(
+                (self.unpacked_dir / self.MANIFEST_FILENAME).read_text(encoding="utf-8")
+            )
+            if previous.get("fingerprint") != fingerprint:
+                previous = {}
+        except (OSError, ValueError):
+            previous = {}
+        previous_parts = previous.get("parts", {})
+
+        hashes = {
+            self._part_key(xml_file): hashlib.sha256(xml_file.read_bytes()).hexdigest()
+            for xml_file in self.xml_files
+        }
+        # Parts that were deleted since the last run count as changed, so
+        # the sources of deleted .rels files and of deleted targets rerun.
+        deleted = previous_parts.keys() - hashes.keys()
+        changed = deleted | {
+            key
+            for key, digest in hashes.items()
+            if previous_parts.get(key, {}).get("hash") != digest
+        }
+
+        dirty = set(changed)
+        for key in hashes.keys() | deleted:
+            if not key.endswith(".rels"):
+                continue
+            source = self._rels_source_key(key)
+            if key in changed:
+                dirty.add(source)
+            elif self._rels_target_keys(self.unpacked_dir / key) & changed:
+                dirty.add(source)
+
+        self._manifest = {
+            "fingerprint": fingerprint,
+            "parts": {
+                key: {
+                    "hash": digest,
+                    "results": (
+                        {} if key in dirty else previous_parts[key].get("results", {})
+                    ),
+                }
+                for key, digest in hashes.items()
+            },
+        }
+        return self._manifest
+
+    def _save_manifest(self):
+        manifest_file = self.unpacked_dir / self.MANIFEST_FILENAME
+        temp_name = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=self.unpacked_dir,
+                prefix=self.MANIFEST_FILENAME,
+                suffix=".tmp",
+                delete=False,
+            ) as f:
+                temp_name = f.name
+                json.dump(self._manifest, f)
+            os.replace(temp_name, manifest_file)
+        except OSError:
+            # A stray temp file would be packed into the document.
+            if temp_name is not None:
+                try:
+                    os.unlink(temp_name)
+                except OSError:
+                    pass
+
+    def _rels_source_key(self, rels_key):
+        rels_path = Path(rels_key)
+        return (rels_path.parent.parent / rels_path.name[: -len(".rels")]).as_posix()
+
+    def _rels_target_keys(self, rels_file):
+        targets = set()
+        try:
+            relationships = self._relationship_index(rels_file)["relationships"]
+        except Exception:
+            return targets
+
+        for _, _, target, target_mode, _ in relationships:
+            if not target or target_mode == "External":
+                continue
+            if target.startswith("/"):
+                target_path = self.unpacked_dir / target.lstrip("/")
+            else:
+                target_path = rels_file.parent.parent / target
+            try:
+                targets.add(self._part_key(target_path.resolve()))
+            except ValueError:
+                pass
+
+        return targets
+
+    def _relationship_index(self, rels_file):
+        tree = self.trees.get(rels_file)
+        indexes = self.__dict__.setdefault("_relationship_indexes", {})
+        cached = indexes.get(rels_file)
+        if cached is not None and cached[0] is tree:
+            return cached[1]
+
+        index = {"relationships": [], "types": {}, "duplicates": []}
+        for rel in tree.getroot().iter(
+            f"{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+        ):
+            rid = rel.get("Id")
+            rel_type = rel.get("Type", "")
+            index["relationships"].append(
+                (rid, rel_type, rel.get("Target"), rel.get("TargetMode"), rel.sourceline)
+            )
+            if rid:
+                if rid in index["types"]:
+                    index["duplicates"].append((rid, rel.sourceline))
+                index["types"][rid] = rel_type
+
+        indexes[rels_file] = (tree, index)
+        return index
+
     def repair(self) -> int:
         return self.repair_whitespace_preservation()
 
     def repair_whitespace_preservation(self) -> int:
         repairs = 0
+        xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
 
         for xml_file in self.xml_files:
             try:
-                content = xml_file.read_text(encoding="utf-8")
-                dom = defusedxml.minidom.parseString(content)
+                tree = self.trees.get(xml_file)
                 modified = False
 
-                for elem in dom.getElementsByTagName("*"):
-                    if elem.tagName.endswith(":t") and elem.firstChild:
-                        text = elem.firstChild.nodeValue
-                        if text and (text.startswith((' ', '\t')) or text.endswith((' ', '\t'))):
-                            if elem.getAttribute("xml:space") != "preserve":
-                                elem.setAttribute("xml:space", "preserve")
+                for elem in tree.iter("{*}t"):
+                    if elem.prefix and elem.text:
+                        text = elem.text
+                        if text.startswith((' ', '\t')) or text.endswith((' ', '\t')):
+                            if elem.get(xml_space_attr) != "preserve":
+                                elem.set(xml_space_attr, "preserve")
                                 text_preview = repr(text[:30]) + "..." if len(text) > 30 else repr(text)
-                                print(f"  Repaired: {xml_file.name}: Added xml:space='preserve' to {elem.tagName}: {text_preview}")
+                                print(f"  Repaired: {xml_file.name}: Added xml:space='preserve' to {elem.prefix}:t: {text_preview}")
                                 repairs += 1
                                 modified = True
 
                 if modified:
-                    xml_file.write_bytes(dom.toxml(encoding="UTF-8"))
+                    self.trees.write(xml_file, tree)
 
             except Exception:
                 pass
@@ -141,21 +401,11 @@ class BaseSchemaValidator:
         return repairs
 
     def validate_xml(self):
-        errors = []
-
-        for xml_file in self.xml_files:
-            try:
-                lxml.etree.parse(str(xml_file))
-            except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
-            except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
-                )
+        errors = [
+            error
+            for file_errors in self._map_xml_files(self._check_xml_syntax)
+            for error in file_errors
+        ]
 
         if errors:
             print(f"FAILED - Found {len(errors)} XML violations:")
@@ -167,25 +417,27 @@ class BaseSchemaValidator:
                 print("PASSED - All XML files are well-formed")
             return True
 
-    def validate_namespaces(self):
-        errors = []
+    def _check_xml_syntax(self, xml_file):
+        try:
+            self.trees.get(xml_file)
+        except lxml.etree.XMLSyntaxError as e:
+            return [
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Line {e.lineno}: {e.msg}"
+            ]
+        except Exception as e:
+            return [
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Unexpected error: {str(e)}"
+            ]
+        return []
 
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  
-
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
-                    undeclared = set(attr_val.split()) - declared
-                    errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
-                    )
-            except lxml.etree.XMLSyntaxError:
-                continue
+    def validate_namespaces(self):
+        errors = [
+            error
+            for file_errors in self._map_xml_files(self._check_namespaces)
+            for error in file_errors
+        ]
 
         if errors:
             print(f"FAILED - {len(errors)} namespace issues:")
@@ -196,85 +448,50 @@ class BaseSchemaValidator:
             print("PASSED - All namespace prefixes properly declared")
         return True
 
+    def _check_namespaces(self, xml_file):
+        errors = []
+
+        try:
+            root = self.trees.get(xml_file).getroot()
+            declared = set(root.nsmap.keys()) - {None}  
+
+            for attr_val in [
+                v for k, v in root.attrib.items() if k.endswith("Ignorable")
+            ]:
+                undeclared = set(attr_val.split()) - declared
+                errors.extend(
+                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                    f"Namespace '{ns}' in Ignorable but not declared"
+                    for ns in sorted(undeclared)
+                )
+        except lxml.etree.XMLSyntaxError:
+            pass
+
+        return errors
+
     def validate_unique_ids(self):
         errors = []
         global_ids = {}  
 
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  
+        for xml_file, (file_errors, global_occurrences) in zip(
+            self.xml_files, self._map_xml_files(self._check_unique_ids)
+        ):
+            errors.extend(file_errors)
 
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                for elem in root.iter():
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
+            for id_value, line, tag in global_occurrences:
+                if id_value in global_ids:
+                    prev_file, prev_line, prev_tag = global_ids[id_value]
+                    errors.append(
+                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                        f"Line {line}: Global ID '{id_value}' in <{tag}> "
+                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                    )
+                else:
+                    global_ids[id_value] = (
+                        xml_file.relative_to(self.unpacked_dir),
+                        line,
+                        tag,
                     )
-
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        in_excluded_container = any(
-                            ancestor.tag.split("}")[-1].lower() in self.EXCLUDED_ID_CONTAINERS
-                            for ancestor in elem.iterancestors()
-                        )
-                        if in_excluded_container:
-                            continue
-
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
 
         if errors:
             print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
@@ -286,6 +503,76 @@ class BaseSchemaValidator:
                 print("PASSED - All required IDs are unique")
             return True
 
+    def _check_unique_ids(self, xml_file):
+        errors = []
+        global_occurrences = []  
+
+        try:
+            root = self.trees.get(xml_file).getroot()
+            file_ids = {}  
+            alternate_content = f"{{{self.MC_NAMESPACE}}}AlternateContent"
+            skipped_depth = 0
+            excluded_depth = 0
+
+            for event, elem in lxml.etree.iterwalk(root, events=("start", "end")):
+                if not isinstance(elem.tag, str):
+                    continue
+
+                if elem.tag == alternate_content:
+                    skipped_depth += 1 if event == "start" else -1
+                    continue
+                if skipped_depth:
+                    continue
+
+                tag = elem.tag.rsplit("}", 1)[-1].lower()
+                is_excluded = tag in self.EXCLUDED_ID_CONTAINERS
+
+                if event == "end":
+                    if is_excluded:
+                        excluded_depth -= 1
+                    continue
+
+                if excluded_depth:
+                    if is_excluded:
+                        excluded_depth += 1
+                    continue
+                if is_excluded:
+                    excluded_depth += 1
+
+                if tag in self.UNIQUE_ID_REQUIREMENTS:
+                    attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
+
+                    id_value = None
+                    for attr, value in elem.attrib.items():
+                        if attr.rsplit("}", 1)[-1].lower() == attr_name:
+                            id_value = value
+                            break
+
+                    if id_value is not None:
+                        if scope == "global":
+                            global_occurrences.append((id_value, elem.sourceline, tag))
+                        elif scope == "file":
+                            key = (tag, attr_name)
+                            if key not in file_ids:
+                                file_ids[key] = {}
+
+                            if id_value in file_ids[key]:
+                                prev_line = file_ids[key][id_value]
+                                errors.append(
+                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                                    f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                                    f"(first occurrence at line {prev_line})"
+                                )
+                            else:
+                                file_ids[key][id_value] = elem.sourceline
+
+        except (lxml.etree.XMLSyntaxError, Exception) as e:
+            errors.append(
+                f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+            )
+
+        return errors, global_occurrences
+
     def validate_file_references(self):
         errors = []
 
@@ -302,6 +589,7 @@ class BaseSchemaValidator:
                 file_path.is_file()
                 and file_path.name != "[Content_Types].xml"
                 and not file_path.name.endswith(".rels")
+                and file_path.name != self.MANIFEST_FILENAME
             ):  
                 all_files.append(file_path.resolve())
 
@@ -314,18 +602,14 @@ class BaseSchemaValidator:
 
         for rels_file in rels_files:
             try:
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                relationships = self._relationship_index(rels_file)["relationships"]
 
                 rels_dir = rels_file.parent
 
                 referenced_files = set()
                 broken_refs = []
 
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
+                for _, _, target, _, line in relationships:
                     if target and not target.startswith(
                         ("http", "mailto:")
                     ):  
@@ -343,9 +627,9 @@ class BaseSchemaValidator:
                                 referenced_files.add(target_path)
                                 all_referenced_files.add(target_path)
                             else:
-                                broken_refs.append((target, rel.sourceline))
+                                broken_refs.append((target, line))
                         except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
+                            broken_refs.append((target, line))
 
                 if broken_refs:
                     rel_path = rels_file.relative_to(self.unpacked_dir)
@@ -383,77 +667,11 @@ class BaseSchemaValidator:
             return True
 
     def validate_all_relationship_ids(self):
-        import lxml.etree
-
-        errors = []
-
-        for xml_file in self.xml_files:
-            if xml_file.suffix == ".rels":
-                continue
-
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
-
-            if not rels_file.exists():
-                continue
-
-            try:
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
-
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                r_ns = self.OFFICE_RELATIONSHIPS_NAMESPACE
-                rid_attrs_to_check = ["id", "embed", "link"]
-                for elem in xml_root.iter():
-                    for attr_name in rid_attrs_to_check:
-                        rid_attr = elem.get(f"{{{r_ns}}}{attr_name}")
-                        if not rid_attr:
-                            continue
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
-
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> r:{attr_name} references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        elif attr_name == "id" and self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+        errors = [
+            error
+            for file_errors in self._map_xml_files(self._check_relationship_ids)
+            for error in file_errors
+        ]
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
@@ -466,6 +684,70 @@ class BaseSchemaValidator:
                 print("PASSED - All relationship ID references are valid")
             return True
 
+    def _check_relationship_ids(self, xml_file):
+        errors = []
+
+        if xml_file.suffix == ".rels":
+            return errors
+
+        rels_dir = xml_file.parent / "_rels"
+        rels_file = rels_dir / f"{xml_file.name}.rels"
+
+        if not rels_file.exists():
+            return errors
+
+        try:
+            rels_index = self._relationship_index(rels_file)
+            for rid, line in rels_index["duplicates"]:
+                rels_rel_path = rels_file.relative_to(self.unpacked_dir)
+                errors.append(
+                    f"  {rels_rel_path}: Line {line}: "
+                    f"Duplicate relationship ID '{rid}' (IDs must be unique)"
+                )
+            rid_to_type = {
+                rid: rel_type.rsplit("/", 1)[-1]
+                for rid, rel_type in rels_index["types"].items()
+            }
+
+            xml_root = self.trees.get(xml_file).getroot()
+
+            r_ns = self.OFFICE_RELATIONSHIPS_NAMESPACE
+            rid_attrs_to_check = ["id", "embed", "link"]
+            for elem in xml_root.iter():
+                for attr_name in rid_attrs_to_check:
+                    rid_attr = elem.get(f"{{{r_ns}}}{attr_name}")
+                    if not rid_attr:
+                        continue
+                    xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+                    elem_name = (
+                        elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+                    )
+
+                    if rid_attr not in rid_to_type:
+                        errors.append(
+                            f"  {xml_rel_path}: Line {elem.sourceline}: "
+                            f"<{elem_name}> r:{attr_name} references non-existent relationship '{rid_attr}' "
+                            f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+                        )
+                    elif attr_name == "id" and self.ELEMENT_RELATIONSHIP_TYPES:
+                        expected_type = self._get_expected_relationship_type(
+                            elem_name
+                        )
+                        if expected_type:
+                            actual_type = rid_to_type[rid_attr]
+                            if expected_type not in actual_type.lower():
+                                errors.append(
+                                    f"  {xml_rel_path}: Line {elem.sourceline}: "
+                                    f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                                    f"but should point to a '{expected_type}' relationship"
+                                )
+
+        except Exception as e:
+            xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+            errors.append(f"  Error processing {xml_rel_path}: {e}")
+
+        return errors
+
     def _get_expected_relationship_type(self, element_name):
         elem_lower = element_name.lower()
 
@@ -498,7 +780,7 @@ class BaseSchemaValidator:
             return False
 
         try:
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self.trees.get(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -553,7 +835,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self.trees.get(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -608,6 +890,17 @@ class BaseSchemaValidator:
         elif is_valid:
             return True, set()  
 
+        return self._new_xsd_errors(xml_file, current_errors, verbose)
+
+    def _xsd_errors(self, xml_file):
+        is_valid, errors = self._validate_single_file_xsd(
+            Path(xml_file).resolve(), self.unpacked_dir.resolve()
+        )
+        return is_valid, errors or set()
+
+    def _new_xsd_errors(self, xml_file, current_errors, verbose=False):
+        xml_file = Path(xml_file).resolve()
+        unpacked_dir = self.unpacked_dir.resolve()
         original_errors = self._get_original_file_errors(xml_file)
 
         assert current_errors is not None
@@ -639,11 +932,17 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        results = self._map_xml_files(self._xsd_errors)
+        self._prepare_original_baseline(
+            [f for f, (is_valid, _) in zip(self.xml_files, results) if is_valid is False]
+        )
+
+        for xml_file, (is_valid, errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
+
+            new_file_errors = set()
+            if is_valid is False:
+                is_valid, new_file_errors = self._new_xsd_errors(xml_file, set(errors))
 
             if is_valid is None:
                 skipped_count += 1
@@ -657,7 +956,7 @@ class BaseSchemaValidator:
                 continue
 
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  
+            for error in sorted(new_file_errors)[:3]:  
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -747,21 +1046,18 @@ class BaseSchemaValidator:
 
         return xml_doc
 
-    def _validate_single_file_xsd(self, xml_file, base_path):
+    def _validate_single_file_xsd(self, xml_file, base_path, content=None):
         schema_path = self._get_schema_path(xml_file)
         if not schema_path:
             return None, None  
 
         try:
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            schema = self._get_compiled_schema(schema_path)
 
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+            if content is not None:
+                xml_doc = lxml.etree.parse(io.BytesIO(content))
+            else:
+                xml_doc = self.trees.get(xml_file)
 
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
@@ -784,32 +1080,123 @@ class BaseSchemaValidator:
         except Exception as e:
             return False, {str(e)}
 
+    def _get_compiled_schema(self, schema_path):
+        schema_path = Path(schema_path).resolve()
+        key = (str(schema_path), schema_path.stat().st_mtime_ns)
+
+        schema = _COMPILED_SCHEMAS.get(key)
+        if schema is None:
+            with open(schema_path, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(
+                    xsd_file, parser=parser, base_url=str(schema_path)
+                )
+                schema = lxml.etree.XMLSchema(xsd_doc)
+            _COMPILED_SCHEMAS[key] = schema
+
+        return schema
+
     def _get_original_file_errors(self, xml_file):
         if self.original_file is None:
             return set()
 
-        import tempfile
-        import zipfile
-
-        xml_file = Path(xml_file).resolve()
-        unpacked_dir = self.unpacked_dir.resolve()
-        relative_path = xml_file.relative_to(unpacked_dir)
+        member = self._part_key(Path(xml_file).resolve())
+        baseline = self._get_original_baseline()
+        if member not in baseline:
+            self._prepare_original_baseline([xml_file])
+
+        return set(baseline[member])
+
+    def _get_original_digest(self):
+        digest = getattr(self, "_original_digest", None)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(self.original_file, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(chunk)
+            digest = self._original_digest = sha.hexdigest()
+        return digest
+
+    def _validator_fingerprint(self):
+        cls = type(self)
+        if cls not in _VALIDATOR_FINGERPRINTS:
+            sha = hashlib.sha256()
+            for source in sorted({__file__, inspect.getfile(cls)}):
+                sha.update(Path(source).read_bytes())
+            for xsd in sorted(self.schemas_dir.rglob("*.xsd")):
+                sha.update(xsd.relative_to(self.schemas_dir).as_posix().encode())
+                sha.update(xsd.read_bytes())
+            _VALIDATOR_FINGERPRINTS[cls] = sha.hexdigest()
+        return _VALIDATOR_FINGERPRINTS[cls]
+
+    def _baseline_cache_file(self):
+        # Per-user cache, keyed by the original archive and the exact
+        # validator code and schemas that produced the errors.
+        root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        key = hashlib.sha256(
+            f"{self._get_original_digest()}:{self._validator_fingerprint()}".encode()
+        ).hexdigest()
+        return Path(root) / "office-validators" / "xsd-baselines" / f"{key}.json"
+
+    def _get_original_baseline(self):
+        digest = self._get_original_digest()
+
+        if digest not in _ORIGINAL_BASELINES:
+            try:
+                _ORIGINAL_BASELINES[digest] = json.loads(
+                    self._baseline_cache_file().read_text(encoding="utf-8")
+                )
+            except (OSError, ValueError, RuntimeError, KeyError):
+                _ORIGINAL_BASELINES[digest] = {}
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        return _ORIGINAL_BASELINES[digest]
 
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
+    def _prepare_original_baseline(self, xml_files):
+        if self.original_file is None or not xml_files:
+            return
 
-            original_xml_file = temp_path / relative_path
+        baseline = self._get_original_baseline()
+        missing = sorted(
+            {self._part_key(Path(f).resolve()) for f in xml_files} - baseline.keys()
+        )
+        if not missing:
+            return
 
-            if not original_xml_file.exists():
-                return set()
+        batches = [missing[i :: self.jobs] for i in range(min(self.jobs, len(missing)))]
+        for errors in self._run_per_part(self._validate_original_members, batches):
+            baseline.update(errors)
+        self._save_original_baseline(baseline)
 
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+    def _save_original_baseline(self, baseline):
+        try:
+            cache_file = self._baseline_cache_file()
+            cache_file.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=cache_file.parent,
+                suffix=".tmp",
+                delete=False,
+            ) as f:
+                json.dump(baseline, f)
+            os.replace(f.name, cache_file)
+        except (OSError, RuntimeError, KeyError):
+            pass
+
+    def _validate_original_members(self, members):
+        base_path = Path("/original")
+        errors = {}
+        with zipfile.ZipFile(self.original_file, "r") as archive:
+            names = set(archive.namelist())
+            for member in members:
+                if member not in names:
+                    errors[member] = []
+                    continue
+                _, member_errors = self._validate_single_file_xsd(
+                    base_path / member, base_path, content=archive.read(member)
+                )
+                errors[member] = sorted(member_errors or ())
+        return errors
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         warnings = []
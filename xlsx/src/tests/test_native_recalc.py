@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+SPEC = importlib.util.spec_from_file_location(
+    "native_recalc", SCRIPTS_DIR / "native_recalc.py"
+)
+assert SPEC and SPEC.loader
+native_recalc = importlib.util.module_from_spec(SPEC)
+SPEC.loader.exec_module(native_recalc)
+
+
+def _workbook(path: Path, cells: dict[str, object], lookup: list | None = None) -> Path:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Model"
+    for coordinate, value in cells.items():
+        sheet[coordinate] = value
+    if lookup is not None:
+        table = workbook.create_sheet("Rates")
+        for row in lookup:
+            table.append(row)
+    workbook.save(path)
+    return path
+
+
+def _values(path: Path, sheet: str = "Model") -> dict[str, object]:
+    workbook = load_workbook(path, data_only=True)
+    try:
+        return {
+            cell.coordinate: cell.value
+            for row in workbook[sheet].iter_rows()
+            for cell in row
+            if cell.value is not None
+        }
+    finally:
+        workbook.close()
+
+
+def _engine(path: Path) -> native_recalc.FormulaEngine:
+    engine = native_recalc.FormulaEngine(path)
+    engine.recalculate()
+    return engine
+
+
+def test_operator_precedence(tmp_path: Path) -> None:
+    path = _workbook(
+        tmp_path / "ops.xlsx",
+        {
+            "A1": 2,
+            "A2": 3,
+            "B1": "=1+A1*A2^2",
+            "B2": "=-A1^2",
+            "B3": "=(1+A1)*A2",
+            "B4": "=1+2&3",
+            "B5": "=A1+A2>4",
+            "B6": "=50%*A1",
+            "B7": "=10-4-3",
+            "B8": "=A1/0",
+        },
+    )
+
+    result = native_recalc.native_recalc(str(path), fallback=False)
+    values = _values(path)
+
+    assert result["engine"] == "native"
+    assert result["recalculated_formulas"] == 8
+    assert values["B1"] == 19
+    assert values["B2"] == 4
+    assert values["B3"] == 9
+    assert values["B4"] == "33"
+    assert values["B5"] is True
+    assert values["B6"] == 1
+    assert values["B7"] == 3
+    assert values["B8"] == "#DIV/0!"
+    assert result["error_summary"]["#DIV/0!"]["count"] == 1
+
+
+def test_lookup_functions(tmp_path: Path) -> None:
+    path = _workbook(
+        tmp_path / "lookup.xlsx",
+        {
+            "A1": "beta",
+            "A2": 25,
+            "B1": "=VLOOKUP(A1,Rates!$A$1:$C$3,2,FALSE)",
+            "B2": "=VLOOKUP(A2,Rates!$C$1:$C$3,1)",
+            "B3": "=INDEX(Rates!$A$1:$C$3,MATCH(\"gam*\",Rates!$A$1:$A$3,0),3)",
+            "B4": "=MATCH(A2,Rates!$C$1:$C$3,1)",
+            "B5": "=IFERROR(VLOOKUP(\"delta\",Rates!$A$1:$B$3,2,FALSE),\"none\")",
+            "B6": "=INDEX(Rates!$A$1:$C$3,4,1)",
+        },
+        lookup=[["alpha", 0.1, 10], ["beta", 0.2, 20], ["gamma", 0.3, 30]],
+    )
+
+    native_recalc.native_recalc(str(path), fallback=False)
+    values = _values(path)
+
+    assert values["B1"] == 0.2
+    assert values["B2"] == 20
+    assert values["B3"] == 30
+    assert values["B4"] == 2
+    assert values["B5"] == "none"
+    assert values["B6"] == "#REF!"
+
+
+def test_circular_reference_falls_back_to_libreoffice(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = _workbook(tmp_path / "loop.xlsx", {"A1": "=B1+1", "B1": "=A1+1"})
+
+    result = native_recalc.native_recalc(str(path), fallback=False)
+    assert "circular reference" in result["error"]
+
+    calls = []
+
+    def fake_recalc(filename: str, timeout: int) -> dict:
+        calls.append(filename)
+        return {"status": "success"}
+
+    monkeypatch.setattr(native_recalc, "recalc", fake_recalc)
+    result = native_recalc.native_recalc(str(path))
+
+    assert calls == [str(path)]
+    assert result["engine"] == "libreoffice"
+    assert "Model!A1: circular reference" in result["fallback_reason"]
+
+
+def test_range_that_contains_its_reader_is_circular(tmp_path: Path) -> None:
+    path = _workbook(tmp_path / "loop.xlsx", {"A1": 1, "A2": "=SUM(A1:A3)"})
+
+    with pytest.raises(native_recalc.UnsupportedFormula, match="circular"):
+        _engine(path)
+
+
+def test_set_recomputes_only_dependents(tmp_path: Path) -> None:
+    cells: dict[str, object] = {"E1": 5, "E2": "=E1*2"}
+    for row in range(1, 6):
+        cells[f"A{row}"] = row
+        cells[f"B{row}"] = f"=A{row}*2"
+        cells[f"C{row}"] = f"=B{row}/SUM($B$1:$B$5)"
+        cells[f"D{row}"] = f"=SUM($B$1:B{row})"
+    path = _workbook(tmp_path / "model.xlsx", cells)
+    engine = _engine(path)
+    assert engine.values[("Model", 5, 4)] == 30
+
+    engine.set_value("Model", "A3", 10)
+    assert engine.recalculate_dirty() == 1 + 5 + 3
+    assert engine.values[("Model", 3, 2)] == 20
+    assert engine.values[("Model", 2, 4)] == 6
+    assert engine.values[("Model", 5, 4)] == 44
+    assert engine.values[("Model", 1, 3)] == pytest.approx(2 / 44)
+    assert engine.values[("Model", 2, 5)] == 10
+
+    engine.set_value(None, "E1", 1)
+    assert engine.recalculate_dirty() == 1
+    assert engine.values[("Model", 2, 5)] == 2
+
+
+def test_set_uses_cached_values_from_the_file(tmp_path: Path) -> None:
+    path = _workbook(
+        tmp_path / "model.xlsx",
+        {"A1": 1, "A2": 2, "B1": "=A1*10", "B2": "=A2*10", "B3": "=SUM(B1:B2)"},
+    )
+    native_recalc.native_recalc(str(path), fallback=False)
+
+    output = tmp_path / "scenario.xlsx"
+    result = native_recalc.native_recalc(
+        str(path), ["Model!A2=5"], str(output), fallback=False
+    )
+    values = _values(output)
+
+    assert result["recalculated_formulas"] == 2
+    assert values["A2"] == 5
+    assert values["B2"] == 50
+    assert values["B3"] == 60
+    assert _values(path)["B3"] == 30
+
+
+def test_set_rejects_formula_cells(tmp_path: Path) -> None:
+    path = _workbook(tmp_path / "model.xlsx", {"A1": 1, "B1": "=A1"})
+    engine = _engine(path)
+
+    with pytest.raises(ValueError, match="contains a formula"):
+        engine.set_value("Model", "B1", 2)